@@ -52,11 +52,12 @@ echo "    docker images ${IMAGE}"
 echo "    docker run --rm ${IMAGE} bash -c 'source /connectedhomeip/scripts/activate.sh && gn --version && ninja --version'"
 echo ""
 echo "  Nightly CI runs it like this (the workflow does this for you):"
-echo "    mkdir -p ~/matter-output ~/matter-ccache"
+echo "    mkdir -p ~/matter-output ~/matter-ccache ~/matter-ci-results"
 echo "    docker run --rm \\"
 echo "      -v ~/matter-output:/output \\"
 echo "      -v \"\$GITHUB_WORKSPACE/Matter_CI\":/matter-ci:ro \\"
 echo "      -v ~/matter-ccache:/root/.ccache \\"
+echo "      -v ~/matter-ci-results:/matter-ci-results \\"
 echo "      ${IMAGE} \\"
 echo "      bash /matter-ci/docker/build_inside_container.sh"
 echo ""
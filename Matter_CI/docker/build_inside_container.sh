@@ -12,10 +12,14 @@
 # Flow (bootstrap is BAKED into the image — never re-run here):
 #   1. git fetch + hard-reset the SDK to origin/<branch>  (latest SDK code)
 #   2. sync submodules
-#   3. source scripts/activate.sh
+#   3. source scripts/activate.sh (+ ccache on the persistent cache mount,
+#      + the local artifact cache of already-built binaries)
 #   4. resolve enabled apps via discover_targets.py
 #   5. build each app + chip-tool + python controller (live ninja progress,
-#      per-app pass/fail + diagnose_error)
+#      per-app pass/fail + diagnose_error); with build.parallel_apps > 1 the
+#      apps build K at a time via scripts/build_orchestrator.py, which with
+#      build.unified_out also puts compatible apps in one shared gn out dir
+#      and with build.incremental reuses binaries whose inputs didn't change
 #   6. copy binaries + wheels + build-info.json + build_status.json to /output
 #
 # Reads (read-only): /matter-ci/config/build_config.yaml, /matter-ci/scripts/*
@@ -33,10 +37,19 @@ SDK_DIR="${SDK_DIR:-/connectedhomeip}"
 OUTPUT="${OUTPUT:-/output}"
 CONFIG_FILE="${CONFIG_FILE:-${MATTER_CI}/config/build_config.yaml}"
 DISCOVER="${MATTER_CI}/scripts/discover_targets.py"
+ORCHESTRATOR="${MATTER_CI}/scripts/build_orchestrator.py"
+ARTIFACT_CACHE="${MATTER_CI}/scripts/artifact_cache.py"
+NINJA_PROFILE="${MATTER_CI}/scripts/ninja_profile.py"
 SUBMODULE_JOBS="${SUBMODULE_JOBS:-4}"
+# discovery.cache_dir is a host path (~ is /root in this --rm container, gone
+# after the build) — keep the discovery cache on the persistent results mount.
+export MATTER_DISCOVERY_CACHE_DIR="${MATTER_DISCOVERY_CACHE_DIR:-/matter-ci-results/discovery_cache}"
 
 LOG_DIR="${OUTPUT}/build_logs"
+CCACHE_GN_ARG=""   # pw_command_launcher="ccache" once setup_ccache enabled it
+ARTIFACT_CACHE_DIR="" ARTIFACT_CACHE_MAX=""   # set by setup_artifact_cache
 DISCOVERED_APPS_JSON="${LOG_DIR}/discovered_apps.json"
+FOOTPRINT_TSV="${LOG_DIR}/binary_sizes.tsv"
 mkdir -p "${LOG_DIR}" "${OUTPUT}/apps" "${OUTPUT}/wheels"
 
 # ── Build mode ───────────────────────────────────────────────────────────────
@@ -89,6 +102,7 @@ declare -A BUILD_STATUS
 declare -A BUILD_ERROR
 declare -A BUILD_SECONDS   # name -> integer build seconds
 declare -A BUILD_SIZE      # name -> human binary size (e.g. 179M)
+declare -A BUILD_REUSED    # name -> build seconds saved (binary reused: artifact cache / build.incremental)
 PASSED_APPS=(); FAILED_APPS=()
 
 # ── Error conclusion helper ──────────────────────────────────────────────────
@@ -135,10 +149,23 @@ diagnose_error() {
 # that file exists — so a green ninja that produced no/misnamed binary is an
 # honest FAIL (not a lie in build_status.json). Pass "" to skip the check
 # (e.g. the python controller, which produces a venv + wheels, not one binary).
+# With an expected binary and the artifact cache on, an identical earlier build
+# (commit, toolchain, command) is served from the cache instead, and a PASS is
+# added to it.
 do_build() {
     local name="$1" fatal="$2" expected_binary="$3"; shift 3
     [[ "$1" == "--" ]] && shift
 
+    local cache_args=()
+    if [[ -n "${ARTIFACT_CACHE_DIR}" && -n "${expected_binary}" ]]; then
+        cache_args=(--dir "${ARTIFACT_CACHE_DIR}" --sdk-dir "${SDK_DIR}" --binary "${expected_binary}")
+        local saved
+        if saved=$(python3 "${ARTIFACT_CACHE}" get "${cache_args[@]}" -- "$@" 2>/dev/null); then
+            record_reused "${name}" "${saved}" "artifact cache hit"
+            return 0
+        fi
+    fi
+
     local tmp_log="${LOG_DIR}/${name}_build_full.log"
     local err_log="${LOG_DIR}/${name}_build_error.log"
     local start_ts; start_ts=$(date +%s)
@@ -167,7 +194,33 @@ do_build() {
     local rc; if wait "${pid}"; then rc=0; else rc=$?; fi
 
     [[ -n "${last_step}" ]] && echo -e "  ${CYAN}[${step_num}/${step_total}]${NC} ${last_step#*\] }"
-    local elapsed=$(( $(date +%s) - start_ts )) elapsed_str
+    record_build "${name}" "${fatal}" "${expected_binary}" "${rc}" $(( $(date +%s) - start_ts ))
+    if (( ${#cache_args[@]} )) && [[ "${BUILD_STATUS[${name}]}" == "PASS" ]]; then
+        python3 "${ARTIFACT_CACHE}" put "${cache_args[@]}" --seconds "${BUILD_SECONDS[${name}]}" \
+            --max-size "${ARTIFACT_CACHE_MAX}" -- "$@" || warn "${name}: not added to the artifact cache"
+    fi
+    return 0   # never abort the caller; fatal handled in record_build
+}
+
+# ── Build result bookkeeping ─────────────────────────────────────────────────
+# Usage: record_reused <name> <saved_s> <why>
+# PASS without building — the binary is already in place (artifact cache hit
+# or, in the parallel path, inputs unchanged since the stored build).
+record_reused() {
+    local name="$1" saved="$2" why="$3"
+    BUILD_STATUS["${name}"]="PASS"; BUILD_SECONDS["${name}"]=0
+    BUILD_REUSED["${name}"]="${saved:-0}"; PASSED_APPS+=("${name}")
+    ok "└─ ${name} reused — ${why} (~${saved:-0}s saved)"
+}
+
+
+# Usage: record_build <name> <fatal:0|1> <expected_binary|""> <rc> <elapsed_s>
+# Shared by do_build and the parallel path (build_orchestrator.py): PASS/FAIL,
+# error log + diagnose_error conclusion from <name>_build_full.log.
+record_build() {
+    local name="$1" fatal="$2" expected_binary="$3" rc="$4" elapsed="$5" elapsed_str
+    local tmp_log="${LOG_DIR}/${name}_build_full.log"
+    local err_log="${LOG_DIR}/${name}_build_error.log"
     if (( elapsed >= 60 )); then elapsed_str="$((elapsed/60))m $((elapsed%60))s"; else elapsed_str="${elapsed}s"; fi
     BUILD_SECONDS["${name}"]="${elapsed}"
 
@@ -203,7 +256,7 @@ do_build() {
    ${conclusion}"
         fi
     fi
-    return 0   # never abort the caller; fatal handled above
+    return 0
 }
 
 # =============================================================================
@@ -299,6 +352,94 @@ activate_env() {
     ok "Environment active. gn=$(command -v gn)  ninja=$(command -v ninja)"
 }
 
+# ccache through the SDK's own launcher hook (gn arg pw_command_launcher, the
+# same one build_examples.py --pw-command-launcher=ccache sets). The cache is
+# /root/.ccache — the workflow mounts ~/matter-ccache there, so it outlives the
+# --rm container and clean_builds' `rm -rf out`. BASEDIR + NOHASHDIR make the
+# keys independent of the checkout path / out dir; compilercheck=content
+# because bootstrap re-installs the toolchain (new mtimes) on skip-clone/full.
+setup_ccache() {
+    banner "Step 2b — Compiler Cache"
+    if ! cfg_bool build ccache; then warn "build.ccache disabled — compiling without a cache."; return; fi
+    if ! command -v ccache >/dev/null; then
+        warn "ccache not installed in the image (apt-packages.txt) — rebuild the image; compiling without a cache."
+        return
+    fi
+    export CCACHE_DIR="${CCACHE_DIR:-/root/.ccache}" CCACHE_BASEDIR="${SDK_DIR}"
+    export CCACHE_NOHASHDIR=1 CCACHE_COMPILERCHECK=content
+    mkdir -p "${CCACHE_DIR}"
+    local max; max=$(cfg_get build ccache_max_size)
+    ccache --max-size "${max:-20G}" >/dev/null
+    ccache --zero-stats >/dev/null
+    CCACHE_GN_ARG='pw_command_launcher="ccache"'
+    ok "ccache on: ${CCACHE_DIR} (max ${max:-20G}, $(ccache --version | head -1))"
+}
+
+# Local content-addressed store of built binaries (scripts/artifact_cache.py),
+# on the persistent /matter-ci-results mount: re-runs of the same SDK commit
+# (retries, skip-all / skip-clone debugging) take app + chip-tool binaries
+# from it instead of rebuilding. LRU-evicted to build.artifact_cache_max_size.
+setup_artifact_cache() {
+    cfg_bool build artifact_cache || return 0
+    ARTIFACT_CACHE_DIR=$(cfg_get build artifact_cache_dir)
+    ARTIFACT_CACHE_DIR="${ARTIFACT_CACHE_DIR:-/matter-ci-results/artifact_cache}"
+    ARTIFACT_CACHE_MAX=$(cfg_get build artifact_cache_max_size); ARTIFACT_CACHE_MAX="${ARTIFACT_CACHE_MAX:-30G}"
+    if ! mkdir -p "${ARTIFACT_CACHE_DIR}" 2>/dev/null; then
+        warn "artifact cache dir ${ARTIFACT_CACHE_DIR} not writable — cache off"; ARTIFACT_CACHE_DIR=""; return 0
+    fi
+    ok "Artifact cache: ${ARTIFACT_CACHE_DIR} (max ${ARTIFACT_CACHE_MAX}; $(python3 "${ARTIFACT_CACHE}" stats --dir "${ARTIFACT_CACHE_DIR}"))"
+}
+
+# Per-night ccache counters → ${OUTPUT}/ccache_stats.json (stats were zeroed in
+# setup_ccache, so they cover exactly this build).
+ccache_stats() {
+    [[ -n "${CCACHE_GN_ARG}" ]] || return 0
+    python3 - "${OUTPUT}/ccache_stats.json" <<'PY'
+import json, subprocess, sys
+try:
+    out = subprocess.run(["ccache", "--print-stats"], capture_output=True,
+                         text=True, check=True).stdout
+    max_size = subprocess.run(["ccache", "-k", "max_size"], capture_output=True,
+                              text=True).stdout.strip()
+except (OSError, subprocess.CalledProcessError):
+    sys.exit(0)
+s = dict(line.split("\t", 1) for line in out.splitlines() if "\t" in line)
+n = lambda k: int(s.get(k) or 0)
+hits = n("direct_cache_hit") + n("preprocessed_cache_hit")
+misses = n("cache_miss")
+json.dump({"hits": hits, "direct_hits": n("direct_cache_hit"), "misses": misses,
+           "hit_rate_pct": round(100 * hits / (hits + misses), 1) if hits + misses else 0.0,
+           "cache_size_bytes": n("cache_size_kibibyte") * 1024,
+           "files_in_cache": n("files_in_cache"), "max_size": max_size},
+          open(sys.argv[1], "w"), indent=2)
+PY
+}
+
+# Per-target ninja profiles (slowest steps, step CPU time, critical path) →
+# ${OUTPUT}/build_profile.json + one Chrome trace per out dir in
+# ${OUTPUT}/build_profiles/. Out dirs without a .ninja_log (reused / cached
+# binaries) are skipped; unified gn roots are profiled as unified-<key>.
+build_profiles() {
+    local top; top=$(cfg_get build profile_top_n); top="${top:-10}"
+    [[ "${top}" =~ ^[0-9]+$ ]] && (( top > 0 )) || return 0
+    local -a specs=()
+    while IFS=$'\t' read -r name src bdir bin bbin gnargs; do
+        [[ -n "${name}" && -f "${SDK_DIR}/${bdir}/.ninja_log" ]] && specs+=("${name}=${SDK_DIR}/${bdir}")
+    done < <(apps_tsv)
+    if cfg_bool chip_tool enabled; then
+        local ctdir="${SDK_DIR}/$(cfg_get chip_tool build_dir)"
+        [[ -f "${ctdir}/.ninja_log" ]] && specs+=("chip-tool=${ctdir}")
+    fi
+    local u
+    for u in "${SDK_DIR}"/out/unified/*/; do
+        [[ -f "${u}.ninja_log" ]] && specs+=("unified-$(basename "${u}")=${u%/}")
+    done
+    (( ${#specs[@]} )) || return 0
+    python3 "${NINJA_PROFILE}" --out "${OUTPUT}/build_profile.json" \
+        --trace-dir "${OUTPUT}/build_profiles" --top "${top}" "${specs[@]}" \
+        || warn "ninja build profile failed — no build_profile.json"
+}
+
 # =============================================================================
 # STEP 3 — Resolve enabled apps (dynamic discovery)
 # =============================================================================
@@ -345,6 +486,11 @@ PY
 build_apps() {
     banner "Step 4 — Reference Apps"
     cd "${SDK_DIR}"
+    local parallel; parallel=$(cfg_get build parallel_apps)
+    [[ "${parallel}" =~ ^[0-9]+$ ]] && (( parallel > 0 )) || parallel=1
+    if (( parallel > 1 )) || cfg_bool build unified_out || cfg_bool build incremental; then
+        build_apps_parallel "${parallel}"; return
+    fi
     local count=0
     while IFS=$'\t' read -r name src bdir bin bbin gnargs; do
         [[ -z "${name}" ]] && continue
@@ -352,6 +498,7 @@ build_apps() {
         log "┌─ Building : ${name}"
         log "│  source   : ${src}"
         log "│  output   : ${bdir}"
+        gnargs="${gnargs}${CCACHE_GN_ARG:+ ${CCACHE_GN_ARG}}"
         log "│  gn_args  : ${gnargs:-<none>}"
         log "│  command  : cd ${SDK_DIR} && scripts/examples/gn_build_example.sh ${src} ${bdir} ${gnargs}"
         if [[ ! -d "${src}" ]]; then
@@ -369,6 +516,47 @@ build_apps() {
     (( count == 0 )) && warn "No reference apps enabled — nothing built."
 }
 
+# K apps at a time under one ninja job budget, longest first, optionally with
+# shared gn out dirs (see build_orchestrator.py); results are recorded exactly
+# like the sequential loop. Wall + compile CPU time → /output/build_timing.json.
+build_apps_parallel() {
+    local parallel="$1" jobs history unified="" store="" results="${LOG_DIR}/parallel_build_results.tsv"
+    jobs=$(cfg_get build ninja_jobs); history=$(cfg_get build history_file)
+    cfg_bool build unified_out && unified="--unified"
+    if cfg_bool build incremental; then
+        store=$(cfg_get build incremental_dir); store="${store:-/matter-ci-results/incremental}"
+    fi
+    log "Parallel build: ${parallel} app(s) at a time, ninja job budget ${jobs:-0} (0 = nproc)${unified:+, unified gn out dirs}"
+    : > "${results}"
+    python3 "${ORCHESTRATOR}" --sdk-dir "${SDK_DIR}" --apps-json "${DISCOVERED_APPS_JSON}" \
+        --log-dir "${LOG_DIR}" --parallel "${parallel}" --jobs "${jobs:-0}" ${unified} \
+        ${CCACHE_GN_ARG:+--extra-gn-args "${CCACHE_GN_ARG}"} ${store:+--incremental "${store}"} \
+        ${ARTIFACT_CACHE_DIR:+--artifact-cache "${ARTIFACT_CACHE_DIR}" --artifact-cache-max "${ARTIFACT_CACHE_MAX}"} \
+        ${history:+--history "${history}"} --results "${results}" \
+        --timing-out "${OUTPUT}/build_timing.json" \
+        || warn "build_orchestrator.py exited non-zero — recording the builds it finished"
+    local count=0
+    while IFS=$'\t' read -r name rc secs expected saved; do
+        [[ -z "${name}" ]] && continue
+        count=$((count+1))
+        if [[ -n "${saved}" ]]; then
+            record_reused "${name}" "${saved}" "artifact cache / inputs unchanged"
+            continue
+        fi
+        if [[ "${rc}" == "nosrc" ]]; then
+            local src; src=$(python3 -c "import json,sys;print(next(a['source_dir'] for a in json.load(open(sys.argv[1])) if a['name']==sys.argv[2]))" "${DISCOVERED_APPS_JSON}" "${name}")
+            echo "Source directory not found: ${SDK_DIR}/${src}" > "${LOG_DIR}/${name}_build_error.log"
+            BUILD_STATUS["${name}"]="FAIL"
+            BUILD_ERROR["${name}"]="❌ WRONG SOURCE PATH — '${src}' does not exist in SDK"
+            FAILED_APPS+=("${name}")
+            echo -e "${RED}[FAIL]${NC} ${name} — source directory not found: ${src}"
+            continue
+        fi
+        record_build "${name}" 0 "${expected}" "${rc}" "${secs}"
+    done < "${results}"
+    (( count == 0 )) && warn "No reference apps enabled — nothing built."
+}
+
 # =============================================================================
 # STEP 5 — chip-tool (fatal)
 # =============================================================================
@@ -379,6 +567,7 @@ build_chip_tool() {
     local src bdir bin gnargs
     src=$(cfg_get chip_tool source_dir); bdir=$(cfg_get chip_tool build_dir)
     bin=$(cfg_get chip_tool binary_name); gnargs=$(cfg_get chip_tool extra_gn_args)
+    gnargs="${gnargs}${CCACHE_GN_ARG:+ ${CCACHE_GN_ARG}}"
     [[ -d "${src}" ]] || fail "❌ chip-tool source_dir '${src}' does not exist in SDK"
     log "command : cd ${SDK_DIR} && scripts/examples/gn_build_example.sh ${src} ${bdir} ${gnargs}"
     # shellcheck disable=SC2086
@@ -407,9 +596,24 @@ build_python_controller() {
 # =============================================================================
 # STEP 7 — Copy outputs to /output + write manifests
 # =============================================================================
+# Footprint row for one binary → FOOTPRINT_TSV:
+#   name  deployed_bin  file_bytes  text  data  bss  stripped_bytes
+# text/data/bss from `size -B`; stripped size from a throwaway `strip -o` copy
+# (the deployed binary keeps its symbols). Empty columns when a tool fails.
+record_footprint() {
+    local name="$1" bin="$2" path="$3" text="" data="" bss="" stripped=""
+    read -r text data bss < <(size -B "${path}" 2>/dev/null | awk 'NR==2{print $1, $2, $3}')
+    local tmp; tmp=$(mktemp)
+    strip -o "${tmp}" "${path}" 2>/dev/null && stripped=$(stat -c %s "${tmp}")
+    rm -f "${tmp}"
+    printf '%s\t%s\t%s\t%s\t%s\t%s\t%s\n' "${name}" "${bin}" "$(stat -c %s "${path}")" \
+        "${text}" "${data}" "${bss}" "${stripped}" >> "${FOOTPRINT_TSV}"
+}
+
 collect_output() {
     banner "Step 7 — Collect Output → ${OUTPUT}"
     cd "${SDK_DIR}"
+    : > "${FOOTPRINT_TSV}"
 
     # 7a. Reference app binaries
     local copied=0
@@ -423,6 +627,7 @@ collect_output() {
             cp -f "${path}" "${OUTPUT}/apps/${bin}"
             local sz; sz=$(du -h "${path}" | cut -f1)
             BUILD_SIZE["${name}"]="${sz}"
+            record_footprint "${name}" "${bin}" "${path}"
             ok "app  ${bin} (${sz})"; copied=$((copied+1))
         else
             warn "app  ${bin} not found at ${path} — skipping (build likely failed)"
@@ -435,6 +640,7 @@ collect_output() {
         local ct="${SDK_DIR}/$(cfg_get chip_tool build_dir)/$(cfg_get chip_tool binary_name)"
         if [[ -f "${ct}" ]]; then cp -f "${ct}" "${OUTPUT}/chip-tool"; \
              BUILD_SIZE["chip-tool"]=$(du -h "${ct}" | cut -f1); ok "chip-tool copied (${BUILD_SIZE[chip-tool]})"; \
+             record_footprint "chip-tool" "chip-tool" "${ct}"; \
         else warn "chip-tool not found at ${ct}"; fi
     fi
 
@@ -482,6 +688,38 @@ json.dump({"commit": commit, "commit_short": commit[:9], "branch": branch,
 PY
     ok "Wrote build-info.json (commit ${commit:0:9}, branch ${branch})"
 
+    # 7d-2. binary_sizes.json — structured per-app footprint for this commit
+    #       (file / text / data / bss / stripped bytes). Shipped in the bundle;
+    #       footprint_tracker.py diffs it against previous builds.
+    python3 - "${FOOTPRINT_TSV}" "$commit" "$date" "${OUTPUT}/binary_sizes.json" <<'PY'
+import json, sys
+tsv, commit, date, out = sys.argv[1:5]
+apps = {}
+for line in open(tsv):
+    cols = (line.rstrip("\n").split("\t") + [""] * 7)[:7]
+    if not cols[0]:
+        continue
+    rec = {"name": cols[0]}
+    for key, val in zip(("file_bytes", "text", "data", "bss", "stripped_bytes"), cols[2:]):
+        if val.isdigit():
+            rec[key] = int(val)
+    apps[cols[1]] = rec
+json.dump({"commit": commit, "date": date, "apps": apps}, open(out, "w"), indent=2)
+PY
+    ok "Wrote binary_sizes.json ($(wc -l < "${FOOTPRINT_TSV}" | tr -d ' ') binary(ies))"
+
+    # 7d-3. apps_manifest.json — the resolved app table (+ sha256 per deployed
+    #       binary). Shipped in the bundle so the RPi reads it instead of
+    #       re-running discovery (which needs activate.sh) on every consumer.
+    if python3 "${DISCOVER}" --sdk-dir "${SDK_DIR}" --config "${CONFIG_FILE}" \
+            --write-manifest "${OUTPUT}/apps_manifest.json" \
+            --apps-json "${DISCOVERED_APPS_JSON}" --apps-dir "${OUTPUT}/apps" \
+            2>> "${LOG_DIR}/discover.log"; then
+        ok "Wrote apps_manifest.json"
+    else
+        warn "apps_manifest.json not written — the RPi falls back to live discovery"
+    fi
+
     # 7e. build_status.json — per-target PASS/FAIL (used by summary/notify)
     {
         echo "{"
@@ -497,34 +735,53 @@ PY
     cp -f "${DISCOVERED_APPS_JSON}" "${OUTPUT}/discovered_apps.json" 2>/dev/null || true
 
     # 7f. build_report.json (machine) + build_summary.md (human table) — rich
-    #     per-target details (status, build time, size). build_status.json stays
+    #     per-target details (status, build time, size, reused + seconds saved)
+    #     as a top-level list, one row per target. This night's ccache counters
+    #     (ccache_stats.json) and the ninja profiles (build_profile.json) keep
+    #     their own files; the summary shows both. build_status.json stays
     #     the simple {name: status} map notify.py / upload_artifacts.py consume.
     #     build_summary.md is cat'd verbatim into the GitHub job summary.
     # Write the per-target data to a TSV, then let python read it from that file
     # (NOT stdin — `python3 -` reads its program from stdin via the heredoc).
+    ccache_stats
+    build_profiles
     local report_tsv="${LOG_DIR}/build_report.tsv"
     {
         for k in "${!BUILD_STATUS[@]}"; do
-            printf '%s\t%s\t%s\t%s\n' \
-                "${k}" "${BUILD_STATUS[$k]}" "${BUILD_SECONDS[$k]:-}" "${BUILD_SIZE[$k]:-}"
+            printf '%s\t%s\t%s\t%s\t%s\n' "${k}" "${BUILD_STATUS[$k]}" \
+                "${BUILD_SECONDS[$k]:-}" "${BUILD_SIZE[$k]:-}" "${BUILD_REUSED[$k]:-}"
         done
     } > "${report_tsv}"
-    python3 - "${report_tsv}" "${OUTPUT}/build_report.json" "${OUTPUT}/build_summary.md" <<'PY'
+    python3 - "${report_tsv}" "${OUTPUT}/build_report.json" "${OUTPUT}/build_summary.md" \
+        "${OUTPUT}/build_timing.json" "${OUTPUT}/ccache_stats.json" \
+        "${OUTPUT}/build_profile.json" <<'PY'
 import sys, json
-tsv, report_out, md_out = sys.argv[1], sys.argv[2], sys.argv[3]
+tsv, report_out, md_out, timing_in, ccache_in, profile_in = sys.argv[1:7]
 rows = []
 for line in open(tsv):
     line = line.rstrip("\n")
     if not line:
         continue
-    name, status, secs, size = (line.split("\t") + ["", "", ""])[:4]
+    name, status, secs, size, saved = (line.split("\t") + ["", "", "", ""])[:5]
     secs_i = int(secs) if secs.isdigit() else None
     dur = (f"{secs_i//60}m {secs_i%60}s" if secs_i and secs_i >= 60
            else (f"{secs_i}s" if secs_i is not None else ""))
     rows.append({"name": name, "status": status,
-                 "seconds": secs_i, "duration": dur, "size": size or "-"})
+                 "seconds": secs_i, "duration": dur, "size": size or "-",
+                 "reused": saved.isdigit(),
+                 "saved_seconds": int(saved) if saved.isdigit() else 0})
 # failed first, then slowest first
 rows.sort(key=lambda r: (r["status"] != "FAIL", -(r["seconds"] or 0)))
+nreused = sum(1 for r in rows if r["reused"])
+saved = sum(r["saved_seconds"] for r in rows)
+try:
+    ccache = json.load(open(ccache_in))
+except (OSError, ValueError):
+    ccache = None
+try:
+    profiles = json.load(open(profile_in))
+except (OSError, ValueError):
+    profiles = {}
 json.dump(rows, open(report_out, "w"), indent=2)
 
 npass = sum(1 for r in rows if r["status"] == "PASS")
@@ -533,12 +790,36 @@ total = sum(r["seconds"] or 0 for r in rows)
 with open(md_out, "w") as f:
     f.write(f"### Build results — {npass} passed, {nfail} failed "
             f"(total build time {total//60}m {total%60}s)\n\n")
+    if nreused:
+        f.write(f"♻️ {nreused} app(s) reused from the previous build (inputs unchanged), "
+                f"~{saved//60}m {saved%60}s of build time saved\n\n")
+    try:
+        t = json.load(open(timing_in))
+        f.write(f"Reference apps: {t['mode']} gn out dirs — wall {t['wall_s']//60}m "
+                f"{t['wall_s']%60}s, compile CPU {t['cpu_s']//60}m {t['cpu_s']%60}s\n\n")
+    except (OSError, ValueError, KeyError):
+        pass
+    if ccache:
+        f.write(f"Compiler cache: {ccache['hit_rate_pct']}% hits ({ccache['hits']} hits, "
+                f"{ccache['misses']} misses), {ccache['cache_size_bytes'] / 2**30:.1f} GiB "
+                f"of {ccache['max_size'] or '?'}\n\n")
     f.write("| Target | Status | Build time | Binary size |\n")
     f.write("|---|---|---|---|\n")
     for r in rows:
         icon = "✅" if r["status"] == "PASS" else "❌"
-        f.write(f"| `{r['name']}` | {icon} {r['status']} | "
-                f"{r['duration'] or '—'} | {r['size']} |\n")
+        dur = f"♻️ reused (~{r['saved_seconds']}s saved)" if r["reused"] else (r["duration"] or "—")
+        f.write(f"| `{r['name']}` | {icon} {r['status']} | {dur} | {r['size']} |\n")
+    if profiles:
+        # Steps ≈ CPU the build asked for; parallelism = steps / wall; no core
+        # count gets a target below its critical path. Traces: build_profiles/.
+        f.write("\n#### Build profile (ninja)\n\n")
+        f.write("| Out dir | Wall | Steps | Parallelism | Critical path | Slowest step |\n")
+        f.write("|---|---|---|---|---|---|\n")
+        for name, p in sorted(profiles.items(), key=lambda kv: -kv[1]["wall_s"]):
+            top = p["top"][0] if p["top"] else None
+            slow = f"`{top['output'].rsplit('/', 1)[-1]}` ({top['kind']}, {top['s']}s)" if top else "—"
+            f.write(f"| `{name}` | {p['wall_s']}s | {p['step_s']}s | x{p['parallelism']} "
+                    f"| {p['critical_path_s']}s ({p['critical_path_steps']} steps) | {slow} |\n")
 PY
 }
 
@@ -586,6 +867,8 @@ main() {
     esac
 
     activate_env
+    setup_ccache
+    setup_artifact_cache
     discover_apps
     build_apps
     build_chip_tool
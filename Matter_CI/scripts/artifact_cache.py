@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+artifact_cache.py
+=================
+Local content-addressed store of built binaries (build.artifact_cache) —
+do_build and build_orchestrator.py look here before building an app and fill
+it after a successful build.
+
+Re-runs on the same SDK commit (workflow retries, skip-all / skip-clone
+debugging) used to rebuild every app from scratch. An entry is keyed by
+sha256 of:
+
+    SDK commit · toolchain id · the exact build command (gn_build_example.sh
+    <source_dir> <build_dir> <resolved gn args>) · the binary's path in out/
+    · the work tree's uncommitted changes, when there are any
+
+A skip-clone tree with local edits must not be served the binary of the clean
+commit, so a dirty tree adds sha256 of `git diff HEAD` plus every untracked
+(non-ignored) file to the key — a rebuild of the same edits still hits.
+
+The toolchain id is the builder image digest (MATTER_IMAGE_DIGEST, passed in
+by the workflow) + `gn --version` + `clang --version` (the pigweed clang on
+PATH after activation — bootstrap can change it without a new image); it also
+gates incremental_build.py's reuse. Layout:
+
+    <dir>/objects/<sha256 of the binary>   read-only blob (identical binaries
+                                           of different keys are stored once)
+    <dir>/keys/<key>.json                  blob, size, what was built, seconds
+
+A hit hard-links the blob into out/ (a copy when the cache is on another
+filesystem — inside the container it is on the /matter-ci-results mount) and
+touches the key, so key mtimes are the LRU order. After each put the oldest
+keys are dropped until the blobs fit in max_size; unreferenced blobs go too.
+
+Usage:
+    python3 scripts/artifact_cache.py get --dir /matter-ci-results/artifact_cache \\
+        --sdk-dir /connectedhomeip --binary /connectedhomeip/out/x/chip-x -- \\
+        scripts/examples/gn_build_example.sh examples/x/linux out/x chip_foo=true
+    python3 scripts/artifact_cache.py put … --seconds 312 --max-size 30G -- …
+    python3 scripts/artifact_cache.py stats --dir /matter-ci-results/artifact_cache
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import subprocess
+from pathlib import Path
+
+DEFAULT_DIR = "/matter-ci-results/artifact_cache"
+DEFAULT_MAX_SIZE = "30G"
+
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*$", re.I)
+
+
+def parse_size(text) -> int:
+    """'30G', '500M', '1.5T', bytes → bytes. ValueError if invalid."""
+    m = _SIZE_RE.match(str(text))
+    if not m:
+        raise ValueError(f"invalid size {text!r} (e.g. 30G, 500M)")
+    return int(float(m.group(1)) * 1024 ** " KMGT".index(m.group(2).upper() or " "))
+
+
+def _first_line(cmd: list[str]) -> str:
+    try:
+        r = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+        return (r.stdout or r.stderr).strip().splitlines()[0]
+    except (OSError, subprocess.SubprocessError, IndexError):
+        return ""
+
+
+def toolchain_id() -> str:
+    return " | ".join((os.environ.get("MATTER_IMAGE_DIGEST", ""),
+                       _first_line(["gn", "--version"]), _first_line(["clang", "--version"])))
+
+
+def cache_key(commit: str, toolchain: str, argv: list[str], binary_rel: str,
+              tree: str = "") -> str:
+    """`tree` is tree_state() — empty for a clean tree (keys unchanged)."""
+    parts = [commit, toolchain, list(argv), binary_rel] + ([tree] if tree else [])
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+
+def _git(sdk_dir, *args: str) -> bytes | None:
+    try:
+        r = subprocess.run(["git", *args], cwd=str(sdk_dir), capture_output=True)
+    except OSError:
+        return None
+    return r.stdout if r.returncode == 0 else None
+
+
+def uncommitted_files(sdk_dir) -> list[str] | None:
+    """Repo-relative files the work tree has changed since HEAD (`git diff
+    --name-only HEAD`) plus the untracked, non-ignored ones; None if git can't
+    tell. Also used by incremental_build.py."""
+    diff = _git(sdk_dir, "diff", "--name-only", "-z", "HEAD")
+    others = _git(sdk_dir, "ls-files", "--others", "--exclude-standard", "-z")
+    if diff is None or others is None:
+        return None
+    return sorted({os.fsdecode(p) for p in (diff + others).split(b"\0") if p})
+
+
+def tree_state(sdk_dir) -> str | None:
+    """"" for a clean SDK work tree, else sha256 of its uncommitted changes
+    (`git diff HEAD` + the untracked files' names and contents); None if git
+    can't tell."""
+    diff = _git(sdk_dir, "diff", "--binary", "HEAD")
+    others = _git(sdk_dir, "ls-files", "--others", "--exclude-standard", "-z")
+    if diff is None or others is None:
+        return None
+    if not diff and not others:
+        return ""
+    h = hashlib.sha256(diff)
+    for rel in sorted(p for p in others.split(b"\0") if p):
+        h.update(rel + b"\0")
+        try:
+            h.update(_file_sha256(Path(sdk_dir) / os.fsdecode(rel)).encode())
+        except OSError:
+            pass                                      # vanished / unreadable
+    return h.hexdigest()
+
+
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _place(src: Path, dest: Path):
+    """Hard-link src at dest (copy across filesystems); dest replaced."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.cache-tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dest)
+
+
+def get(cache_dir, key: str, dest: Path) -> dict | None:
+    """Put the cached binary for `key` at `dest`; its entry, or None on a miss."""
+    kfile = Path(cache_dir) / "keys" / f"{key}.json"
+    try:
+        entry = json.loads(kfile.read_text())
+        _place(Path(cache_dir) / "objects" / entry["blob"], dest)
+    except (OSError, ValueError, KeyError):
+        return None
+    os.utime(kfile)                                   # LRU: most recently used
+    return entry
+
+
+def put(cache_dir, key: str, binary: Path, meta: dict, max_bytes: int) -> bool:
+    cache_dir = Path(cache_dir)
+    try:
+        (cache_dir / "objects").mkdir(parents=True, exist_ok=True)
+        (cache_dir / "keys").mkdir(parents=True, exist_ok=True)
+        blob = _file_sha256(binary)
+        obj = cache_dir / "objects" / blob
+        if not obj.is_file():
+            tmp = obj.with_name(f".{blob}.tmp")
+            shutil.copy2(binary, tmp)
+            tmp.chmod(0o555)          # hard-linked into out/ — never written through
+            os.replace(tmp, obj)
+        kfile = cache_dir / "keys" / f"{key}.json"
+        tmp = kfile.with_name(f".{kfile.name}.tmp")
+        tmp.write_text(json.dumps({**meta, "blob": blob, "size": obj.stat().st_size,
+                                   "stored": time.strftime("%Y-%m-%dT%H:%M:%S")}, indent=2))
+        os.replace(tmp, kfile)
+    except OSError as e:
+        print(f"[ WARN] artifact cache: {binary.name} not stored: {e}", file=sys.stderr)
+        return False
+    evict(cache_dir, max_bytes)
+    return True
+
+
+def evict(cache_dir, max_bytes: int) -> tuple[int, int]:
+    """Drop least-recently-used keys until the blobs fit in `max_bytes`, then
+    unreferenced blobs. Returns (keys removed, bytes freed)."""
+    cache_dir = Path(cache_dir)
+    keys = []
+    for k in (cache_dir / "keys").glob("*.json"):
+        try:
+            keys.append((k.stat().st_mtime, k, json.loads(k.read_text()).get("blob")))
+        except (OSError, ValueError):
+            continue
+    keys.sort()
+    blobs = {p.name: p.stat().st_size for p in (cache_dir / "objects").glob("[0-9a-f]*")}
+    refs: dict[str, int] = {}
+    for _, _, b in keys:
+        refs[b] = refs.get(b, 0) + 1
+    total = sum(blobs.values())
+    removed = freed = 0
+    for _, k, b in keys:
+        if total <= max_bytes:
+            break
+        k.unlink(missing_ok=True)
+        removed += 1
+        refs[b] -= 1
+        if refs[b] == 0 and b in blobs:
+            total -= blobs[b]
+    for name, size in blobs.items():
+        if not refs.get(name):
+            (cache_dir / "objects" / name).unlink(missing_ok=True)
+            freed += size
+    return removed, freed
+
+
+def stats(cache_dir) -> dict:
+    cache_dir = Path(cache_dir)
+    blobs = list((cache_dir / "objects").glob("[0-9a-f]*"))
+    return {"keys": len(list((cache_dir / "keys").glob("*.json"))), "blobs": len(blobs),
+            "bytes": sum(p.stat().st_size for p in blobs)}
+
+
+def _sdk_head(sdk_dir: Path) -> str:
+    r = subprocess.run(["git", "rev-parse", "HEAD"], cwd=str(sdk_dir),
+                       capture_output=True, text=True)
+    return r.stdout.strip()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("action", choices=("get", "put", "stats"))
+    ap.add_argument("--dir", default=DEFAULT_DIR)
+    ap.add_argument("--sdk-dir")
+    ap.add_argument("--binary", help="the build's expected binary (absolute)")
+    ap.add_argument("--seconds", type=int, default=0, help="put: build time of this binary")
+    ap.add_argument("--max-size", default=DEFAULT_MAX_SIZE)
+    # Everything after "--" is the build command, as do_build runs it — split by
+    # hand, the command itself may contain options argparse would eat.
+    cli = sys.argv[1:]
+    cut = cli.index("--") if "--" in cli else len(cli)
+    args = ap.parse_args(cli[:cut])
+    args.argv = cli[cut + 1:]
+
+    if args.action == "stats":
+        s = stats(args.dir)
+        print(f"{s['keys']} key(s), {s['blobs']} blob(s), {s['bytes'] / 2**30:.2f} GiB")
+        return
+    if not (args.sdk_dir and args.binary and args.argv):
+        ap.error(f"{args.action} needs --sdk-dir, --binary and -- <build command>")
+    sdk_dir = Path(args.sdk_dir).resolve()
+    binary = Path(args.binary)
+    rel = os.path.relpath(binary, sdk_dir)
+    commit, tree = _sdk_head(sdk_dir), tree_state(sdk_dir)
+    if not commit or tree is None:
+        sys.exit(1)
+    key = cache_key(commit, toolchain_id(), args.argv, rel, tree)
+    if args.action == "get":
+        entry = get(args.dir, key, binary)
+        if not entry:
+            sys.exit(1)
+        print(entry.get("seconds", 0))              # build time saved
+    else:
+        ok = binary.is_file() and put(args.dir, key, binary,
+                                      {"commit": commit, "dirty": bool(tree), "binary": rel,
+                                       "argv": args.argv, "seconds": args.seconds},
+                                      parse_size(args.max_size))
+        sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
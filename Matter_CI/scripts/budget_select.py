@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+budget_select.py
+================
+Time-budgeted TC selection for run_tests.py --budget 60m.
+
+Each TC's duration is estimated from the run history (median wall time of its
+recent non-cancelled runs); a TC with no history gets the median estimate of
+the TCs that have one (or `default_s`). Selection is greedy:
+
+    1. coverage  — walk the TCs by (priority tier, estimate) and take the first
+                   one of every cluster not yet covered that still fits;
+    2. fill      — then the remaining TCs in the same order while they fit.
+
+Priority tiers are priority_order.py's (failed last run → script/app changed →
+rest), so within a cluster a failing or changed TC is the one that represents
+it and, after coverage, failing/changed TCs fill the budget first. Durations
+are compared against the budget minus a `reserve` fraction (report, upload).
+
+After the run, the prediction error (per TC and overall) is appended to
+`log_file` so the estimator can be checked and tuned over time.
+
+Usage (preview a selection):
+    python3 scripts/budget_select.py logs/test_commands.json --budget 60m
+"""
+
+import re
+import json
+import argparse
+import statistics
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_LOG_FILE = "~/matter-ci-results/budget_log.jsonl"
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)\s*([hms]?)", re.I)
+_UNIT_S = {"h": 3600, "m": 60, "s": 1, "": 60}   # bare number = minutes
+
+
+def parse_duration(text: str) -> float:
+    """'60m', '1h30m', '90s', '45' (minutes) → seconds. ValueError if invalid."""
+    text = str(text).strip().lower()
+    pos, total = 0, 0.0
+    for m in _DURATION_RE.finditer(text):
+        if m.start() != pos:
+            break
+        total += float(m.group(1)) * _UNIT_S[m.group(2)]
+        pos = m.end()
+    if not text or pos != len(text) or total <= 0:
+        raise ValueError(f"invalid duration {text!r} (e.g. 60m, 1h30m, 900s)")
+    return total
+
+
+def estimate(records: list[dict], window: int = 5) -> float | None:
+    """Median wall time (wall_s, else elapsed_s of older records) of the newest
+    `window` non-cancelled runs, or None."""
+    vals = [r.get("wall_s", r.get("elapsed_s")) for r in records
+            if r.get("status") != "CANCEL"
+            and isinstance(r.get("wall_s", r.get("elapsed_s")), (int, float))]
+    return statistics.median(vals[-window:]) if vals else None
+
+
+def estimates(commands: list[dict], history, default_s: float = 120.0) -> dict[str, dict]:
+    """{tc_id: {"est_s": seconds, "source": "history" | "default"}}."""
+    known = {tc["test_case_id"]: estimate(history.records(tc["test_case_id"]))
+             for tc in commands}
+    seen = [v for v in known.values() if v is not None]
+    fallback = statistics.median(seen) if seen else default_s
+    return {tc: ({"est_s": round(v, 1), "source": "history"} if v is not None
+                 else {"est_s": round(fallback, 1), "source": "default"})
+            for tc, v in known.items()}
+
+
+def select(commands: list[dict], tiers: list[int], est: dict[str, dict],
+           budget_s: float, reserve: float = 0.05) -> tuple[list[dict], list[dict]]:
+    """
+    (selected, skipped) — selected keeps the order of `commands`; `tiers` is
+    parallel to `commands`.
+    """
+    limit = budget_s * (1 - reserve)
+    order = sorted(range(len(commands)),
+                   key=lambda i: (tiers[i], est[commands[i]["test_case_id"]]["est_s"], i))
+    taken, used, covered = set(), 0.0, set()
+    for i in order:                                    # 1. one per cluster
+        c = commands[i].get("cluster", "")
+        cost = est[commands[i]["test_case_id"]]["est_s"]
+        if c not in covered and used + cost <= limit:
+            taken.add(i)
+            covered.add(c)
+            used += cost
+    for i in order:                                    # 2. fill
+        cost = est[commands[i]["test_case_id"]]["est_s"]
+        if i not in taken and used + cost <= limit:
+            taken.add(i)
+            used += cost
+    return ([tc for i, tc in enumerate(commands) if i in taken],
+            [tc for i, tc in enumerate(commands) if i not in taken])
+
+
+def prediction_error(plan: dict, actual: dict[str, float]) -> dict:
+    """Per-TC and total predicted vs actual seconds for the TCs that ran."""
+    rows = []
+    for tc in plan["selected"]:
+        if tc["tc"] in actual:
+            rows.append({"tc": tc["tc"], "source": tc["source"], "est_s": tc["est_s"],
+                         "actual_s": actual[tc["tc"]],
+                         "err_s": round(actual[tc["tc"]] - tc["est_s"], 1)})
+    pred = sum(r["est_s"] for r in rows)
+    act = sum(r["actual_s"] for r in rows)
+    abs_err = [abs(r["err_s"]) for r in rows]
+    return {
+        "tcs": len(rows), "predicted_s": round(pred, 1), "actual_s": round(act, 1),
+        "total_err_pct": round((act - pred) / pred * 100, 1) if pred else 0.0,
+        "mae_s": round(statistics.mean(abs_err), 1) if abs_err else 0.0,
+        "rows": rows,
+    }
+
+
+def append_log(path, plan: dict, error: dict):
+    path = Path(path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps({
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "budget_s": plan["budget_s"], "selected": len(plan["selected"]),
+            "skipped": len(plan["skipped"]), **error}) + "\n")
+
+
+def main():
+    import yaml
+    from run_history import RunHistory, DEFAULT_HISTORY_FILE
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("commands", help="test_commands.json")
+    ap.add_argument("--budget", required=True, help="e.g. 60m, 1h30m")
+    ap.add_argument("--config", default=str(Path(__file__).parent.parent / "config" /
+                                            "build_config.yaml"))
+    args = ap.parse_args()
+    cfg = yaml.safe_load(open(args.config))
+    te = cfg.get("test_execution", {})
+    history = RunHistory(te.get("history_file", DEFAULT_HISTORY_FILE))
+    commands = json.load(open(args.commands))
+    est = estimates(commands, history, te.get("budget_default_tc_s", 120))
+    budget = parse_duration(args.budget)
+    sel, skip = select(commands, [0] * len(commands), est, budget,
+                       te.get("budget_reserve", 0.05))
+    # Preview only: no priority tiers (those need the SDK checkout + app list).
+    print(f"Budget {budget:.0f}s: {len(sel)} selected "
+          f"(~{sum(est[t['test_case_id']]['est_s'] for t in sel):.0f}s), {len(skip)} skipped")
+    for tc in sel:
+        e = est[tc["test_case_id"]]
+        print(f"  + {tc['test_case_id']:24} {e['est_s']:>7}s  {e['source']}")
+    for tc in skip:
+        e = est[tc["test_case_id"]]
+        print(f"  - {tc['test_case_id']:24} {e['est_s']:>7}s  {e['source']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,572 @@
+#!/usr/bin/env python3
+"""
+build_orchestrator.py
+=====================
+Parallel reference-app builds for build_inside_container.sh (build.parallel_apps).
+
+Building ~35 apps one after another leaves most cores idle: every app's
+`gn gen` and final link are single-threaded. This runs up to K
+`scripts/examples/gn_build_example.sh` builds at once under ONE ninja job
+budget (build.ninja_jobs, default nproc):
+
+    - each build's ninja gets `-j <share>` + `-l <budget>` through a `ninja`
+      shim put first on its PATH; the share is the free part of the budget
+      split over the builds being started, so the tail of the queue (fewer
+      builds left) gets wider shares, and the load limit stops any build from
+      starting jobs while the machine is already saturated;
+    - longest builds start first (durations of the previous builds, kept in
+      build.history_file), so a long all-clusters build doesn't start last and
+      stretch the wall time.
+
+With --unified (build.unified_out) apps that would compile the SDK with the
+same configuration share ONE gn out dir instead of one out/<target> tree each,
+so libCHIP, the data model, crypto and the platform layer compile once per
+group instead of once per app. The grouping key is everything that decides
+how the shared code compiles: the app's extra gn args plus its example root's
+.gn / args.gni (project config include dirs etc.) and build_overrides. A group
+gets a generated gn root under out/unified-roots/<key> (copied .gn + args.gni,
+symlinked build_overrides + third_party/connectedhomeip, and a BUILD.gn whose
+default group depends on each member's executable through chip_root — the way
+the SDK's own root BUILD.gn pulls example apps in) and one `ninja -k 0` builds
+all of them in out/unified/<key>. Binaries are hard-linked back to each app's
+out/<target>/ so collect_output is unchanged. An app falls back to its own tree
+when nothing shares its key, when its gn args import an example-local .gni
+(e.g. the rpc modifier's //with_pw_rpc.gni), when its executable name is
+taken in the group, or when the group's `gn gen` fails.
+
+With --incremental STORE (build.incremental) an app whose inputs didn't change
+since its last build reuses that build's binary instead of building at all
+(see incremental_build.py); every successful build refreshes its entry.
+Before that, --artifact-cache DIR (build.artifact_cache) serves an app whose
+exact build (SDK commit + uncommitted changes, toolchain, command, binary) is
+already in the local content-addressed store — re-runs on the same commit —
+and every successful build is added to it (see artifact_cache.py; same keys as
+do_build's).
+
+Each app still logs to <log-dir>/<name>_build_full.log (a unified group's log
+is copied to every member). The result TSV (name, rc, seconds, expected
+binary, seconds saved when reused) goes back to the shell script, which records build_status.json /
+build_report.json and runs diagnose_error per failed app exactly as in the
+sequential loop. Wall clock and compile CPU-seconds (getrusage of all reaped
+descendants — gn, ninja, compilers, linkers) go to --timing-out and to the
+"runs" list of the history file, tagged with the mode, so separate-tree and
+unified nights can be compared.
+
+Usage (inside the container, environment activated):
+    python3 scripts/build_orchestrator.py --sdk-dir /connectedhomeip \\
+        --apps-json /output/build_logs/discovered_apps.json \\
+        --log-dir /output/build_logs --parallel 3 --jobs 0 \\
+        --history /matter-ci-results/build_times.json --results results.tsv \\
+        [--unified] [--incremental /matter-ci-results/incremental] \\
+        [--artifact-cache /matter-ci-results/artifact_cache --artifact-cache-max 30G] \\
+        --timing-out /output/build_timing.json
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import signal
+import hashlib
+import argparse
+import resource
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+import artifact_cache
+import discover_targets
+import incremental_build
+
+DEFAULT_HISTORY_FILE = "/matter-ci-results/build_times.json"
+HISTORY_RUNS_KEEP = 30
+
+UNIFIED_ROOTS = "out/unified-roots"
+UNIFIED_OUT = "out/unified"
+GN_GEN_FAILED = 97            # unified group's `gn gen` failed → separate trees
+
+# What a generated root provides: the example's own .gn / args.gni may only
+# import these (anything else under "//" lives in that one example dir).
+_SHARED_IMPORTS = ("//args.gni", "//build_overrides/", "//third_party/connectedhomeip/")
+_ROOT_IMPORT_RE = re.compile(r'import\(\s*"(//[^"]+)"')
+
+_STEP_RE = re.compile(r"^\[\s*(\d+)/(\d+)\]")
+
+# Run ninja with the orchestrator's share of the job budget; an explicit -j
+# from the build script (after ours) still wins.
+_NINJA_SHIM = """#!/bin/sh
+exec "{ninja}" -j "${{MATTER_NINJA_JOBS}}" -l "${{MATTER_NINJA_LOAD}}" "$@"
+"""
+
+
+def load_history(path: Path) -> dict[str, float]:
+    try:
+        return json.loads(path.read_text()).get("apps", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_history(path: Path, times: dict[str, float], run: dict | None = None):
+    """Per-app/group durations + the last HISTORY_RUNS_KEEP run timings."""
+    try:
+        runs = json.loads(path.read_text()).get("runs", [])
+    except (OSError, ValueError):
+        runs = []
+    if run:
+        runs = (runs + [run])[-HISTORY_RUNS_KEEP:]
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"apps": times, "runs": runs}, indent=2, sort_keys=True))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[ WARN] build history not written: {e}", file=sys.stderr)
+
+
+def longest_first(builds: list["Build"], history: dict[str, float]) -> list["Build"]:
+    """Builds by previous build time, longest first; apps without history get
+    the median of the known ones (discovery order breaks ties)."""
+    known = [v for v in history.values() if isinstance(v, (int, float))]
+    default = statistics.median(known) if known else 0.0
+    order = sorted(range(len(builds)),
+                   key=lambda i: (-builds[i].estimate(history, default), i))
+    return [builds[i] for i in order]
+
+
+def _last_line(path: Path) -> str:
+    try:
+        with open(path, "rb") as f:
+            f.seek(max(0, f.seek(0, os.SEEK_END) - 4096))
+            lines = f.read().decode(errors="replace").splitlines()
+        return lines[-1] if lines else ""
+    except OSError:
+        return ""
+
+
+class Build:
+    """One app in its own out/<target> tree via gn_build_example.sh."""
+
+    def __init__(self, app: dict, sdk_dir: Path, log_dir: Path):
+        self.app = app
+        self.apps = [app]
+        self.name = app["name"]
+        self.log = log_dir / f"{self.name}_build_full.log"
+        self.expected = sdk_dir / app["build_dir"] / app.get("built_binary", app["binary_name"])
+        self.proc: subprocess.Popen | None = None
+        self.jobs = 0
+        self.start = 0.0
+        self.printed = 0
+
+    def estimate(self, history: dict[str, float], default: float) -> float:
+        return history.get(self.name, default)
+
+    def command(self) -> list[str]:
+        return build_command(self.app)
+
+    def results(self, secs: int) -> list[tuple]:
+        """[(name, rc, seconds, expected, "")] per app of this build."""
+        return [(self.name, self.proc.returncode, secs, self.expected, "")]
+
+    def outputs(self) -> list[tuple[dict, Path, str]]:
+        """(app, ninja out dir, target) per app — for the incremental store."""
+        return [(self.app, self.expected.parent, self.expected.name)]
+
+    def launch(self, sdk_dir: Path, env: dict, jobs: int):
+        self.jobs, self.start = jobs, time.time()
+        with open(self.log, "w") as lf:
+            self.proc = subprocess.Popen(self.command(), cwd=str(sdk_dir), stdout=lf,
+                                         stderr=subprocess.STDOUT, env=env,
+                                         start_new_session=True)
+
+    def progress(self):
+        """ninja progress every 50 steps (like do_build) + FAILED lines."""
+        line = _last_line(self.log)
+        m = _STEP_RE.match(line)
+        if m and (int(m.group(1)) - self.printed >= 50 or "FAILED:" in line):
+            print(f"  [{self.name}] [{m.group(1)}/{m.group(2)}] {line.split('] ', 1)[-1]}",
+                  flush=True)
+            self.printed = int(m.group(1))
+        elif "FAILED:" in line:
+            print(f"  [{self.name}] [FAIL] {line}", flush=True)
+
+    def kill(self):
+        if self.proc and self.proc.poll() is None:
+            try:
+                os.killpg(self.proc.pid, signal.SIGTERM)
+            except OSError:
+                pass
+
+
+def build_command(app: dict) -> list[str]:
+    """The app's own-tree build, argv exactly as do_build runs it (the artifact
+    cache key is computed over it)."""
+    return (["scripts/examples/gn_build_example.sh", app["source_dir"],
+             app["build_dir"]] + app.get("extra_gn_args", "").split())
+
+
+# ── Unified gn out dir (--unified) ───────────────────────────────────────────
+def _target(app: dict) -> str:
+    return app.get("built_binary", app["binary_name"])
+
+
+def unified_key(app: dict, sdk_dir: Path) -> str | None:
+    """Hash of what decides how the SDK compiles for `app`, or None when the
+    app can't be built from a generated root (→ its own tree)."""
+    gnargs = app.get("extra_gn_args", "")
+    if "import(" in gnargs:                       # example-local .gni
+        return None
+    src = sdk_dir / app["source_dir"]
+    decls = discover_targets.build_gn_decls(src)
+    if not decls or _target(app) not in decls["executables"]:
+        return None                               # no label to depend on
+    h = hashlib.sha256(" ".join(sorted(gnargs.split())).encode())
+    for name in (".gn", "args.gni"):
+        try:
+            text = (src / name).read_text()
+        except OSError:
+            if name == ".gn":
+                return None
+            text = ""
+        if any(not imp.startswith(_SHARED_IMPORTS) for imp in _ROOT_IMPORT_RE.findall(text)):
+            return None
+        h.update(name.encode() + b"\0" + text.encode())
+    for link in ("build_overrides", "third_party/connectedhomeip"):
+        if not (src / link).is_dir():
+            return None
+        h.update(str((src / link).resolve()).encode())
+    return h.hexdigest()[:12]
+
+
+def plan_builds(apps: list[dict], sdk_dir: Path, log_dir: Path,
+                unified: bool) -> list["Build"]:
+    """Builds for `apps`: one per app, or with `unified` one UnifiedBuild per
+    group of 2+ apps sharing a key (and distinct executable names)."""
+    if not unified:
+        return [Build(a, sdk_dir, log_dir) for a in apps]
+    discover_targets.index_build_gn(sdk_dir / a["source_dir"] for a in apps)
+    groups: dict[str, list[dict]] = {}
+    builds, solo = [], []
+    for app in apps:
+        key = unified_key(app, sdk_dir)
+        members = groups.setdefault(key, []) if key else None
+        if members is None or any(_target(m) == _target(app) for m in members):
+            solo.append(app)
+        else:
+            members.append(app)
+    for key, members in groups.items():
+        if len(members) > 1:
+            builds.append(UnifiedBuild(key, members, sdk_dir, log_dir))
+        else:
+            solo.extend(members)
+    solo.sort(key=apps.index)
+    return builds + [Build(a, sdk_dir, log_dir) for a in solo]
+
+
+class UnifiedBuild(Build):
+    """Several apps as targets of one generated gn root / out dir."""
+
+    def __init__(self, key: str, apps: list[dict], sdk_dir: Path, log_dir: Path):
+        self.key = key
+        self.sdk_dir = sdk_dir
+        self.apps = apps
+        self.name = f"unified-{key}"
+        self.log = log_dir / f"{self.name}_build_full.log"
+        self.root = sdk_dir / UNIFIED_ROOTS / key
+        self.out = sdk_dir / UNIFIED_OUT / key
+        self.expected = None
+        self.proc = None
+        self.jobs = 0
+        self.start = 0.0
+        self.printed = 0
+
+    def estimate(self, history: dict[str, float], default: float) -> float:
+        # No group time yet: the members' separate times (an upper bound).
+        if self.name in history:
+            return history[self.name]
+        return sum(history.get(a["name"], default) for a in self.apps)
+
+    def write_root(self):
+        src = self.sdk_dir / self.apps[0]["source_dir"]
+        shutil.rmtree(self.root, ignore_errors=True)
+        (self.root / "third_party").mkdir(parents=True)
+        shutil.copyfile(src / ".gn", self.root / ".gn")
+        if (src / "args.gni").is_file():
+            shutil.copyfile(src / "args.gni", self.root / "args.gni")
+        (self.root / "build_overrides").symlink_to((src / "build_overrides").resolve())
+        (self.root / "third_party" / "connectedhomeip").symlink_to(
+            (src / "third_party" / "connectedhomeip").resolve())
+        deps = "".join(f'    "${{chip_root}}/{a["source_dir"]}:{_target(a)}",\n'
+                       for a in self.apps)
+        (self.root / "BUILD.gn").write_text(
+            "# Generated by Matter_CI build_orchestrator.py (build.unified_out).\n"
+            'import("//build_overrides/chip.gni")\n\n'
+            f'group("default") {{\n  deps = [\n{deps}  ]\n}}\n')
+
+    def command(self) -> list[str]:
+        args = self.apps[0].get("extra_gn_args", "")
+        return ["bash", "-c",
+                'gn gen --check --fail-on-unused-args --root="$1" "$2" --args="$3" '
+                f'|| exit {GN_GEN_FAILED}\n'
+                'exec ninja -C "$2" -k 0',
+                self.name, str(self.root), str(self.out), args]
+
+    def launch(self, sdk_dir: Path, env: dict, jobs: int):
+        self.write_root()
+        # A binary left from an earlier run must not pass for this run's link.
+        for a in self.apps:
+            (self.out / _target(a)).unlink(missing_ok=True)
+        super().launch(sdk_dir, env, jobs)
+
+    def results(self, secs: int) -> list[tuple]:
+        rc, out = self.proc.returncode, []
+        for a in self.apps:
+            built = self.out / _target(a)
+            dest = self.sdk_dir / a["build_dir"] / _target(a)
+            log = self.log.with_name(f"{a['name']}_build_full.log")
+            shutil.copyfile(self.log, log)
+            if built.is_file():
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                dest.unlink(missing_ok=True)
+                try:
+                    os.link(built, dest)
+                except OSError:
+                    shutil.copy2(built, dest)
+                out.append((a["name"], 0, secs, dest, ""))
+            else:
+                out.append((a["name"], rc, secs, dest, ""))
+        return out
+
+    def outputs(self) -> list[tuple[dict, Path, str]]:
+        return [(a, self.out, _target(a)) for a in self.apps]
+
+
+def from_artifact_cache(apps: list[dict], sdk_dir: Path, cache_dir: str, commit: str,
+                        toolchain: str, tree: str) -> tuple[list[dict], list[tuple]]:
+    """(apps to build, results of the apps served from the artifact cache)."""
+    build, hits = [], []
+    for app in apps:
+        dest = sdk_dir / app["build_dir"] / _target(app)
+        key = artifact_cache.cache_key(commit, toolchain, build_command(app),
+                                       os.path.relpath(dest, sdk_dir), tree)
+        entry = artifact_cache.get(cache_dir, key, dest)
+        if entry:
+            print(f"[BUILD] ♻ {app['name']}: artifact cache hit ({entry.get('stored', '?')})",
+                  flush=True)
+            hits.append((app["name"], 0, 0, dest, int(entry.get("seconds", 0))))
+        else:
+            build.append(app)
+    return build, hits
+
+
+def reuse_unchanged(apps: list[dict], sdk_dir: Path, store: str, commit: str | None,
+                    toolchain: str, dirty: list[str] | None,
+                    history: dict[str, float]) -> tuple[list[dict], list[tuple]]:
+    """(apps to build, results of the apps whose stored binary was reused)."""
+    build, reused = [], []
+    for app in apps:
+        meta, why = (incremental_build.check(store, app, sdk_dir, commit, toolchain, dirty)
+                     if commit else (None, ""))
+        dest = sdk_dir / app["build_dir"] / _target(app)
+        if meta and incremental_build.restore(store, app, dest):
+            saved = int(history.get(app["name"], meta.get("seconds", 0)))
+            print(f"[BUILD] ♻ {app['name']}: reused {meta['commit'][:9]} build — {why}",
+                  flush=True)
+            reused.append((app["name"], 0, 0, dest, saved))
+        else:
+            build.append(app)
+            if why:
+                print(f"[BUILD]   {app['name']}: building — {why}", flush=True)
+    return build, reused
+
+
+def orchestrate(apps: list[dict], sdk_dir: Path, log_dir: Path, parallel: int,
+                budget: int, history: dict[str, float], unified: bool = False,
+                store: str | None = None, cache_dir: str | None = None,
+                cache_max: int = 0, on_result=None) -> list[tuple]:
+    """Build `apps` K at a time; returns [(name, rc | "nosrc", seconds, expected,
+    seconds saved | "")]. on_result(row) is called as each row is final, so a
+    caller can persist it before the remaining builds finish."""
+    real_ninja = shutil.which("ninja")
+    shim_dir = Path(tempfile.mkdtemp(prefix="matterci_ninja_"))
+    base_env = dict(os.environ, MATTER_NINJA_LOAD=str(budget))
+    if real_ninja:
+        shim = shim_dir / "ninja"
+        shim.write_text(_NINJA_SHIM.format(ninja=real_ninja))
+        shim.chmod(0o755)
+        base_env["PATH"] = f"{shim_dir}{os.pathsep}{base_env.get('PATH', '')}"
+    else:
+        print("[ WARN] ninja not on PATH — job budget not enforced", file=sys.stderr)
+
+    results, running = [], []
+
+    def add(rows):
+        for row in rows:
+            results.append(row)
+            if on_result:
+                on_result(row)
+
+    present = []
+    for app in apps:
+        if not (sdk_dir / app["source_dir"]).is_dir():
+            add([(app["name"], "nosrc", 0,
+                  sdk_dir / app["build_dir"] / app["binary_name"], "")])
+        else:
+            present.append(app)
+    commit = incremental_build.sdk_head(sdk_dir) if store or cache_dir else None
+    toolchain = artifact_cache.toolchain_id() if commit else ""
+    # Uncommitted edits (skip-clone debugging) are part of the cache key.
+    tree = artifact_cache.tree_state(sdk_dir) if cache_dir and commit else ""
+    if tree is None:
+        print("[ WARN] can't read the SDK work tree's changes — artifact cache off",
+              file=sys.stderr)
+        cache_dir = None
+    if cache_dir and commit:
+        present, hits = from_artifact_cache(present, sdk_dir, cache_dir, commit, toolchain,
+                                            tree)
+        add(hits)
+    dirty = artifact_cache.uncommitted_files(sdk_dir) if store and commit else []
+    if store and commit:
+        present, reused = reuse_unchanged(present, sdk_dir, store, commit, toolchain,
+                                          dirty, history)
+        add(reused)
+    pending = longest_first(plan_builds(present, sdk_dir, log_dir, unified), history)
+    for b in pending:
+        if isinstance(b, UnifiedBuild):
+            print(f"[BUILD] {b.name}: {', '.join(a['name'] for a in b.apps)} "
+                  f"share one out dir", flush=True)
+
+    def stop(*_):
+        for b in running:
+            b.kill()
+        raise SystemExit(130)
+    signal.signal(signal.SIGTERM, stop)
+
+    try:
+        while pending or running:
+            # Start builds while a build slot is free; the free job budget is
+            # split over the builds starting now.
+            starting = min(parallel - len(running), len(pending))
+            free = budget - sum(b.jobs for b in running)
+            for _ in range(starting):
+                b = pending.pop(0)
+                share = max(1, free // starting)
+                b.launch(sdk_dir, dict(base_env, MATTER_NINJA_JOBS=str(share)), share)
+                print(f"[BUILD] ┌─ {b.name}: started (-j {share}; "
+                      f"{len(running) + 1} running, {len(pending)} queued)", flush=True)
+                running.append(b)
+            time.sleep(1)
+            for b in list(running):
+                if b.proc.poll() is None:
+                    b.progress()
+                    continue
+                running.remove(b)
+                secs = int(time.time() - b.start)
+                if isinstance(b, UnifiedBuild) and b.proc.returncode == GN_GEN_FAILED:
+                    print(f"[BUILD] └─ {b.name}: gn gen failed — building its "
+                          f"{len(b.apps)} apps in separate trees (see {b.log.name})", flush=True)
+                    pending[:0] = [Build(a, sdk_dir, log_dir) for a in b.apps]
+                    continue
+                done = b.results(secs)
+                ok = all(rc == 0 and Path(exp).is_file() for _, rc, _, exp, _ in done)
+                print(f"[BUILD] └─ {b.name}: {'done' if ok else 'FAILED'} "
+                      f"(rc={b.proc.returncode}, {secs // 60}m {secs % 60}s)", flush=True)
+                if ok:
+                    history[b.name] = secs
+                add(done)
+                for (app, out_dir, target), (_, rc, _, exp, _) in zip(b.outputs(), done):
+                    if not (commit and rc == 0 and Path(exp).is_file()):
+                        continue
+                    if store:
+                        if dirty is not None:
+                            incremental_build.save(store, app, out_dir, target, sdk_dir,
+                                                   commit, toolchain, secs, dirty)
+                    if cache_dir:
+                        artifact_cache.put(
+                            cache_dir,
+                            artifact_cache.cache_key(commit, toolchain, build_command(app),
+                                                     os.path.relpath(exp, sdk_dir), tree),
+                            Path(exp), {"commit": commit, "dirty": bool(tree),
+                                        "binary": os.path.relpath(exp, sdk_dir),
+                                        "argv": build_command(app), "seconds": secs},
+                            cache_max)
+    except KeyboardInterrupt:
+        stop()
+    finally:
+        shutil.rmtree(shim_dir, ignore_errors=True)
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sdk-dir", required=True)
+    ap.add_argument("--apps-json", required=True, help="discover_targets.py --emit-apps-json output")
+    ap.add_argument("--log-dir", required=True)
+    ap.add_argument("--parallel", type=int, default=2, help="concurrent builds (K)")
+    ap.add_argument("--jobs", type=int, default=0, help="total ninja job budget (0 = nproc)")
+    ap.add_argument("--history", default=DEFAULT_HISTORY_FILE)
+    ap.add_argument("--results", required=True,
+                    help="TSV: name, rc, seconds, expected binary, seconds saved (reused)")
+    ap.add_argument("--unified", action="store_true",
+                    help="share one gn out dir per group of compatible apps")
+    ap.add_argument("--timing-out", help="JSON: mode, wall + compile CPU seconds")
+    ap.add_argument("--incremental", metavar="STORE",
+                    help="reuse stored binaries of apps whose inputs didn't change")
+    ap.add_argument("--artifact-cache", metavar="DIR",
+                    help="serve/store exact builds from the local artifact cache")
+    ap.add_argument("--artifact-cache-max", default=artifact_cache.DEFAULT_MAX_SIZE)
+    ap.add_argument("--extra-gn-args", default="",
+                    help='appended to every app\'s gn args (e.g. pw_command_launcher="ccache")')
+    args = ap.parse_args()
+
+    sdk_dir = Path(args.sdk_dir).resolve()
+    apps = [a for a in json.loads(Path(args.apps_json).read_text()) if a.get("enabled", True)]
+    for a in apps:
+        a["extra_gn_args"] = f"{a.get('extra_gn_args', '')} {args.extra_gn_args}".strip()
+    budget = args.jobs if args.jobs > 0 else (os.cpu_count() or 4)
+    parallel = max(1, min(args.parallel, len(apps) or 1))
+    history_path = Path(args.history)
+    history = load_history(history_path)
+    print(f"[BUILD] {len(apps)} app(s), {parallel} at a time, ninja job budget {budget} "
+          f"({sum(1 for a in apps if a['name'] in history)} with a previous build time)",
+          flush=True)
+
+    t0 = time.time()
+    ru0 = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # One row per build as it completes (flushed), so the shell still records
+    # the finished builds if the orchestrator dies or is killed part-way.
+    with open(args.results, "w") as f:
+        def record(row):
+            f.write("\t".join(str(v) for v in row) + "\n")
+            f.flush()
+        results = orchestrate(apps, sdk_dir, Path(args.log_dir), parallel, budget, history,
+                              args.unified, args.incremental, args.artifact_cache,
+                              artifact_cache.parse_size(args.artifact_cache_max),
+                              on_result=record)
+    ru1 = resource.getrusage(resource.RUSAGE_CHILDREN)
+    wall = int(time.time() - t0)
+    cpu = int(ru1.ru_utime - ru0.ru_utime + ru1.ru_stime - ru0.ru_stime)
+    timing = {"ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+              "mode": "unified" if args.unified else "separate",
+              "apps": len(apps), "parallel": parallel, "jobs": budget,
+              "wall_s": wall, "cpu_s": cpu,
+              "reused": sum(1 for r in results if r[4] != ""),
+              "saved_s": sum(r[4] for r in results if r[4] != "")}
+    save_history(history_path, history, timing)
+    if args.timing_out:
+        Path(args.timing_out).write_text(json.dumps(timing, indent=2))
+    busy = sum(r[2] for r in results)
+    print(f"[BUILD] Wall time {wall // 60}m {wall % 60}s for {busy // 60}m {busy % 60}s "
+          f"of app builds", flush=True)
+    print(f"[BUILD] Compile CPU {cpu // 60}m {cpu % 60}s ({timing['mode']} out dirs)", flush=True)
+    if timing["reused"]:
+        saved = timing["saved_s"]
+        print(f"[BUILD] Reused {timing['reused']} app(s) (artifact cache / unchanged inputs), "
+              f"~{saved // 60}m {saved % 60}s of builds saved", flush=True)
+
+
+if __name__ == "__main__":
+    main()
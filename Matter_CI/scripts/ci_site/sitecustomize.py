@@ -0,0 +1,13 @@
+"""
+Loaded automatically by the python controller when run_tests.py prepends this
+directory to PYTHONPATH. Registers a SIGUSR1 faulthandler so the runner's hang
+detector can get an all-threads stack dump (written to stderr → the Ctrl Log)
+from a test that has stopped producing output.
+"""
+import signal
+import faulthandler
+
+try:
+    faulthandler.register(signal.SIGUSR1, all_threads=True)
+except (AttributeError, ValueError, RuntimeError):
+    pass
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+controller_forkserver.py
+========================
+Optional pre-imported fork server for the python controller (run_tests.py).
+
+Every TC normally spawns a fresh `python3 TC_XXX.py …`, which re-imports mobly,
+the chip/matter controller stack and its native library before any test logic
+runs — several seconds of CPU per TC on a Raspberry Pi. This daemon runs ONCE
+per test run inside the SDK venv, pre-imports those heavy modules, and then
+forks a child per TC that runs the test script with the TC's argv/env/cwd. The
+child starts with everything already in memory (copy-on-write), so the import
+cost is paid once per run instead of once per TC.
+
+Enabled by test_execution.controller_forkserver (off by default). run_tests.py
+ALWAYS falls back to a plain subprocess if the server is unavailable or a
+request fails — the forkserver is a pure speed-up, never a requirement.
+
+Protocol (AF_UNIX stream socket, one connection per TC):
+  client → server : b"RUN" + <u32 payload length>, with SCM_RIGHTS fds
+                    [stdin_read_end, stdout_write_end], then a JSON payload
+                    {"argv": [...], "env": {...}, "cwd": "..."}
+  server → client : {"pid": <child pid>}\\n     (child is its own session leader,
+                                                so os.killpg(pid) works as usual)
+                    {"rc": <exit code>}\\n      (negative = killed by signal)
+
+Server side (run by the venv python — see ForkServerClient.start):
+  python3 controller_forkserver.py --socket /tmp/matterci_forksrv.sock \\
+      --log logs/forkserver.log [--preload mod1,mod2,...]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import runpy
+import select
+import signal
+import socket
+import struct
+import argparse
+import threading
+import subprocess
+import traceback
+from pathlib import Path
+
+# Heavy modules a python_testing TC imports before its first step. Names that
+# don't exist in the installed wheels (the chip → matter package rename moved
+# them across SDK versions) are skipped silently.
+DEFAULT_PRELOAD = [
+    "mobly.base_test", "mobly.test_runner", "mobly.signals", "mobly.asserts",
+    "chip", "chip.ChipDeviceCtrl", "chip.clusters", "chip.interaction_model",
+    "chip.testing.matter_testing",
+    "matter", "matter.ChipDeviceCtrl", "matter.clusters",
+    "matter.interaction_model", "matter.testing.matter_testing",
+]
+
+_HDR = struct.Struct("!3sI")   # b"RUN" + payload length
+
+
+# =============================================================================
+# Server (runs inside the SDK venv)
+# =============================================================================
+def _preload(modules: list[str]) -> tuple[float, list[str]]:
+    """Import each module; returns (total seconds, modules actually imported)."""
+    loaded = []
+    start = time.monotonic()
+    for name in modules:
+        try:
+            __import__(name)
+            loaded.append(name)
+        except Exception:   # noqa: BLE001 — missing/renamed module → skip
+            continue
+    return round(time.monotonic() - start, 2), loaded
+
+
+def _recv_exact(conn: socket.socket, n: int) -> bytes:
+    buf = b""
+    while len(buf) < n:
+        chunk = conn.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("client closed before payload was complete")
+        buf += chunk
+    return buf
+
+
+def _run_child(req: dict, stdin_fd: int, stdout_fd: int):
+    """The forked TC process: become a session leader, wire stdio, run the script."""
+    os.setsid()
+    os.dup2(stdin_fd, 0)
+    os.dup2(stdout_fd, 1)
+    os.dup2(stdout_fd, 2)
+    for fd in (stdin_fd, stdout_fd):
+        if fd > 2:
+            os.close(fd)
+    # Fresh line-buffered text streams on the new fds (the inherited ones point
+    # at the server's log file).
+    sys.stdin  = io.TextIOWrapper(io.FileIO(0, "r", closefd=False))
+    sys.stdout = io.TextIOWrapper(io.FileIO(1, "w", closefd=False), line_buffering=True)
+    sys.stderr = io.TextIOWrapper(io.FileIO(2, "w", closefd=False), line_buffering=True)
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    # Same SIGUSR1 stack-dump hook a subprocess gets from ci_site/sitecustomize.py
+    # (PYTHONPATH isn't re-read by a forked, already-initialised interpreter).
+    try:
+        import faulthandler
+        faulthandler.register(signal.SIGUSR1, all_threads=True)
+    except (AttributeError, ValueError, RuntimeError):
+        pass
+
+    os.environ.clear()
+    os.environ.update(req.get("env") or {})
+    os.chdir(req.get("cwd") or ".")
+    argv = req["argv"]
+    script = argv[1]
+    sys.argv = argv[1:]
+    sys.path[0] = str(Path(script).resolve().parent)
+
+    rc = 0
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        code = e.code
+        rc = code if isinstance(code, int) else (0 if code is None else 1)
+        if code is not None and not isinstance(code, int):
+            print(code, file=sys.stderr)
+    except BaseException:   # noqa: BLE001 — mirror an uncaught-exception exit
+        traceback.print_exc()
+        rc = 1
+    try:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    except Exception:
+        pass
+    os._exit(rc)
+
+
+def _handle(conn: socket.socket, listener: socket.socket):
+    """Monitor process (forked per request): fork the TC child, report pid + rc."""
+    # The server's SIGCHLD → _reap handler would collect our TC child before the
+    # waitpid below (ChildProcessError, rc never sent).
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    listener.close()
+    msg, fds, _flags, _addr = socket.recv_fds(conn, _HDR.size, 2)
+    if len(msg) < _HDR.size:
+        msg += _recv_exact(conn, _HDR.size - len(msg))
+    tag, length = _HDR.unpack(msg)
+    if tag != b"RUN" or len(fds) != 2:
+        os._exit(2)
+    req = json.loads(_recv_exact(conn, length).decode())
+    stdin_fd, stdout_fd = fds
+
+    pid = os.fork()
+    if pid == 0:
+        conn.close()
+        _run_child(req, stdin_fd, stdout_fd)
+    os.close(stdin_fd)
+    os.close(stdout_fd)
+    try:
+        conn.sendall((json.dumps({"pid": pid}) + "\n").encode())
+    except OSError:
+        pass
+    _, status = os.waitpid(pid, 0)
+    rc = (-os.WTERMSIG(status) if os.WIFSIGNALED(status)
+          else os.WEXITSTATUS(status))
+    try:
+        conn.sendall((json.dumps({"rc": rc}) + "\n").encode())
+    except OSError:
+        pass
+    os._exit(0)
+
+
+def serve(sock_path: str, log_path: str, preload: list[str]):
+    parent = os.getppid()
+    seconds, loaded = _preload(preload)
+    try:
+        import gc
+        gc.freeze()   # keep the preloaded heap out of GC passes → fewer COW copies
+    except Exception:
+        pass
+
+    if os.path.exists(sock_path):
+        os.remove(sock_path)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(sock_path)
+    listener.listen(8)
+
+    # Handshake on stdout (the runner waits for exactly this line), then move
+    # our own output to the log so an unread pipe can never block the server.
+    print(json.dumps({"ready": True, "import_s": seconds, "modules": loaded}), flush=True)
+    Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+    log_fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    os.dup2(log_fd, 1)
+    os.dup2(log_fd, 2)
+    os.close(log_fd)
+    print(f"[FORKSRV] pid {os.getpid()} ready on {sock_path} — preloaded "
+          f"{len(loaded)} module(s) in {seconds}s: {', '.join(loaded)}", flush=True)
+
+    # Reap finished monitor processes without blocking the accept loop.
+    signal.signal(signal.SIGCHLD, lambda *_: _reap())
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        while True:
+            # Exit when the runner that started us is gone (no orphaned daemon).
+            if os.getppid() != parent:
+                print("[FORKSRV] parent exited — shutting down", flush=True)
+                break
+            ready, _, _ = select.select([listener], [], [], 1.0)
+            if not ready:
+                continue
+            conn, _ = listener.accept()
+            if os.fork() == 0:
+                # A monitor (or its TC child) must never unwind into the cleanup
+                # below — it would remove the socket every later TC connects to.
+                try:
+                    _handle(conn, listener)
+                except BaseException:   # noqa: BLE001
+                    traceback.print_exc()
+                finally:
+                    os._exit(1)
+            conn.close()
+    finally:
+        listener.close()
+        try:
+            os.remove(sock_path)
+        except OSError:
+            pass
+
+
+def _reap():
+    while True:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+
+
+# =============================================================================
+# Client (used by run_tests.py — runs under the system python)
+# =============================================================================
+class ForkServerProcess:
+    """
+    Minimal subprocess.Popen look-alike for a forkserver child: exposes pid,
+    stdin/stdout (text, line-buffered), poll(), wait() and returncode — the
+    subset _run_python_prompted uses. The child is a session leader, so the
+    runner's os.killpg(os.getpgid(pid), …) works unchanged.
+    """
+
+    def __init__(self, conn: socket.socket, reader, pid: int, stdin, stdout):
+        self.pid = pid
+        self.stdin = stdin
+        self.stdout = stdout
+        self.returncode = None
+        self._conn = conn
+        self._reader = reader     # the one buffered reader of conn (pid line already read)
+        self._done = threading.Event()
+        threading.Thread(target=self._wait_rc, daemon=True).start()
+
+    def _wait_rc(self):
+        rc = -1   # connection lost without a status → unknown failure
+        try:
+            for line in self._reader:
+                msg = json.loads(line)
+                if "rc" in msg:
+                    rc = int(msg["rc"])
+                    break
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._reader.close()
+            self._conn.close()
+        self.returncode = rc
+        self._done.set()
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        if not self._done.wait(timeout):
+            raise subprocess.TimeoutExpired("forkserver-child", timeout)
+        return self.returncode
+
+
+class ForkServerClient:
+    """Starts/stops the daemon and spawns TC processes through it."""
+
+    def __init__(self, venv_python: Path, cwd: Path, env: dict, log_path: Path,
+                 preload: list[str] = None, startup_timeout: float = 120):
+        self.venv_python = Path(venv_python)
+        self.cwd = Path(cwd)
+        self.env = env
+        self.log_path = Path(log_path)
+        self.preload = preload or list(DEFAULT_PRELOAD)
+        self.startup_timeout = startup_timeout
+        self.sock_path = f"/tmp/matterci_forksrv_{os.getpid()}.sock"
+        self.import_s = 0.0
+        self.cold_s = 0.0          # fresh `python -c "import <modules>"` (baseline)
+        self.modules: list[str] = []
+        self._proc = None
+
+    @property
+    def running(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self) -> tuple[bool, str]:
+        """Launch the daemon and wait for its ready handshake. Returns (ok, err)."""
+        try:
+            self._proc = subprocess.Popen(
+                [str(self.venv_python), str(Path(__file__).resolve()),
+                 "--socket", self.sock_path, "--log", str(self.log_path),
+                 "--preload", ",".join(self.preload)],
+                stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT, text=True, cwd=str(self.cwd), env=self.env,
+            )
+        except OSError as e:
+            return False, f"could not start forkserver: {e}"
+        ready, _, _ = select.select([self._proc.stdout], [], [], self.startup_timeout)
+        line = self._proc.stdout.readline() if ready else ""
+        try:
+            info = json.loads(line)
+        except ValueError:
+            self.stop()
+            return False, (f"forkserver did not become ready within "
+                           f"{self.startup_timeout}s ({line.strip()[:160] or 'no output'})")
+        self.import_s = float(info.get("import_s", 0.0))
+        self.modules = list(info.get("modules", []))
+        self.cold_s = self._cold_start()
+        return True, ""
+
+    def _cold_start(self) -> float:
+        """Wall time of a fresh interpreter importing the preloaded modules — what
+        each TC pays without the server. 0.0 when it can't be measured."""
+        if not self.modules:
+            return 0.0
+        start = time.monotonic()
+        try:
+            rc = subprocess.run(
+                [str(self.venv_python), "-c", "import " + ", ".join(self.modules)],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL, cwd=str(self.cwd), env=self.env,
+                timeout=self.startup_timeout).returncode
+        except (OSError, subprocess.TimeoutExpired):
+            return 0.0
+        return round(time.monotonic() - start, 2) if rc == 0 else 0.0
+
+    def spawn(self, argv: list[str], env: dict, cwd: Path) -> ForkServerProcess:
+        """Fork a TC child with argv/env/cwd. Raises OSError/ValueError on failure."""
+        if not self.running:
+            raise OSError("forkserver is not running")
+        stdin_r, stdin_w = os.pipe()
+        stdout_r, stdout_w = os.pipe()
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # ONE buffered reader for both server lines: a fast-exiting TC's rc line
+        # can arrive with the pid line, and a second makefile() would not see
+        # what this one already buffered.
+        reader = conn.makefile("r")
+        try:
+            conn.connect(self.sock_path)
+            payload = json.dumps({"argv": [str(a) for a in argv], "env": env,
+                                  "cwd": str(cwd)}).encode()
+            socket.send_fds(conn, [_HDR.pack(b"RUN", len(payload))], [stdin_r, stdout_w])
+            conn.sendall(payload)
+            line = reader.readline()
+            pid = int(json.loads(line)["pid"])
+        except (OSError, ValueError, KeyError):
+            reader.close()
+            conn.close()
+            for fd in (stdin_r, stdin_w, stdout_r, stdout_w):
+                os.close(fd)
+            raise
+        # Our copies of the child's ends must go, or stdout never hits EOF.
+        os.close(stdin_r)
+        os.close(stdout_w)
+        stdin = os.fdopen(stdin_w, "w", buffering=1)
+        stdout = os.fdopen(stdout_r, "r", buffering=1)
+        return ForkServerProcess(conn, reader, pid, stdin, stdout)
+
+    def stop(self):
+        if self._proc is None:
+            return
+        if self._proc.poll() is None:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+        self._proc = None
+        try:
+            os.remove(self.sock_path)
+        except OSError:
+            pass
+
+
+# =============================================================================
+# Main (server entry point)
+# =============================================================================
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--socket", required=True, help="Unix socket path to listen on")
+    ap.add_argument("--log", required=True, help="Server log file")
+    ap.add_argument("--preload", default=",".join(DEFAULT_PRELOAD),
+                    help="Comma-separated modules to import before serving")
+    args = ap.parse_args()
+    serve(args.socket, args.log, [m for m in args.preload.split(",") if m.strip()])
+
+
+if __name__ == "__main__":
+    main()
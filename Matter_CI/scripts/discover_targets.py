@@ -10,6 +10,24 @@ modifiers) into the concrete build list every consumer uses.
 
 READ-ONLY: it never modifies build_config.yaml or triggers a build.
 
+The resolved app table is cached on disk (discovery.cache_dir, default
+~/matter-ci-results/discovery_cache; $MATTER_DISCOVERY_CACHE_DIR overrides it —
+the build container sets it to its /matter-ci-results mount), keyed by the SDK
+HEAD commit + a hash of the discovery section + this script. Every consumer
+after the first one on an SDK commit resolves from the cache in milliseconds.
+A checkout that isn't a git repo (no HEAD) is never cached. A cold query
+imports the SDK's target definitions directly (fetch_targets_direct) and only
+sources activate.sh (seconds, up to a 120s timeout) when that import fails.
+
+The build also ships the resolved table in the bundle as apps_manifest.json
+(+ each deployed binary's sha256); prepare_rpi_tests.py puts it at
+logs/apps_manifest.json and every RPi consumer reads it from there, so the RPi
+doesn't source activate.sh at all. Live discovery is the fallback when the
+manifest is missing, of another MANIFEST_VERSION, was written for a different
+discovery section or SDK commit (its commit must equal the checkout's HEAD), or
+its sha256 rows don't match the bundle's binaries (verify_manifest_binaries,
+checked once by prepare_rpi_tests.py when it installs the bundle).
+
 Importable API (used by build_inside_container.sh, upload_artifacts.py,
 run_tests.py, fetch_test_commands.py):
   resolve_pipeline_apps(sdk_dir, config) -> [{name, enabled, source_dir,
@@ -18,21 +36,41 @@ run_tests.py, fetch_test_commands.py):
 CLI:
   # machine-readable resolved apps (stdout JSON) — used by the build container:
   python3 scripts/discover_targets.py --sdk-dir <SDK> --config <build_config.yaml> --emit-apps-json
+  # bundle manifest from that JSON + the collected binaries (build container):
+  python3 scripts/discover_targets.py --sdk-dir <SDK> --config <build_config.yaml> \
+      --write-manifest <OUT>/apps_manifest.json --apps-json <apps.json> --apps-dir <OUT>/apps
   # regenerate the full discovery.apps: menu (paste into build_config.yaml):
   python3 scripts/discover_targets.py --sdk-dir <SDK> --emit-config-apps
+  # cold target-query latency, direct import vs activate.sh (run on both the
+  # Mac mini build container and the RPi):
+  python3 scripts/discover_targets.py --sdk-dir <SDK> --benchmark [--runs 3]
 """
 
 import os
 import re
 import sys
 import json
+import time
+import hashlib
+import platform
+import statistics
 import argparse
 import subprocess
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 SCRIPT_DIR   = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 
+DEFAULT_CACHE_DIR = "~/matter-ci-results/discovery_cache"
+CACHE_KEEP = 10          # newest cache files kept (one per SDK commit/config)
+
+# Bundle manifest (see the module docstring). Bump MANIFEST_VERSION when the
+# per-app schema changes — an older/newer manifest is then ignored.
+MANIFEST_NAME    = "apps_manifest.json"
+MANIFEST_VERSION = 1
+DEFAULT_MANIFEST = PROJECT_ROOT / "logs" / MANIFEST_NAME
+
 try:
     import yaml
 except ImportError:
@@ -42,10 +80,57 @@ except ImportError:
 # =============================================================================
 # Step 1 — Query the SDK for its canonical target list
 # =============================================================================
-def fetch_targets(sdk_dir: Path, quiet: bool = False) -> list[dict]:
+# The target list is pure Python data (scripts/build/build/targets.py builds
+# BUILD_TARGETS from the builders' enums) — it doesn't need gn, ninja or the
+# pigweed toolchain. Importing it in a bare interpreter with only scripts/build
+# on sys.path skips sourcing activate.sh (seconds cold; CIPD checks, venv
+# setup). It runs in a subprocess so the SDK's import side effects and sys.path
+# stay out of this process, and the printed JSON is the same
+# `build_examples.py targets --format json` emits.
+_DIRECT_TARGETS = r"""
+import sys, json
+sys.path.insert(0, sys.argv[1])
+from build.targets import BUILD_TARGETS
+print(json.dumps([t.ToDict() for t in BUILD_TARGETS]))
+"""
+
+TARGET_QUERY_MODES = ("auto", "direct", "activate")
+
+
+def fetch_targets_direct(sdk_dir: Path, timeout: int = 60) -> list[dict] | None:
+    """
+    Target list via a direct import of the SDK's build target definitions
+    (see _DIRECT_TARGETS), or None when that fails (a builder module needs a
+    package only the activated environment has, an older SDK layout, …).
+    """
+    build_dir = sdk_dir / "scripts" / "build"
+    try:
+        result = subprocess.run(
+            [sys.executable, "-c", _DIRECT_TARGETS, str(build_dir)],
+            cwd=str(sdk_dir), capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"[WARN] direct target import failed ({e})", file=sys.stderr)
+        return None
+    if result.returncode != 0:
+        err = (result.stderr.strip().splitlines() or ["?"])[-1]
+        print(f"[WARN] direct target import failed: {err}", file=sys.stderr)
+        return None
+    try:
+        targets = json.loads(result.stdout)
+    except json.JSONDecodeError:
+        print("[WARN] direct target import printed no JSON", file=sys.stderr)
+        return None
+    return targets if isinstance(targets, list) and targets else None
+
+
+def fetch_targets(sdk_dir: Path, quiet: bool = False, mode: str = "auto") -> list[dict]:
     """
-    Runs `scripts/build/build_examples.py targets --format json` inside
-    the SDK directory and returns the parsed list of target dicts.
+    Returns the SDK's parsed list of target dicts. mode:
+      auto      direct import first (fetch_targets_direct), the activated
+                environment if that fails
+      direct    direct import only (exit on failure)
+      activate  `source scripts/activate.sh && build_examples.py targets
+                --format json` only — the original path
 
     When quiet=True, all progress/diagnostic output goes to stderr so that
     stdout can carry machine-readable JSON only (used by --emit-apps-json).
@@ -63,6 +148,17 @@ def fetch_targets(sdk_dir: Path, quiet: bool = False) -> list[dict]:
         print(f"[ERROR] Is this a valid connectedhomeip checkout?", file=sys.stderr)
         sys.exit(1)
 
+    if mode in ("auto", "direct"):
+        targets = fetch_targets_direct(sdk_dir)
+        if targets is not None:
+            print(f"[INFO] SDK reports {len(targets)} total buildable targets "
+                  f"(direct import, no activate.sh)", file=out)
+            return targets
+        if mode == "direct":
+            print("[ERROR] direct target import failed (see above)", file=sys.stderr)
+            sys.exit(1)
+        print("[INFO] Falling back to the activated environment", file=out)
+
     print(f"[INFO] Querying SDK target list from: {sdk_dir}", file=out)
     print(f"[INFO] Running: source scripts/activate.sh && "
           f"scripts/build/build_examples.py targets --format json", file=out)
@@ -159,9 +255,51 @@ def resolve_app_path(sdk_dir: Path, app_guess: str) -> Path | None:
     return None
 
 
+# BUILD.gn declaration index: example dir → its executable() names + first
+# output_name. Several config apps share one example dir (modifier variants,
+# binary_name overrides), so each BUILD.gn is read once per process and every
+# app/variant queries the index; index_build_gn() fills it for all referenced
+# dirs at once in a thread pool (the reads are I/O-bound).
+_EXECUTABLE_RE  = re.compile(r'executable\("([^"]+)"\)')
+_OUTPUT_NAME_RE = re.compile(r'output_name\s*=\s*"([^"]+)"')
+_GN_INDEX: dict[str, dict | None] = {}
+
+
+def _parse_build_gn(linux_dir: Path) -> dict | None:
+    """{"executables": [...], "output_name": str | None}, or None without a
+    readable BUILD.gn."""
+    try:
+        text = (linux_dir / "BUILD.gn").read_text()
+    except Exception:
+        return None
+    m = _OUTPUT_NAME_RE.search(text)
+    return {"executables": _EXECUTABLE_RE.findall(text),
+            "output_name": m.group(1) if m else None}
+
+
+def build_gn_decls(linux_dir: Path) -> dict | None:
+    """Memoised _parse_build_gn()."""
+    key = str(Path(linux_dir).resolve())
+    if key not in _GN_INDEX:
+        _GN_INDEX[key] = _parse_build_gn(Path(key))
+    return _GN_INDEX[key]
+
+
+def index_build_gn(dirs, workers: int = 8) -> int:
+    """Parse the BUILD.gn of every not-yet-indexed dir in `dirs` concurrently.
+    Returns how many were parsed."""
+    todo = sorted({str(Path(d).resolve()) for d in dirs} - set(_GN_INDEX))
+    if not todo:
+        return 0
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(todo)))) as pool:
+        for key, decls in zip(todo, pool.map(lambda k: _parse_build_gn(Path(k)), todo)):
+            _GN_INDEX[key] = decls
+    return len(todo)
+
+
 def resolve_binary_name(linux_dir: Path) -> str | None:
     """
-    Parses BUILD.gn for the real executable() target name.
+    The real executable() target name from BUILD.gn (via the index).
     Looks for: executable("some-binary-name") { ... }
 
     Some BUILD.gn files declare MULTIPLE executable() blocks — e.g.
@@ -169,21 +307,15 @@ def resolve_binary_name(linux_dir: Path) -> str | None:
     prefer the standard/normal one, not just take the first regex match
     (which can incorrectly grab a fuzzing-only build target).
     """
-    build_gn = linux_dir / "BUILD.gn"
-    if not build_gn.exists():
-        return None
-
-    try:
-        text = build_gn.read_text()
-    except Exception:
+    decls = build_gn_decls(linux_dir)
+    if decls is None:
         return None
 
-    all_matches = re.findall(r'executable\("([^"]+)"\)', text)
+    all_matches = decls["executables"]
 
     if not all_matches:
         # Some apps use output_name = "..." inside the executable block instead
-        match = re.search(r'output_name\s*=\s*"([^"]+)"', text)
-        return match.group(1) if match else None
+        return decls["output_name"]
 
     if len(all_matches) == 1:
         return all_matches[0]
@@ -298,22 +430,8 @@ def _valid_binary_name(n) -> bool:
     return bool(n) and "/" not in n and "$" not in n and "{" not in n
 
 
-def _resolve_source_binary(name, enum_name, HostApp, sdk_dir):
-    """
-    Resolve (source_dir, binary_name, is_reference_app) for one app.
-
-    - source_dir: from the authoritative HostApp.ExamplePath() (avoids the
-      fragile fuzzy folder match, e.g. "light" -> lighting-app not light-switch);
-      falls back to a fuzzy example-folder search if HostApp is unavailable.
-    - binary_name: from the ACTUAL BUILD.gn executable() (what gn_build_example
-      really produces), because HostApp.OutputNames() can drift from it on some
-      SDK versions (e.g. dishwasher: OutputNames 'dishwasher-app' vs BUILD.gn
-      'chip-dishwasher-app'). Falls back to OutputNames only when BUILD.gn can't
-      be parsed to a clean name (e.g. simulated-app uses a '${var}' template).
-      This keeps collect/upload/run_tests aligned with the real built file.
-
-    Returns (None, None, False) if unresolvable.
-    """
+def _locate_source(name, enum_name, HostApp, sdk_dir) -> tuple[str | None, str | None]:
+    """(source_dir, HostApp.OutputNames() binary) — see _resolve_source_binary."""
     source_dir = None
     output_name = None   # HostApp.OutputNames() — used as a fallback only
 
@@ -333,6 +451,42 @@ def _resolve_source_binary(name, enum_name, HostApp, sdk_dir):
         linux_dir = resolve_app_path(sdk_dir, name)
         if linux_dir is not None:
             source_dir = str(linux_dir.relative_to(sdk_dir))
+    return source_dir, output_name
+
+
+def locate_and_index(parts: list[dict], HostApp, sdk_dir) -> dict[str, tuple]:
+    """
+    _locate_source() for every app part, then one concurrent pass over the
+    distinct BUILD.gn files they point at (index_build_gn). Returns
+    {name: (source_dir, output_name)} for _resolve_source_binary(located=…).
+    """
+    located = {p["name"]: _locate_source(p["name"], p["hostapp"], HostApp, sdk_dir)
+               for p in parts}
+    index_build_gn(sdk_dir / src for src, _ in located.values()
+                   if src and (sdk_dir / src).exists())
+    return located
+
+
+def _resolve_source_binary(name, enum_name, HostApp, sdk_dir, located=None):
+    """
+    Resolve (source_dir, binary_name, is_reference_app) for one app.
+
+    - source_dir: from the authoritative HostApp.ExamplePath() (avoids the
+      fragile fuzzy folder match, e.g. "light" -> lighting-app not light-switch);
+      falls back to a fuzzy example-folder search if HostApp is unavailable.
+    - binary_name: from the ACTUAL BUILD.gn executable() (what gn_build_example
+      really produces), because HostApp.OutputNames() can drift from it on some
+      SDK versions (e.g. dishwasher: OutputNames 'dishwasher-app' vs BUILD.gn
+      'chip-dishwasher-app'). Falls back to OutputNames only when BUILD.gn can't
+      be parsed to a clean name (e.g. simulated-app uses a '${var}' template).
+      This keeps collect/upload/run_tests aligned with the real built file.
+
+    `located` is this app's (source_dir, output_name) from locate_and_index();
+    without it the source is located here.
+
+    Returns (None, None, False) if unresolvable.
+    """
+    source_dir, output_name = located or _locate_source(name, enum_name, HostApp, sdk_dir)
 
     if not source_dir:
         return None, None, False
@@ -421,7 +575,161 @@ def _first_binary(output_names) -> str | None:
     return None
 
 
-def resolve_pipeline_apps(sdk_dir, config: dict) -> list[dict]:
+# =============================================================================
+# Resolved-app cache (SDK HEAD + discovery section + this script)
+# =============================================================================
+_MEMO: dict[str, list[dict]] = {}   # in-process: repeat calls skip even the disk
+
+
+def sdk_head(sdk_dir: Path) -> str:
+    """HEAD commit of the SDK checkout ("" when it isn't a git repo)."""
+    try:
+        r = subprocess.run(["git", "rev-parse", "HEAD"], cwd=str(sdk_dir),
+                           capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    return r.stdout.strip() if r.returncode == 0 else ""
+
+
+def discovery_hash(disc: dict) -> str:
+    """sha256 of the discovery section, minus cache_dir (where, not what)."""
+    return hashlib.sha256(json.dumps({k: v for k, v in disc.items() if k != "cache_dir"},
+                                     sort_keys=True, default=str).encode()).hexdigest()
+
+
+def discovery_cache_key(sdk_dir: Path, disc: dict) -> str:
+    """sha256 of SDK HEAD + the discovery section (minus cache_dir) + this
+    script's source, or "" when the SDK commit is unknown."""
+    head = sdk_head(sdk_dir)
+    if not head:
+        return ""
+    h = hashlib.sha256()
+    h.update(head.encode() + b"\0")
+    h.update(discovery_hash(disc).encode() + b"\0")
+    h.update(Path(__file__).read_bytes())
+    return h.hexdigest()
+
+
+def _cache_read(cache_dir: Path, key: str) -> list[dict] | None:
+    try:
+        doc = json.loads((cache_dir / f"{key}.json").read_text())
+    except (OSError, ValueError):
+        return None
+    apps = doc.get("apps")
+    return apps if isinstance(apps, list) else None
+
+
+def _cache_write(cache_dir: Path, key: str, sdk_dir: Path, apps: list[dict]):
+    """Atomic write, then prune to the newest CACHE_KEEP files."""
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache_dir / f".{key}.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps({"sdk_dir": str(sdk_dir), "apps": apps}, indent=2))
+        os.replace(tmp, cache_dir / f"{key}.json")
+        files = sorted(cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime,
+                       reverse=True)
+        for old in files[CACHE_KEEP:]:
+            old.unlink(missing_ok=True)
+    except OSError as e:
+        print(f"[WARN] discovery cache not written: {e}", file=sys.stderr)
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def write_manifest(out: Path, apps: list[dict], apps_dir: Path, commit: str, disc: dict):
+    """apps_manifest.json: the resolved apps + sha256 of each deployed binary in
+    apps_dir (null when it wasn't built — the table still maps it to its app)."""
+    rows = []
+    for a in apps:
+        b = Path(apps_dir) / a["binary_name"]
+        rows.append({**a, "sha256": _sha256_file(b) if b.is_file() else None})
+    Path(out).write_text(json.dumps({
+        "version": MANIFEST_VERSION, "commit": commit,
+        "discovery_hash": discovery_hash(disc), "apps": rows}, indent=2))
+    return rows
+
+
+def load_manifest(path, disc: dict, sdk_dir) -> list[dict] | None:
+    """The manifest's app table, or None (missing / other version / written
+    for a different discovery section or another commit than sdk_dir's HEAD)
+    → caller falls back to discovery."""
+    try:
+        doc = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return None
+    if doc.get("version") != MANIFEST_VERSION:
+        print(f"[WARN] {path}: manifest version {doc.get('version')!r} != "
+              f"{MANIFEST_VERSION} — ignored", file=sys.stderr)
+        return None
+    if doc.get("discovery_hash") != discovery_hash(disc):
+        print(f"[WARN] {path}: built for a different discovery section — ignored",
+              file=sys.stderr)
+        return None
+    head = sdk_head(Path(sdk_dir))
+    if not head or doc.get("commit") != head:
+        print(f"[WARN] {path}: built at {str(doc.get('commit') or '?')[:9]}, SDK checkout "
+              f"is at {head[:9] or '?'} — ignored", file=sys.stderr)
+        return None
+    apps = doc.get("apps")
+    return apps if isinstance(apps, list) else None
+
+
+def verify_manifest_binaries(path, apps_dir) -> list[str]:
+    """Binaries in apps_dir whose sha256 differs from the manifest's row (a row
+    of null = not built; a missing file is not a mismatch)."""
+    try:
+        rows = json.loads(Path(path).read_text()).get("apps") or []
+    except (OSError, ValueError, AttributeError):
+        return []
+    bad = []
+    for r in rows:
+        b = Path(apps_dir) / str(r.get("binary_name", ""))
+        if r.get("sha256") and b.is_file() and _sha256_file(b) != r["sha256"]:
+            bad.append(b.name)
+    return bad
+
+
+def resolve_pipeline_apps(sdk_dir, config: dict, use_cache: bool = True,
+                          manifest=DEFAULT_MANIFEST) -> list[dict]:
+    """
+    The bundle's apps manifest when there is a valid one (RPi), else
+    resolve_apps() through the on-disk cache (see the module docstring).
+    use_cache=False always queries the SDK (and refreshes the cache entry);
+    manifest=None skips the manifest (the build container resolves live).
+    """
+    sdk_dir = Path(sdk_dir)
+    disc = (config or {}).get("discovery", {}) or {}
+    if manifest is not None and isinstance(disc, dict):
+        apps = load_manifest(manifest, disc, sdk_dir)
+        if apps is not None:
+            return [dict(a) for a in apps]
+    key = discovery_cache_key(sdk_dir, disc) if isinstance(disc, dict) else ""
+    if not key:
+        return resolve_apps(sdk_dir, config)
+    if use_cache and key in _MEMO:
+        return [dict(a) for a in _MEMO[key]]
+    cache_dir = Path(os.environ.get("MATTER_DISCOVERY_CACHE_DIR")
+                     or disc.get("cache_dir") or DEFAULT_CACHE_DIR).expanduser()
+    apps = _cache_read(cache_dir, key) if use_cache else None
+    if apps is not None:
+        print(f"[INFO] discovery: {len(apps)} app(s) from cache "
+              f"({cache_dir / key[:12]}…)", file=sys.stderr)
+    else:
+        apps = resolve_apps(sdk_dir, config)
+        # An empty result is usually an unbootstrapped SDK — don't pin it.
+        if apps:
+            _cache_write(cache_dir, key, sdk_dir, apps)
+    _MEMO[key] = [dict(a) for a in apps]
+    return apps
+
+
+def resolve_apps(sdk_dir, config: dict) -> list[dict]:
     """
     Return the list of reference apps the pipeline should build, resolved
     dynamically from the SDK's own HostApp mapping. This is the single source
@@ -474,6 +782,11 @@ def resolve_pipeline_apps(sdk_dir, config: dict) -> list[dict]:
         if isinstance(ov, str) and ov.strip():
             overrides[name] = ov.strip()
 
+    # Locate every wanted app's example dir, then parse their BUILD.gn files in
+    # one concurrent pass — variants sharing a dir reuse the same index entry.
+    located = locate_and_index([p for p in app_parts if p["name"] in wanted],
+                               HostApp, sdk_dir)
+
     resolved = []
     for part in app_parts:
         name, enum_name = part["name"], part["hostapp"]
@@ -481,7 +794,7 @@ def resolve_pipeline_apps(sdk_dir, config: dict) -> list[dict]:
             continue
 
         source_dir, binary_name, _is_ref = _resolve_source_binary(
-            name, enum_name, HostApp, sdk_dir)
+            name, enum_name, HostApp, sdk_dir, located.get(name))
         if not source_dir or not binary_name:
             print(f"[WARN] Skipping '{name}': could not resolve source/binary "
                   f"from SDK.", file=sys.stderr)
@@ -536,6 +849,36 @@ def resolve_pipeline_apps(sdk_dir, config: dict) -> list[dict]:
     return resolved
 
 
+def benchmark(sdk_dir: Path, runs: int = 3) -> dict:
+    """
+    Cold target-query latency of both paths. Every run is a fresh subprocess
+    (nothing shared but the OS page cache), alternating the two paths so neither
+    gets a warmer cache. Also checks they report the same target names.
+    """
+    times: dict[str, list[float]] = {"direct": [], "activate": []}
+    names: dict[str, set] = {}
+    for _ in range(max(int(runs), 1)):
+        for mode in times:
+            t0 = time.monotonic()
+            try:
+                targets = fetch_targets(sdk_dir, quiet=True, mode=mode)
+            except SystemExit:
+                targets = None
+            if targets is None:
+                continue
+            times[mode].append(time.monotonic() - t0)
+            names[mode] = {t.get("name") for t in targets}
+    res = {"host": platform.node(), "machine": platform.machine(),
+           "sdk_commit": sdk_head(sdk_dir), "runs": runs,
+           "same_targets": names.get("direct") == names.get("activate")
+           if len(names) == 2 else None}
+    for mode, ts in times.items():
+        res[mode] = ({"ok": len(ts), "min_s": round(min(ts), 3),
+                      "median_s": round(statistics.median(ts), 3)} if ts
+                     else {"ok": 0})
+    return res
+
+
 def load_config(config_path: Path) -> dict:
     """Load build_config.yaml (used by --emit-apps-json)."""
     if yaml is None:
@@ -561,13 +904,15 @@ def generate_config_apps(sdk_dir):
     app_parts = extract_app_parts(targets)
     HostApp = import_hostapp(sdk_dir)
 
+    parts = [p for p in app_parts if p["name"] and p["name"] not in SEPARATELY_BUILT
+             and p["hostapp"] not in NON_APP_ENUMS]
+    located = locate_and_index(parts, HostApp, sdk_dir)
+
     rows = []
-    for part in app_parts:
+    for part in parts:
         name, enum_name = part["name"], part["hostapp"]
-        if not name or name in SEPARATELY_BUILT or enum_name in NON_APP_ENUMS:
-            continue
         source_dir, binary_name, is_ref = _resolve_source_binary(
-            name, enum_name, HostApp, sdk_dir)
+            name, enum_name, HostApp, sdk_dir, located[name])
         if not source_dir or not binary_name:
             continue
         # Real example subfolder only (NON_APP_ENUMS already drops '../' meta paths).
@@ -612,6 +957,19 @@ def main():
     parser.add_argument("--config", metavar="CONFIG_PATH",
                         help="build_config.yaml to read discovery.apps "
                              "(enabled flags + modifiers) from (for --emit-apps-json)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Query the SDK even if the resolved apps are cached "
+                             "for this SDK commit (refreshes the cache entry).")
+    parser.add_argument("--write-manifest", metavar="OUT",
+                        help="Write the bundle's apps_manifest.json (requires "
+                             "--config, --apps-json and --apps-dir).")
+    parser.add_argument("--apps-json", help="--emit-apps-json output (for --write-manifest)")
+    parser.add_argument("--apps-dir", help="collected app binaries (for --write-manifest)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Time cold target queries: direct import vs activate.sh.")
+    parser.add_argument("--runs", type=int, default=3, help="runs per path (--benchmark)")
+    parser.add_argument("--benchmark-out", metavar="JSON",
+                        help="also write the --benchmark result here")
     args = parser.parse_args()
 
     sdk_dir = Path(args.sdk_dir).expanduser().resolve()
@@ -623,16 +981,47 @@ def main():
                   file=sys.stderr)
             sys.exit(1)
         cfg = load_config(Path(args.config).expanduser().resolve())
-        apps = resolve_pipeline_apps(sdk_dir, cfg)
+        apps = resolve_pipeline_apps(sdk_dir, cfg, use_cache=not args.no_cache,
+                                     manifest=None)
         print(json.dumps(apps, indent=2))
         print(f"[DONE] Emitted {len(apps)} resolved app(s).", file=sys.stderr)
         return
 
+    if args.benchmark:
+        res = benchmark(sdk_dir, args.runs)
+        print(f"Target query on {res['host']} ({res['machine']}), SDK "
+              f"{res['sdk_commit'][:9] or '?'}, {res['runs']} run(s) per path:")
+        for mode in ("direct", "activate"):
+            r = res[mode]
+            print(f"  {mode:9} " + (f"min {r['min_s']:7.3f}s  median {r['median_s']:7.3f}s"
+                                    f"  ({r['ok']} ok)" if r["ok"] else "FAILED"))
+        if res["direct"]["ok"] and res["activate"]["ok"]:
+            print(f"  speedup   {res['activate']['median_s'] / res['direct']['median_s']:.1f}x"
+                  f" (median) · same target list: {res['same_targets']}")
+        if args.benchmark_out:
+            Path(args.benchmark_out).write_text(json.dumps(res, indent=2))
+        return
+
+    if args.write_manifest:
+        if not (args.config and args.apps_json and args.apps_dir):
+            print("[ERROR] --write-manifest requires --config, --apps-json and --apps-dir",
+                  file=sys.stderr)
+            sys.exit(1)
+        cfg = load_config(Path(args.config).expanduser().resolve())
+        rows = write_manifest(Path(args.write_manifest),
+                              json.loads(Path(args.apps_json).read_text()),
+                              Path(args.apps_dir), sdk_head(sdk_dir),
+                              cfg.get("discovery", {}) or {})
+        print(f"[DONE] Wrote {args.write_manifest}: {len(rows)} app(s), "
+              f"{sum(1 for r in rows if r['sha256'])} binary(ies) hashed.", file=sys.stderr)
+        return
+
     if args.emit_config_apps:
         generate_config_apps(sdk_dir)
         return
 
-    parser.error("choose a mode: --emit-apps-json (with --config) or --emit-config-apps")
+    parser.error("choose a mode: --emit-apps-json (with --config), --write-manifest, "
+                 "--emit-config-apps or --benchmark")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+fabric_snapshot.py
+==================
+Commissioned-fabric snapshots for run_tests.py (test_execution.fabric_snapshot).
+
+Most python_testing TCs commission a freshly reset DUT (PASE → attestation →
+NOC → CASE, 5-20s on an RPi) and then test a handful of attributes. For TCs
+that only NEED a commissioned DUT, the runner commissions a given DUT command
+ONCE (the TC's own script with --commission-only), snapshots the DUT KVS files
+(/tmp/chip_* + any --KVS path) and the controller admin_storage.json, and later
+compatible TCs restore that snapshot and run WITHOUT --commissioning-method —
+the framework then goes straight to CASE on the existing fabric.
+
+Eligibility comes from the test's SDK CI header: the SDK itself must commission
+it with a plain `--commissioning-method on-network` (no qr/manual code, no
+commissioning-only flows), and it must not belong to a cluster that exercises
+commissioning / fabric management itself (see DEFAULT_EXCLUDE). Any session
+error on a restored run makes run_tests.py fall back to fresh commissioning.
+"""
+
+import re
+import glob
+import shutil
+import hashlib
+from pathlib import Path
+
+# TCs that test commissioning, fabrics, certificates or discovery themselves —
+# a pre-commissioned DUT would change what they verify. Prefix match on the
+# normalized TC id (TC_XXX_…). Extend via test_execution.fabric_snapshot_exclude.
+DEFAULT_EXCLUDE = (
+    "TC_CADMIN", "TC_SC_", "TC_DA_", "TC_CGEN", "TC_OPCREDS", "TC_CNET",
+    "TC_DD_", "TC_ACE_", "TC_JF", "TC_MCORE", "TC_CCTRL", "TC_ICDM",
+    "TC_TCP", "TC_BRBINFO", "TC_ECOINFO",
+)
+
+# Python-controller flags that shape HOW the DUT gets commissioned (and so what
+# ends up in the KVS / admin_storage). Part of the snapshot key.
+_COMMISSION_FLAGS = (
+    "--commissioning-method", "--discriminator", "--passcode",
+    "--paa-trust-store-path", "--dut-node-id", "--controller-node-id",
+    "--admin-vendor-id", "--fabric-id", "--storage-path",
+    "--tc-version-to-simulate", "--tc-user-response-to-simulate",
+)
+
+# DUT flags that differ per TC without affecting the persisted fabric.
+_DUT_VOLATILE_FLAGS = ("--app-pipe",)
+
+
+def _flag_values(cmd: str, flags) -> list[str]:
+    out = []
+    for f in flags:
+        for m in re.finditer(rf"(?<!\S){re.escape(f)}(?:[=\s]+)(\S+)", cmd):
+            out.append(f"{f}={m.group(1)}")
+    return sorted(out)
+
+
+def strip_flags(cmd: str, flags) -> str:
+    """Remove `<flag> <value>` pairs (e.g. a per-TC --app-pipe) from a command."""
+    for f in flags:
+        cmd = re.sub(rf"\s{re.escape(f)}(?:[=\s]+)\S+", "", cmd)
+    return cmd
+
+
+def strip_kvs_reset(dut_cmd: str) -> str:
+    """Drop a leading `rm -rf <paths> &&` so the DUT boots on the restored KVS."""
+    return re.sub(r"^\s*rm\s+-rf\s+[^&]+&&\s*", "", dut_cmd)
+
+
+def strip_commissioning(py_cmd: str) -> str:
+    """Remove --commissioning-method so the framework skips commissioning."""
+    return re.sub(r"\s--commissioning-method(?:[=\s]+)\S+", "", py_cmd)
+
+
+class FabricSnapshotCache:
+    """
+    One snapshot per (DUT command, commissioning flags) key, stored under
+    root/<key>/ — outside /tmp/chip_* so the DUT's own `rm -rf /tmp/chip_*`
+    and the runner's storage cleanup never touch it. Cleared at the start of
+    every run (a snapshot is only valid for the binaries it was taken with).
+    """
+
+    def __init__(self, root: Path, exclude=(), max_failures: int = 2):
+        self.root = Path(root)
+        self.exclude = tuple(DEFAULT_EXCLUDE) + tuple(exclude or ())
+        self.max_failures = max_failures
+        self._failures: dict[str, int] = {}   # key -> restored-run session errors
+        self._broken: set[str] = set()        # keys whose capture failed
+        shutil.rmtree(self.root, ignore_errors=True)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    # ── eligibility ─────────────────────────────────────────────────────────
+    def eligible(self, tc_id: str, ci_header: str, py_cmd: str) -> tuple[bool, str]:
+        norm = "TC_" + re.sub(r"^TC[-_]", "", tc_id).replace("-", "_").replace(".", "_")
+        if any(norm.startswith(p) for p in self.exclude):
+            return False, "cluster exercises commissioning/fabrics itself"
+        if not ci_header:
+            return False, "no SDK CI header"
+        if not re.search(r"--commissioning-method\s+on-network\b", ci_header):
+            return False, "CI header does not commission on-network"
+        if re.search(r"--(qr-code|manual-code|commission-only)\b", ci_header):
+            return False, "CI header uses a special commissioning flow"
+        if not re.search(r"--commissioning-method\s+on-network\b", py_cmd):
+            return False, "python command does not commission on-network"
+        if re.search(r"--(qr-code|manual-code)\b", py_cmd):
+            return False, "python command commissions via qr/manual code"
+        return True, ""
+
+    # ── keys ────────────────────────────────────────────────────────────────
+    def key(self, dut_cmd: str, py_cmd: str) -> str:
+        dut = strip_flags(strip_kvs_reset(dut_cmd), _DUT_VOLATILE_FLAGS)
+        blob = "\n".join([" ".join(dut.split())] + _flag_values(py_cmd, _COMMISSION_FLAGS))
+        return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+    def has(self, key: str) -> bool:
+        return (self.root / key / "files.txt").exists()
+
+    def usable(self, key: str) -> bool:
+        return key not in self._broken and self._failures.get(key, 0) < self.max_failures
+
+    # ── capture / restore ───────────────────────────────────────────────────
+    @staticmethod
+    def kvs_paths(dut_cmd: str) -> list[str]:
+        """DUT persistent files: /tmp/chip_* regular files + an explicit --KVS path."""
+        paths = [p for p in glob.glob("/tmp/chip_*") if Path(p).is_file()]
+        m = re.search(r"--KVS(?:[=\s]+)(\S+)", dut_cmd)
+        if m:
+            kvs = m.group(1).strip("'\"")
+            if Path(kvs).is_file() and kvs not in paths:
+                paths.append(kvs)
+        return sorted(paths)
+
+    def capture(self, key: str, dut_cmd: str, admin_storage: Path) -> tuple[bool, str]:
+        """Copy the commissioned DUT KVS + controller storage into the snapshot."""
+        if not admin_storage.exists():
+            self._broken.add(key)
+            return False, f"controller storage {admin_storage} missing after commissioning"
+        files = self.kvs_paths(dut_cmd)
+        if not files:
+            self._broken.add(key)
+            return False, "no DUT KVS files found after commissioning"
+        dest = self.root / key
+        shutil.rmtree(dest, ignore_errors=True)
+        (dest / "kvs").mkdir(parents=True)
+        manifest = []
+        for i, src in enumerate(files):
+            shutil.copy2(src, dest / "kvs" / str(i))
+            manifest.append(src)
+        shutil.copy2(admin_storage, dest / "admin_storage.json")
+        (dest / "files.txt").write_text("\n".join(manifest) + "\n")
+        return True, ""
+
+    def restore(self, key: str, admin_storage: Path) -> bool:
+        dest = self.root / key
+        try:
+            manifest = (dest / "files.txt").read_text().splitlines()
+            for i, target in enumerate(p for p in manifest if p):
+                Path(target).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(dest / "kvs" / str(i), target)
+            shutil.copy2(dest / "admin_storage.json", admin_storage)
+            return True
+        except OSError:
+            self.invalidate(key)
+            return False
+
+    def mark_broken(self, key: str):
+        self._broken.add(key)
+
+    def invalidate(self, key: str):
+        """A restored run hit a session error — drop the snapshot (re-taken next time)."""
+        self._failures[key] = self._failures.get(key, 0) + 1
+        shutil.rmtree(self.root / key, ignore_errors=True)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+footprint_tracker.py
+====================
+Per-app binary size + memory footprint across nightlies.
+
+Inputs (either or both, keyed by the deployed binary name):
+  - binary_sizes.json — written by build_inside_container.sh collect_output:
+        {"commit": "...", "apps": {"chip-lighting-app": {"file_bytes": …,
+         "text": …, "data": …, "bss": …, "stripped_bytes": …}, …}}
+  - app_memory.json   — written by run_tests.py on the RPi:
+        {"commit": "...", "apps": {"chip-lighting-app": {"peak_rss_kb": …, "tcs": N}}}
+
+Each build/run is appended to a persistent history (one JSON line per commit
+and source, OUTSIDE the workspace) and compared against the median of the
+previous N commits. Growth beyond BOTH a percentage and an absolute floor is
+flagged — the build email (Mac mini) and the test report (RPi) render the
+flagged entries from the footprint_report.json this writes.
+
+Usage:
+    python3 scripts/footprint_tracker.py --sizes ~/matter-output/binary_sizes.json \\
+        --out ~/matter-output/footprint_report.json [--markdown] [--no-record]
+    python3 scripts/footprint_tracker.py --sizes logs/binary_sizes.json \\
+        --rss logs/app_memory.json --source rpi --out logs/footprint_report.json
+"""
+
+import sys
+import json
+import argparse
+import statistics
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_HISTORY_FILE = "~/matter-ci-results/footprint_history.jsonl"
+
+SIZE_METRICS = ("file_bytes", "stripped_bytes", "text", "data", "bss")
+RSS_METRICS = ("peak_rss_kb",)
+
+DEFAULTS = {
+    "history_file":          DEFAULT_HISTORY_FILE,
+    "baseline_builds":       5,
+    "size_regression_pct":   2.0,
+    "size_regression_min_kb": 16,
+    "rss_regression_pct":    10.0,
+    "rss_regression_min_kb": 1024,
+}
+
+
+def settings(cfg: dict | None) -> dict:
+    """footprint: section of build_config.yaml over the defaults."""
+    out = dict(DEFAULTS)
+    out.update((cfg or {}).get("footprint") or {})
+    return out
+
+
+def load_history(path: Path, source: str) -> list[dict]:
+    out = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                if rec.get("source") == source:
+                    out.append(rec)
+    except OSError:
+        pass
+    return out
+
+
+def append_history(path: Path, source: str, commit: str, apps: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps({"ts": datetime.now().isoformat(timespec="seconds"),
+                            "source": source, "commit": commit, "apps": apps}) + "\n")
+
+
+def _threshold(metric: str, st: dict) -> tuple[float, float]:
+    """(pct, absolute floor in the metric's own unit)."""
+    if metric in RSS_METRICS:
+        return float(st["rss_regression_pct"]), float(st["rss_regression_min_kb"])
+    return float(st["size_regression_pct"]), float(st["size_regression_min_kb"]) * 1024
+
+
+def compare(apps: dict, history: list[dict], commit: str, st: dict) -> dict:
+    """
+    Diff every app metric against the median of the previous `baseline_builds`
+    commits (latest record per commit; the current commit excluded, so a re-run
+    of the same build never becomes its own baseline).
+    """
+    prev: dict[str, dict] = {}
+    for rec in reversed(history):
+        c = rec.get("commit", "")
+        if c == commit or c in prev:
+            continue
+        prev[c] = rec.get("apps") or {}
+        if len(prev) >= int(st["baseline_builds"]):
+            break
+    report = {"commit": commit, "baseline_commits": list(prev), "apps": {}, "flagged": []}
+    for app, metrics in sorted(apps.items()):
+        rows = {}
+        for metric, value in metrics.items():
+            if metric not in SIZE_METRICS + RSS_METRICS or not isinstance(value, (int, float)):
+                continue
+            base_vals = [p[app][metric] for p in prev.values()
+                         if isinstance(p.get(app, {}).get(metric), (int, float))]
+            row = {"value": value}
+            if base_vals:
+                base = statistics.median(base_vals)
+                delta = value - base
+                pct = (delta / base * 100) if base else 0.0
+                lim_pct, lim_abs = _threshold(metric, st)
+                row.update(baseline=base, delta=delta, pct=round(pct, 1),
+                           flag=delta >= lim_abs and pct > lim_pct)
+                if row["flag"]:
+                    report["flagged"].append({"app": app, "metric": metric, **row})
+            rows[metric] = row
+        report["apps"][app] = rows
+    return report
+
+
+def human(metric: str, v: float) -> str:
+    if metric in RSS_METRICS:
+        return f"{v / 1024:.1f} MiB"
+    for unit in ("B", "KiB", "MiB"):
+        if abs(v) < 1024 or unit == "MiB":
+            return f"{v:.0f} {unit}" if unit == "B" else f"{v:.1f} {unit}"
+        v /= 1024
+    return str(v)
+
+
+def markdown(report: dict) -> str:
+    n = len(report["baseline_commits"])
+    if not report["flagged"]:
+        return (f"### Footprint — no growth beyond thresholds "
+                f"(vs median of {n} previous commit(s))\n")
+    lines = [f"### Footprint — {len(report['flagged'])} increase(s) vs median of "
+             f"{n} previous commit(s)\n",
+             "| App | Metric | Now | Baseline | Δ |", "|---|---|---|---|---|"]
+    for f in report["flagged"]:
+        lines.append(f"| `{f['app']}` | {f['metric']} | {human(f['metric'], f['value'])} | "
+                     f"{human(f['metric'], f['baseline'])} | "
+                     f"+{human(f['metric'], f['delta'])} (+{f['pct']}%) |")
+    return "\n".join(lines) + "\n"
+
+
+def track(st: dict, source: str, commit: str, apps: dict, record: bool = True) -> dict:
+    """Compare, then (optionally) append this commit to the history."""
+    hist_path = Path(st["history_file"]).expanduser()
+    report = compare(apps, load_history(hist_path, source), commit, st)
+    report["source"] = source
+    if record and apps:
+        try:
+            append_history(hist_path, source, commit, apps)
+        except OSError as e:
+            print(f"[WARN] footprint history not written: {e}", file=sys.stderr)
+    return report
+
+
+def merge_apps(*docs: dict | None) -> tuple[str, dict]:
+    """(commit, {app: metrics}) merged from binary_sizes / app_memory docs."""
+    commit, apps = "", {}
+    for d in docs:
+        if not d:
+            continue
+        commit = commit or d.get("commit", "")
+        for app, m in (d.get("apps") or {}).items():
+            apps.setdefault(app, {}).update(m)
+    return commit, apps
+
+
+def load_json(path) -> dict | None:
+    if not path:
+        return None
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        print(f"[WARN] {path} missing or unreadable — skipped", file=sys.stderr)
+        return None
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--config", default=str(Path(__file__).parent.parent / "config" /
+                                            "build_config.yaml"))
+    ap.add_argument("--sizes", help="binary_sizes.json")
+    ap.add_argument("--rss", help="app_memory.json")
+    ap.add_argument("--source", default="build", help="history stream (build | rpi)")
+    ap.add_argument("--commit", default="")
+    ap.add_argument("--out", help="write footprint_report.json here")
+    ap.add_argument("--markdown", action="store_true", help="print a markdown table")
+    ap.add_argument("--no-record", action="store_true",
+                    help="compare only — don't append to the history")
+    args = ap.parse_args()
+
+    cfg = None
+    try:
+        import yaml
+        cfg = yaml.safe_load(open(args.config))
+    except Exception:
+        pass
+    commit, apps = merge_apps(load_json(args.sizes), load_json(args.rss))
+    commit = args.commit or commit
+    if not apps:
+        print("[WARN] no footprint data — nothing to track", file=sys.stderr)
+        return
+    report = track(settings(cfg), args.source, commit, apps, record=not args.no_record)
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+    if args.markdown:
+        print(markdown(report))
+    else:
+        print(f"[FOOTPRINT] {len(apps)} app(s), {len(report['flagged'])} flagged "
+              f"(baseline: {len(report['baseline_commits'])} commit(s))")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+incremental_build.py
+====================
+Reuse last night's app binary when none of its inputs changed
+(build.incremental, used by build_orchestrator.py).
+
+The container is --rm and clean_builds wipes out/, so every night rebuilt all
+~35 apps — even when the SDK only moved in docs or another platform. After an
+app builds, its entry in the store (build.incremental_dir, on the persistent
+/matter-ci-results mount) keeps:
+
+    <store>/<app>/binary       copy of the built executable
+    <store>/<app>/inputs.txt   every repo-relative file the build read
+    <store>/<app>/meta.json    SDK commit, toolchain id, gn args, build dir,
+                               build seconds, files uncommitted at build time
+
+The inputs are what ninja knows after the build: `ninja -t inputs <target>`
+(sources + everything in the graph above the executable), `ninja -t deps`
+(the headers each compile actually included, from .ninja_deps — in a unified
+out dir those of the whole group, a safe superset) and build.ninja.d (every
+BUILD.gn / .gni gn read). Paths are resolved through the example's
+third_party/connectedhomeip symlink back to the SDK checkout; files outside it
+(compiler, sysroot, pigweed env, out/ gen) are dropped, so these are SDK
+source inputs only. The toolchain is covered separately: the entry records
+artifact_cache.toolchain_id() (builder image digest + gn / clang versions),
+and ALWAYS_REBUILD below covers the SDK's own toolchain setup.
+
+The next night, `git diff --name-only <entry commit>..HEAD` is intersected
+with that set (a changed submodule gitlink matches every input below it).
+A dirty work tree (skip-clone debugging) adds its uncommitted files
+(artifact_cache.uncommitted_files: `git diff --name-only HEAD` + untracked),
+and so do those the entry was built with — either side may differ from the
+commit, so "same commit" alone never reuses.
+The binary is reused only if the toolchain id and gn args are identical,
+nothing relevant changed and nothing under ALWAYS_REBUILD changed; any doubt
+(no entry, commit not in the checkout, unreadable store) means a normal build.
+
+Usage (preview which apps would be reused):
+    python3 scripts/incremental_build.py --sdk-dir /connectedhomeip \\
+        --apps-json /output/build_logs/discovered_apps.json \\
+        --store /matter-ci-results/incremental
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import subprocess
+from pathlib import Path
+
+from artifact_cache import toolchain_id, uncommitted_files
+from priority_order import git_changed_files
+
+DEFAULT_STORE = "/matter-ci-results/incremental"
+
+# Changes here can alter every binary without showing up as a build input:
+# the pigweed/toolchain environment (bootstrap) and the build wrapper script.
+ALWAYS_REBUILD = ("scripts/setup/", "scripts/examples/gn_build_example.sh")
+
+
+def sdk_head(sdk_dir: Path) -> str | None:
+    r = subprocess.run(["git", "rev-parse", "HEAD"], cwd=str(sdk_dir),
+                       capture_output=True, text=True)
+    return r.stdout.strip() or None
+
+
+def _ninja_lines(out_dir: Path, *args: str) -> list[str]:
+    try:
+        r = subprocess.run(["ninja", "-C", str(out_dir), "-t", *args],
+                           capture_output=True, text=True)
+    except OSError:
+        return []
+    return r.stdout.splitlines() if r.returncode == 0 else []
+
+
+def ninja_inputs(out_dir: Path, target: str, sdk_dir: Path) -> set[str]:
+    """Repo-relative files the build of `target` in `out_dir` read."""
+    raw = [ln.strip() for ln in _ninja_lines(out_dir, "inputs", target)]
+    # -t deps: "<obj>: #deps N, deps mtime …" then the deps indented.
+    raw += [ln.strip() for ln in _ninja_lines(out_dir, "deps") if ln.startswith("    ")]
+    try:
+        text = (out_dir / "build.ninja.d").read_text().replace("\\\n", " ")
+        raw += text.split(":", 1)[1].split()
+    except (OSError, IndexError):
+        pass
+    sdk = str(sdk_dir.resolve())
+    out, seen = set(), set()
+    for p in raw:
+        if not p or p in seen:
+            continue
+        seen.add(p)
+        real = os.path.realpath(os.path.join(out_dir, p))
+        if real.startswith(sdk + os.sep):
+            rel = real[len(sdk) + 1:]
+            if not rel.startswith(("out/", ".environment/")):
+                out.add(rel)
+    return out
+
+
+def _entry(store: Path, name: str) -> Path:
+    return Path(store) / name
+
+
+def save(store, app: dict, out_dir: Path, target: str, sdk_dir: Path,
+         commit: str, toolchain: str, secs: int, dirty: list[str] = ()) -> bool:
+    """Record a fresh build of `app` (binary at out_dir/target); `dirty` are the
+    files the work tree had uncommitted when it was built."""
+    inputs = ninja_inputs(out_dir, target, sdk_dir)
+    if not inputs:
+        return False                              # nothing to compare against
+    d = _entry(store, app["name"])
+    tmp = d.with_name(d.name + ".tmp")
+    try:
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        shutil.copy2(out_dir / target, tmp / "binary")
+        (tmp / "inputs.txt").write_text("\n".join(sorted(inputs)) + "\n")
+        (tmp / "meta.json").write_text(json.dumps({
+            "commit": commit, "toolchain": toolchain, "gn_args": app.get("extra_gn_args", ""),
+            "source_dir": app["source_dir"], "build_dir": app["build_dir"],
+            "binary": target, "seconds": secs, "dirty": sorted(dirty),
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S")}, indent=2))
+        shutil.rmtree(d, ignore_errors=True)
+        os.replace(tmp, d)
+        return True
+    except OSError as e:
+        print(f"[ WARN] incremental entry for {app['name']} not saved: {e}", file=sys.stderr)
+        shutil.rmtree(tmp, ignore_errors=True)
+        return False
+
+
+def check(store, app: dict, sdk_dir: Path, commit: str, toolchain: str,
+          dirty: list[str] | None = ()) -> tuple[dict | None, str]:
+    """(entry meta, reason) — meta is None unless the stored binary can be reused.
+    `dirty` is uncommitted_files() of the work tree (None: unknown)."""
+    d = _entry(store, app["name"])
+    try:
+        meta = json.loads((d / "meta.json").read_text())
+        inputs = set((d / "inputs.txt").read_text().split())
+    except (OSError, ValueError):
+        return None, "no previous build"
+    if not (d / "binary").is_file():
+        return None, "no stored binary"
+    if not toolchain or meta.get("toolchain") != toolchain:
+        return None, "toolchain / builder image changed"
+    if meta.get("gn_args") != app.get("extra_gn_args", "") or \
+            meta.get("source_dir") != app["source_dir"]:
+        return None, "gn args / source changed"
+    if dirty is None:
+        return None, "can't read the work tree's uncommitted changes"
+    changed = set(dirty) | set(meta.get("dirty", ()))
+    if meta.get("commit") == commit and not changed:
+        return meta, "same commit"
+    if meta.get("commit") != commit:
+        diff = git_changed_files(sdk_dir, meta.get("commit", ""), commit)
+        if diff is None:
+            return None, f"can't diff against {meta.get('commit', '?')[:9]}"
+        changed |= diff
+    hit = sorted(c for c in changed if c.startswith(ALWAYS_REBUILD))
+    if not hit:
+        dirs = {str(p) for f in inputs for p in Path(f).parents}
+        hit = sorted(c for c in changed if c in inputs or c in dirs)
+    if hit:
+        more = f" (+{len(hit) - 3} more)" if len(hit) > 3 else ""
+        return None, f"inputs changed: {', '.join(hit[:3])}{more}"
+    return meta, f"{len(changed)} changed file(s), none of its {len(inputs)} inputs"
+
+
+def restore(store, app: dict, dest: Path) -> bool:
+    """Copy the stored binary to `dest` (the app's out/<target>/<binary>)."""
+    try:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(_entry(store, app["name"]) / "binary", dest)
+        return True
+    except OSError as e:
+        print(f"[ WARN] {app['name']}: stored binary not restored: {e}", file=sys.stderr)
+        return False
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sdk-dir", required=True)
+    ap.add_argument("--apps-json", required=True, help="discover_targets.py --emit-apps-json output")
+    ap.add_argument("--store", default=DEFAULT_STORE)
+    ap.add_argument("--extra-gn-args", default="", help="as passed to build_orchestrator.py")
+    args = ap.parse_args()
+    sdk_dir = Path(args.sdk_dir).resolve()
+    head = sdk_head(sdk_dir)
+    toolchain = toolchain_id()
+    dirty = uncommitted_files(sdk_dir)
+    for app in json.loads(Path(args.apps_json).read_text()):
+        app["extra_gn_args"] = f"{app.get('extra_gn_args', '')} {args.extra_gn_args}".strip()
+        meta, why = check(args.store, app, sdk_dir, head, toolchain, dirty)
+        print(f"  {'reuse' if meta else 'build':5}  {app['name']:28} {why}")
+
+
+if __name__ == "__main__":
+    main()
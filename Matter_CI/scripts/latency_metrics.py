@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+latency_metrics.py
+==================
+Matter protocol latency metrics per TC, extracted by run_tests.py from the
+timestamps already in the Ctrl/DUT logs (CHIP log lines carry
+`[<epoch>.<usec>][pid:tid] CHIP:<module>: …`, usually wrapped in ANSI colour
+codes that are stripped first; ISO timestamps are accepted too):
+
+    dut_boot_to_advertise_s  first DUT log line → first commissionable advertisement
+    pase_s                   DUT: PBKDF param request received → PASE session active
+    case_s                   DUT: Sigma1 received → CASE session active
+    commissioning_s          DUT: PBKDF param request → CommissioningComplete
+    im_read_rtt_s            controller: first ReadRequest TX → ReportData RX
+    im_write_rtt_s           controller: first WriteRequest TX → WriteResponse RX
+    im_subscribe_rtt_s       controller: first SubscribeRequest TX → SubscribeResponse RX
+
+Each log is streamed line by line and the scan stops as soon as every metric it
+can provide is found. A metric whose markers aren't in the log (no DUT, no
+commissioning, IM logging off) is simply absent.
+
+The values are stored in the run history (run_history.py) with the SDK commit;
+regression() compares a TC's metrics to the median of its previous N commits.
+
+Usage (extract from a TC's logs):
+    python3 scripts/latency_metrics.py logs/test_runs/TC-X.log [logs/test_runs/TC-X_dut.log]
+"""
+
+import re
+import json
+import argparse
+import statistics
+from datetime import datetime
+from pathlib import Path
+
+METRICS = ("dut_boot_to_advertise_s", "pase_s", "case_s", "commissioning_s",
+           "im_read_rtt_s", "im_write_rtt_s", "im_subscribe_rtt_s")
+
+_ANSI     = re.compile(r"\x1b\[[0-9;]*m")   # log_scan.ANSI_RE, for str lines
+_TS_EPOCH = re.compile(r"^\[(\d{9,10}\.\d+)\]")
+_TS_ISO   = re.compile(r"(\d{4}-\d{2}-\d{2})[ T](\d{2}:\d{2}:\d{2})(?:[.,](\d{1,6}))?")
+
+# DUT-side markers (the DUT is the PASE/CASE responder).
+_ADVERTISE  = re.compile(r"Advertise commission parameter|mDNS service published")
+_PASE_START = re.compile(r"Received PBKDF param request")
+_PASE_DONE  = re.compile(r"Activated - Type:1\b")
+_CASE_START = re.compile(r"Received Sigma1")
+_CASE_DONE  = re.compile(r"Activated - Type:2\b")
+_COMM_DONE  = re.compile(r"Received CommissioningComplete|Commissioning completed successfully")
+
+# Controller-side IM exchanges: `<<< [E:123i …] … Msg TX … Type 0001:02 (IM:ReadRequest)`
+# and the matching `>>> [E:123i …] … Msg RX … Type 0001:05`.
+_IM_MSG = re.compile(r"(<<<|>>>) \[E:(\d+)i[^\]]*\].*?Msg [TR]X.*?Type 0001:([0-9a-fA-F]{2})")
+_IM_REQ = {"02": "im_read_rtt_s", "03": "im_subscribe_rtt_s", "06": "im_write_rtt_s"}
+_IM_RSP = {"im_read_rtt_s": "05", "im_subscribe_rtt_s": "04", "im_write_rtt_s": "07"}
+
+
+def line_ts(line: str) -> float | None:
+    """Epoch seconds of a log line, or None if it carries no timestamp."""
+    m = _TS_EPOCH.match(line)
+    if m:
+        return float(m.group(1))
+    m = _TS_ISO.search(line)
+    if m:
+        frac = (m.group(3) or "0").ljust(6, "0")
+        try:
+            return datetime.strptime(f"{m.group(1)} {m.group(2)}.{frac}",
+                                     "%Y-%m-%d %H:%M:%S.%f").timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def _lines(path):
+    """The log's lines with ANSI colour codes removed (the DUT colours its lines
+    as `\x1b[0;32m[<epoch>…]…\x1b[0m`, which would hide the timestamp)."""
+    try:
+        with open(path, errors="replace") as f:
+            for line in f:
+                yield _ANSI.sub("", line) if "\x1b" in line else line
+    except OSError:
+        return
+
+
+def dut_metrics(dut_log) -> dict[str, float]:
+    out, t0, pase0, case0 = {}, None, None, None
+    for line in _lines(dut_log):
+        ts = line_ts(line)
+        if ts is None:
+            continue
+        if t0 is None:
+            t0 = ts
+        if "dut_boot_to_advertise_s" not in out and _ADVERTISE.search(line):
+            out["dut_boot_to_advertise_s"] = ts - t0
+        if pase0 is None and _PASE_START.search(line):
+            pase0 = ts
+        elif pase0 is not None and "pase_s" not in out and _PASE_DONE.search(line):
+            out["pase_s"] = ts - pase0
+        if pase0 is not None and "commissioning_s" not in out and _COMM_DONE.search(line):
+            out["commissioning_s"] = ts - pase0
+        if case0 is None and _CASE_START.search(line):
+            case0 = ts
+        elif case0 is not None and "case_s" not in out and _CASE_DONE.search(line):
+            out["case_s"] = ts - case0
+        if len(out) == 4:
+            break
+    return out
+
+
+def controller_metrics(ctrl_log) -> dict[str, float]:
+    out, pending = {}, {}            # metric -> (exchange id, TX time)
+    for line in _lines(ctrl_log):
+        if "Msg " not in line:
+            continue
+        m = _IM_MSG.search(line)
+        if not m:
+            continue
+        ts = line_ts(line)
+        if ts is None:
+            continue
+        direction, exch, mtype = m.group(1), m.group(2), m.group(3)
+        if direction == "<<<":
+            metric = _IM_REQ.get(mtype)
+            if metric and metric not in out and metric not in pending:
+                pending[metric] = (exch, ts)
+        else:
+            for metric, (ex, t_tx) in list(pending.items()):
+                if ex == exch and mtype == _IM_RSP[metric]:
+                    out[metric] = ts - t_tx
+                    del pending[metric]
+        if len(out) == len(_IM_REQ):
+            break
+    return out
+
+
+def extract(ctrl_log, dut_log=None) -> dict[str, float]:
+    """All metrics found in a TC's logs, in seconds (3 decimals)."""
+    found = controller_metrics(ctrl_log) if ctrl_log else {}
+    if dut_log:
+        found.update(dut_metrics(dut_log))
+    return {k: round(found[k], 3) for k in METRICS if k in found and found[k] >= 0}
+
+
+def baseline(records: list[dict], commits: int, exclude_commit: str = "") -> dict[str, float]:
+    """
+    Median per metric over the newest `commits` distinct SDK commits in a TC's
+    history (latest record per commit; the current commit excluded).
+    """
+    per_commit: dict[str, dict] = {}
+    for rec in reversed(records):
+        lat, commit = rec.get("latency"), rec.get("commit") or rec.get("run", "")
+        if not lat or commit == exclude_commit or commit in per_commit:
+            continue
+        per_commit[commit] = lat
+        if len(per_commit) >= commits:
+            break
+    out = {}
+    for k in METRICS:
+        vals = [lat[k] for lat in per_commit.values() if isinstance(lat.get(k), (int, float))]
+        if vals:
+            out[k] = statistics.median(vals)
+    return out
+
+
+def regression(current: dict, base: dict, pct: float, min_delta_s: float) -> dict:
+    """{metric: {value, baseline, pct}} for metrics slower than baseline by more
+    than pct % AND min_delta_s seconds (the absolute floor keeps sub-100ms
+    jitter from flagging)."""
+    out = {}
+    for k, v in current.items():
+        b = base.get(k)
+        if not b or v - b < min_delta_s:
+            continue
+        rise = (v - b) / b * 100
+        if rise > pct:
+            out[k] = {"value": v, "baseline": round(b, 3), "pct": round(rise)}
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("ctrl_log")
+    ap.add_argument("dut_log", nargs="?")
+    args = ap.parse_args()
+    print(json.dumps(extract(Path(args.ctrl_log), args.dut_log and Path(args.dut_log)),
+                     indent=2))
+
+
+if __name__ == "__main__":
+    main()
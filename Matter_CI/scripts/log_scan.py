@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+log_scan.py
+===========
+Memory-mapped log access for run_tests.py's DUT-log checks (crash detection,
+pairing-code pickup, missing shared libraries).
+
+DUT logs of a long TC run to 100 MB+ and the RPi has 4 GB shared with the DUT,
+the controller and the runtime tmpfs. read_text() + an ANSI-stripping re.sub
+made two full str copies of such a log per check — per poll, in the pairing
+code loop. Here the log is mmap'd (pages come from the page cache, nothing is
+copied) and precompiled *bytes* regexes run on the mapping directly; only the
+matched snippet is decoded and ANSI-stripped.
+
+Patterns must be bytes patterns. DUT log lines are wrapped in ANSI colour codes
+(e.g. "…]\\x1b[0m"), so a capture group should exclude \\x1b where an escape
+can follow the payload; ANSI codes inside a match are stripped on decode.
+
+Usage (search a log):
+    python3 scripts/log_scan.py logs/test_runs/TC-X_dut.log 'SetupQRCode:\\s*\\[?(MT:[^\\]\\s\\x1b]+)'
+"""
+
+import re
+import mmap
+import argparse
+from contextlib import contextmanager
+from pathlib import Path
+
+ANSI_RE = re.compile(rb"\x1b\[[0-9;]*m")
+
+
+@contextmanager
+def mapped(path):
+    """Read-only mmap of `path` (b"" when it is missing or empty — mmap can't
+    map zero bytes). The mapping is a snapshot of the size at open time, so a
+    log still being written is safe to scan."""
+    try:
+        f = open(path, "rb")
+    except OSError:
+        yield b""
+        return
+    with f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):      # empty file / not mappable
+            yield b""
+            return
+        try:
+            yield mm
+        finally:
+            mm.close()
+
+
+def decode(raw: bytes) -> str:
+    """ANSI-stripped str of a matched snippet."""
+    return ANSI_RE.sub(b"", raw).decode(errors="replace")
+
+
+def search(path, pattern: re.Pattern, group: int = 0) -> str | None:
+    """First match of `pattern` in the log (the given group, decoded), or None."""
+    return search_many(path, {"m": (pattern, group)}).get("m")
+
+
+def search_many(path, patterns: dict) -> dict[str, str]:
+    """
+    Several patterns over one mapping: {name: pattern | (pattern, group)} →
+    {name: decoded match} for the names that matched.
+    """
+    out = {}
+    with mapped(path) as buf:
+        if not buf:
+            return out
+        for name, spec in patterns.items():
+            pat, grp = spec if isinstance(spec, tuple) else (spec, 0)
+            m = pat.search(buf)
+            if m:
+                out[name] = decode(m.group(grp))
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("log")
+    ap.add_argument("pattern", help="regex (matched as bytes)")
+    ap.add_argument("--group", type=int, default=0)
+    args = ap.parse_args()
+    hit = search(Path(args.log), re.compile(args.pattern.encode()), args.group)
+    print(hit if hit is not None else "(no match)")
+
+
+if __name__ == "__main__":
+    main()
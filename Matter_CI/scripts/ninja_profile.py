@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+ninja_profile.py
+================
+Per-target build profile from ninja's .ninja_log (collect_output step 7f).
+
+build_report.json only had wall time + status per target, which can't tell
+whether a slow night was one huge translation unit, the final link, or cores
+sitting idle. For each out dir this reads the last build recorded in its
+.ninja_log (start/end ms per step; a new run restarts the clock, so the last
+segment whose end times keep rising is tonight's build) and reports:
+
+    top           the N slowest steps (output, kind: compile / link / archive /
+                  other, seconds)
+    step_s        summed step durations — the CPU time the build asked for
+    wall_s        first step start → last step end
+    parallelism   step_s / wall_s (≈ cores kept busy on average)
+    critical_path the longest dependency chain by step time, from the edges
+                  in build.ninja + its subninja files: nothing finishes faster
+                  than critical_path_s, however many cores are added
+
+and writes a Chrome trace-event file per target (open in chrome://tracing or
+ui.perfetto.dev): one complete event per step, packed into lanes the way the
+steps actually overlapped.
+
+Usage (what collect_output runs; one name=out_dir per target):
+    python3 scripts/ninja_profile.py --out /output/build_profile.json \\
+        --trace-dir /output/build_profiles --top 10 \\
+        all-clusters=out/all-clusters chip-tool=out/chip-tool
+"""
+
+import os
+import re
+import sys
+import json
+import heapq
+import argparse
+from pathlib import Path
+
+_ESCAPES = (("$$", "\x02"), ("$ ", "\x00"), ("$:", "\x01"))
+
+
+def read_log(out_dir: Path) -> list[dict]:
+    """Steps of the last build in out_dir/.ninja_log: [{start, end, output(s)}]
+    (ms). Multi-output edges (same command hash) are one step."""
+    try:
+        lines = (Path(out_dir) / ".ninja_log").read_text(errors="replace").splitlines()
+    except OSError:
+        return []
+    run, last_end = [], -1
+    for ln in lines:
+        if ln.startswith("#"):
+            continue
+        f = ln.split("\t")
+        if len(f) < 4 or not (f[0].isdigit() and f[1].isdigit()):
+            continue
+        start, end = int(f[0]), int(f[1])
+        if end < last_end:                     # clock restarted → a newer run
+            run = []
+        last_end = end
+        run.append((start, end, f[3], f[4] if len(f) > 4 else f[3]))
+    steps: dict[tuple, dict] = {}
+    for start, end, output, chash in run:
+        s = steps.setdefault((chash, start, end), {"start": start, "end": end, "outputs": []})
+        s["outputs"].append(output)
+    return sorted(steps.values(), key=lambda s: (s["start"], s["end"]))
+
+
+def kind(output: str) -> str:
+    if output.endswith((".o", ".obj")):
+        return "compile"
+    if output.endswith(".a"):
+        return "archive"
+    name = output.rsplit("/", 1)[-1]
+    if output.endswith(".so") or ("." not in name and "/" not in output.lstrip("./")):
+        return "link"                          # root-level executables
+    return "other"
+
+
+def _tokens(text: str) -> list[str]:
+    for esc, ch in _ESCAPES:
+        text = text.replace(esc, ch)
+    return text.split()
+
+
+def _restore(tok: str) -> str:
+    """Unescaped, canonical (ninja logs "./chip-tool" as "chip-tool") path."""
+    return os.path.normpath(tok.replace("\x00", " ").replace("\x01", ":").replace("\x02", "$"))
+
+
+def build_edges(out_dir: Path) -> dict[str, list[str]]:
+    """{output: inputs (explicit, implicit, order-only)} for every build edge
+    in build.ninja and the files it includes / subninjas."""
+    edges: dict[str, list[str]] = {}
+    todo, seen = ["build.ninja"], set()
+    while todo:
+        rel = todo.pop()
+        if rel in seen:
+            continue
+        seen.add(rel)
+        try:
+            text = (Path(out_dir) / rel).read_text(errors="replace")
+        except OSError:
+            continue
+        for ln in re.sub(r"\$\n\s*", "", text).splitlines():
+            if ln.startswith(("subninja ", "include ")):
+                todo.append(_restore(ln.split(None, 1)[1].strip()))
+            elif ln.startswith("build "):
+                toks = _tokens(ln[6:])
+                outs = []
+                while toks and not toks[0].endswith(":"):
+                    outs.append(toks.pop(0))
+                if not toks:
+                    continue
+                last = toks.pop(0)[:-1]
+                if last:
+                    outs.append(last)
+                ins = [_restore(t) for t in toks[1:] if t not in ("|", "||", "|@")]
+                for o in outs:
+                    if o != "|":
+                        edges[_restore(o)] = ins
+    return edges
+
+
+def critical_path(steps: list[dict], edges: dict[str, list[str]]) -> tuple[float, list[dict]]:
+    """(seconds, chain first→last) of the longest chain of steps that ran."""
+    step_of = {o: s for s in steps for o in s["outputs"]}
+    best: dict[int, tuple[float, dict | None]] = {}     # id(step) → (cost, prev)
+
+    def cost(root: dict) -> float:
+        stack = [(root, False)]
+        while stack:
+            s, expanded = stack.pop()
+            if id(s) in best:
+                continue
+            deps = {id(d): d for o in s["outputs"] for i in edges.get(o, ())
+                    for d in (step_of.get(i),) if d is not None and d is not s}
+            if not expanded:
+                stack.append((s, True))
+                stack.extend((d, False) for k, d in deps.items() if k not in best)
+                continue
+            prev = max(deps.values(), key=lambda d: best.get(id(d), (0.0,))[0], default=None)
+            base = best[id(prev)][0] if prev is not None and id(prev) in best else 0.0
+            best[id(s)] = (base + (s["end"] - s["start"]) / 1000, prev)
+        return best[id(root)][0]
+
+    if not steps or not edges:
+        return 0.0, []
+    end = max(steps, key=cost)
+    chain, s = [], end
+    while s is not None:
+        chain.append({"output": s["outputs"][0], "kind": kind(s["outputs"][0]),
+                      "s": round((s["end"] - s["start"]) / 1000, 2)})
+        s = best[id(s)][1]
+    return round(best[id(end)][0], 1), chain[::-1]
+
+
+def trace_events(name: str, steps: list[dict]) -> list[dict]:
+    """Chrome trace complete events, steps packed into non-overlapping lanes."""
+    events, lanes = [], []                     # heap of (end, lane)
+    for s in steps:
+        if lanes and lanes[0][0] <= s["start"]:
+            _, lane = heapq.heappop(lanes)
+        else:
+            lane = len(lanes)
+        heapq.heappush(lanes, (s["end"], lane))
+        events.append({"name": s["outputs"][0], "cat": kind(s["outputs"][0]), "ph": "X",
+                       "ts": s["start"] * 1000, "dur": (s["end"] - s["start"]) * 1000,
+                       "pid": name, "tid": lane})
+    return events
+
+
+def profile(name: str, out_dir: Path, top: int = 10) -> tuple[dict | None, list[dict]]:
+    """(profile dict, trace events) — (None, []) without a .ninja_log."""
+    steps = read_log(out_dir)
+    if not steps:
+        return None, []
+    step_s = sum(s["end"] - s["start"] for s in steps) / 1000
+    wall_s = (max(s["end"] for s in steps) - min(s["start"] for s in steps)) / 1000
+    cp_s, chain = critical_path(steps, build_edges(out_dir))
+    slowest = sorted(steps, key=lambda s: s["start"] - s["end"])[:top]
+    return {
+        "out_dir": str(out_dir), "steps": len(steps),
+        "step_s": round(step_s, 1), "wall_s": round(wall_s, 1),
+        "parallelism": round(step_s / wall_s, 2) if wall_s else 0.0,
+        "critical_path_s": cp_s, "critical_path_steps": len(chain),
+        "critical_path": chain[-20:],
+        "top": [{"output": s["outputs"][0], "kind": kind(s["outputs"][0]),
+                 "s": round((s["end"] - s["start"]) / 1000, 2)} for s in slowest],
+    }, trace_events(name, steps)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("targets", nargs="+", metavar="name=out_dir")
+    ap.add_argument("--out", required=True, help="JSON {name: profile}")
+    ap.add_argument("--trace-dir", help="write <name>.trace.json here")
+    ap.add_argument("--top", type=int, default=10)
+    args = ap.parse_args()
+
+    profiles = {}
+    for spec in args.targets:
+        name, _, out_dir = spec.partition("=")
+        prof, events = profile(name, Path(out_dir), args.top)
+        if prof is None:
+            continue
+        profiles[name] = prof
+        if args.trace_dir:
+            Path(args.trace_dir).mkdir(parents=True, exist_ok=True)
+            (Path(args.trace_dir) / f"{name}.trace.json").write_text(
+                json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+        print(f"[PROFILE] {name:28} {prof['steps']:>6} steps  wall {prof['wall_s']:>7}s  "
+              f"steps {prof['step_s']:>8}s  x{prof['parallelism']:<5}  "
+              f"critical path {prof['critical_path_s']}s", file=sys.stderr)
+    Path(args.out).write_text(json.dumps(profiles, indent=2))
+
+
+if __name__ == "__main__":
+    main()
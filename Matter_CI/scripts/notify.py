@@ -32,6 +32,10 @@ from email.mime.multipart import MIMEMultipart
 SCRIPT_DIR   = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 
+sys.path.insert(0, str(SCRIPT_DIR))
+from results_stream import iter_results
+from footprint_tracker import human as footprint_human
+
 
 # =============================================================================
 # Config
@@ -77,13 +81,33 @@ def load_build_status() -> dict:
                 continue
     return {}
 
+def load_footprint_report() -> dict:
+    """footprint_report.json written by footprint_tracker.py after the build."""
+    try:
+        return json.loads((get_output_dir() / "footprint_report.json").read_text())
+    except (OSError, ValueError):
+        return {}
+
+def load_ccache_stats() -> dict:
+    """This night's ccache counters (the container's ccache_stats.json)."""
+    try:
+        stats = json.loads((get_output_dir() / "ccache_stats.json").read_text())
+    except (OSError, ValueError):
+        return {}
+    return stats if isinstance(stats, dict) else {}
+
+def ccache_line(c: dict) -> str:
+    return (f"{c['hit_rate_pct']}% hits ({c['hits']} hits / {c['misses']} misses), "
+            f"cache {c['cache_size_bytes'] / 2**30:.1f} GiB of {c.get('max_size') or '?'}")
+
 
 # =============================================================================
 # HTML Email template
 # =============================================================================
 def build_html(status: str, cfg: dict, commit: str, branch: str,
                drive_link: str, run_url: str, run_id: str,
-               failed_apps: list, passed_apps: list) -> str:
+               failed_apps: list, passed_apps: list,
+               footprint: dict | None = None, ccache: dict | None = None) -> str:
 
     date_str    = datetime.now().strftime("%Y-%m-%d %H:%M IST")
     safe_branch = branch.replace("/", "-")
@@ -137,6 +161,36 @@ def build_html(status: str, cfg: dict, commit: str, branch: str,
             '</div></div>'
         )
 
+    # Footprint section — apps whose size grew past the thresholds vs the
+    # median of the previous nightlies (footprint_tracker.py).
+    footprint_section = ""
+    if footprint and footprint.get("flagged"):
+        items = "".join(
+            f'<div class="app-row">&#128200; {f["app"]} &middot; {f["metric"]}: '
+            f'{footprint_human(f["metric"], f["value"])} '
+            f'(+{footprint_human(f["metric"], f["delta"])}, +{f["pct"]}%)</div>'
+            for f in footprint["flagged"])
+        footprint_section = (
+            '<div class="app-section">' +
+            '<div class="app-title" style="color:#92400E">Binary footprint growth '
+            f'(vs median of {len(footprint.get("baseline_commits", []))} previous '
+            'build(s))</div>' +
+            '<div style="border-radius:8px;overflow:hidden;border:1px solid #FDE68A">' +
+            items +
+            '</div></div>'
+        )
+
+    # Compiler cache section — this night's ccache hit rate (build.ccache).
+    ccache_section = ""
+    if ccache:
+        ccache_section = (
+            '<div class="app-section">' +
+            '<div class="app-title" style="color:#374151">Compiler cache</div>' +
+            '<div style="border-radius:8px;overflow:hidden;border:1px solid #E5E7EB">' +
+            f'<div class="app-row">&#9889; {ccache_line(ccache)}</div>' +
+            '</div></div>'
+        )
+
     # Download section (only for success/partial)
     download_section = ""
     if drive_link and status in ("success", "partial"):
@@ -417,6 +471,8 @@ def build_html(status: str, cfg: dict, commit: str, branch: str,
 
     {failed_section}
     {passed_section}
+    {footprint_section}
+    {ccache_section}
     {download_section}
     {actions_section}
 
@@ -445,7 +501,8 @@ def build_html(status: str, cfg: dict, commit: str, branch: str,
 
 def build_plain_text(status: str, commit: str, branch: str,
                      drive_link: str, run_url: str, run_id: str,
-                     failed_apps: list, passed_apps: list) -> str:
+                     failed_apps: list, passed_apps: list,
+                     footprint: dict | None = None, ccache: dict | None = None) -> str:
     """Plain text fallback for email clients that don't support HTML."""
     file_id = drive_link.split("/d/")[1].split("/")[0] if "/d/" in drive_link else ""
     date_str = datetime.now().strftime("%Y-%m-%d %H:%M IST")
@@ -472,6 +529,14 @@ def build_plain_text(status: str, commit: str, branch: str,
         lines += ["Failed Apps:", *[f"  ❌ {a}" for a in failed_apps], ""]
     if passed_apps:
         lines += ["Built Apps:", *[f"  ✅ {a}" for a in passed_apps], ""]
+    if footprint and footprint.get("flagged"):
+        lines += ["Binary Footprint Growth:",
+                  *[f"  📈 {f['app']} {f['metric']}: "
+                    f"{footprint_human(f['metric'], f['value'])} "
+                    f"(+{footprint_human(f['metric'], f['delta'])}, +{f['pct']}%)"
+                    for f in footprint["flagged"]], ""]
+    if ccache:
+        lines += ["Compiler Cache:", f"  ⚡ {ccache_line(ccache)}", ""]
 
     if drive_link and status in ("success", "partial"):
         lines += [
@@ -510,32 +575,42 @@ def build_plain_text(status: str, commit: str, branch: str,
 # Test-execution email (separate from the build email)
 # =============================================================================
 def compute_test_summary(results_path: Path) -> dict:
-    """Read test_results.json → totals, per-status counts, and pass %."""
+    """Read test_results.json[l] → totals, per-status counts, and pass %.
+
+    Streams the results (iter_results prefers the .jsonl sibling) so only the
+    tallies and the failing TCs are kept in memory.
+    """
+    tally: dict = {}
+    failing_all = []
     try:
-        results = json.loads(results_path.read_text())
+        for r in iter_results(results_path):
+            tally[r.get("status")] = tally.get(r.get("status"), 0) + 1
+            if r.get("status") in ("FAIL", "ERROR"):
+                failing_all.append(r)
     except Exception:
-        results = []
+        pass
     def n(*statuses):
-        return sum(1 for r in results if r.get("status") in statuses)
-    total = len(results)
+        return sum(tally.get(st, 0) for st in statuses)
+    total = sum(tally.values())
     passed    = n("PASS")
     pass_warn = n("PASS*")
     failed    = n("FAIL")
     errored   = n("ERROR")
     rerun     = n("RERUN")
     cancelled = n("CANCEL")
-    accepted  = passed + pass_warn           # PASS* is an accepted (partial) pass
+    cached    = n("CACHED")                  # previous PASS reused (result cache)
+    accepted  = passed + pass_warn + cached  # PASS* is an accepted (partial) pass
     pct = round(accepted / total * 100) if total else 0
     # Failing TCs (name + short note), failures first — for the email body.
     ORDER = {"FAIL": 0, "ERROR": 1, "RERUN": 2, "PASS*": 3, "CANCEL": 4, "PASS": 5}
     failing = sorted(
-        [r for r in results if r.get("status") in ("FAIL", "ERROR")],
+        failing_all,
         key=lambda r: (ORDER.get(r.get("status"), 9), r.get("test_case_id", "")),
     )
     return {
         "total": total, "passed": passed, "pass_warn": pass_warn,
         "failed": failed, "errored": errored, "rerun": rerun,
-        "cancelled": cancelled, "accepted": accepted, "pct": pct,
+        "cancelled": cancelled, "cached": cached, "accepted": accepted, "pct": pct,
         "failing": failing,
     }
 
@@ -575,6 +650,7 @@ def build_test_html(cfg: dict, commit: str, branch: str, drive_link: str,
         + stat("#b42318", s["failed"], "Fail")
         + stat("#b42318", s["errored"], "Error")
         + stat("#6E7681", s["rerun"] + s["cancelled"], "Rerun/Cxl")
+        + (stat("#0E7490", s["cached"], "Cached") if s["cached"] else "")
     )
 
     # Failing-TC rows (cap at 25 to keep the email compact).
@@ -722,7 +798,7 @@ def build_test_plain(commit: str, branch: str, drive_link: str,
         "",
         f"Total {s['total']} | Pass {s['passed']} | Pass* {s['pass_warn']} | "
         f"Fail {s['failed']} | Error {s['errored']} | Rerun {s['rerun']} | "
-        f"Cancelled {s['cancelled']}",
+        f"Cancelled {s['cancelled']}" + (f" | Cached {s['cached']}" if s["cached"] else ""),
         "",
     ]
     if s["failing"]:
@@ -827,6 +903,8 @@ def main():
 
     # ── Build email (default) ─────────────────────────────────────────────
     build_status   = load_build_status()
+    footprint      = load_footprint_report()
+    ccache         = load_ccache_stats()
 
     failed_apps = [k for k, v in build_status.items() if v == "FAIL"]
     passed_apps = [k for k, v in build_status.items() if v != "FAIL"]
@@ -843,12 +921,12 @@ def main():
     html_body  = build_html(
         args.status, cfg, commit, branch,
         args.drive_link, args.run_url, args.run_id,
-        failed_apps, passed_apps
+        failed_apps, passed_apps, footprint, ccache
     )
     plain_body = build_plain_text(
         args.status, commit, branch,
         args.drive_link, args.run_url, args.run_id,
-        failed_apps, passed_apps
+        failed_apps, passed_apps, footprint, ccache
     )
 
     send_email(cfg, subject, html_body, plain_body)
@@ -11,7 +11,8 @@ Steps:
   1. Download the newest bundle (matter-sdk-*.tar.gz) from the single Google
      Drive folder (google_drive.folder_id) using the service account — same
      creds/folder as upload_artifacts.py.
-  2. Extract it.
+  2. Extract it; build-info.json, binary_sizes.json and apps_manifest.json
+     (the build's resolved app table — no SDK discovery on the RPi) → logs/.
   3. git fetch + checkout the RPi SDK to the EXACT commit the binaries were
      built from (from the bundle's build-info.json) — so the python_testing
      test scripts match the built SDK.
@@ -41,7 +42,8 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 
 # Resolve app source_dir/build_dir/binary_name from the SDK (same as the build).
 sys.path.insert(0, str(SCRIPT_DIR))
-from discover_targets import resolve_pipeline_apps
+from discover_targets import (resolve_pipeline_apps, verify_manifest_binaries,
+                              DEFAULT_MANIFEST)
 
 try:
     from google.oauth2 import service_account
@@ -161,6 +163,31 @@ def download_and_extract(cfg: dict, workdir: Path) -> Path:
         dst_info.parent.mkdir(parents=True, exist_ok=True)
         shutil.copy2(src_info, dst_info)
         log(f"Build info → {dst_info}")
+    src_sizes = bundle_dir / "binary_sizes.json"
+    if src_sizes.exists():
+        dst_sizes = PROJECT_ROOT / "logs" / "binary_sizes.json"
+        dst_sizes.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(src_sizes, dst_sizes)
+        log(f"Binary sizes → {dst_sizes}")
+    # The build's resolved app table — resolve_pipeline_apps() (here, run_tests.py,
+    # fetch_test_commands.py) reads it from logs/ instead of querying the SDK. A
+    # stale one from an older bundle must not outlive it.
+    dst_manifest = DEFAULT_MANIFEST
+    dst_manifest.parent.mkdir(parents=True, exist_ok=True)
+    src_manifest = bundle_dir / dst_manifest.name
+    bad = verify_manifest_binaries(src_manifest, bundle_dir / "apps") \
+        if src_manifest.exists() else []
+    if bad:
+        dst_manifest.unlink(missing_ok=True)
+        log(f"⚠️  apps_manifest.json sha256 mismatch for {len(bad)} binary(ies) "
+            f"({', '.join(bad[:3])}{' …' if len(bad) > 3 else ''}) — not this "
+            f"bundle's manifest; app table via live SDK discovery.")
+    elif src_manifest.exists():
+        shutil.copy2(src_manifest, dst_manifest)
+        log(f"Apps manifest → {dst_manifest} (binary sha256s verified)")
+    else:
+        dst_manifest.unlink(missing_ok=True)
+        log("⚠️  No apps_manifest.json in bundle — app table via live SDK discovery.")
 
     return bundle_dir
 
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+priority_order.py
+=================
+Fail-fast TC ordering for run_tests.py --priority (test_execution.priority_order).
+
+The Sheet's row order is replaced by three tiers (row order kept within each):
+
+    0 failed      the TC's last recorded run was FAIL or ERROR (run history)
+    1 changed     since the SDK commit of the TC's last run, `git diff` in the SDK
+                  checkout touches its TC script, a src/python_testing module the
+                  script imports, or the example tree of its DUT app
+                  (examples/<app>/ — e.g. examples/all-clusters-app/)
+    2 rest        everything else
+
+Core SDK changes (src/, third_party/) rebuild every app, so they don't promote a
+TC on their own — otherwise most nights everything would be "changed". A TC
+with no history (new in the Sheet) counts as changed.
+
+Once tiers 0+1 have run, run_tests.py writes the report and uploads a partial
+results archive, so the answer to "are last night's failures fixed?" arrives
+without waiting for the full run.
+
+Usage (preview the order):
+    python3 scripts/priority_order.py logs/test_commands.json
+"""
+
+import os
+import re
+import json
+import argparse
+import subprocess
+from pathlib import Path
+
+TIER_FAILED, TIER_CHANGED, TIER_REST = 0, 1, 2
+TIER_LABELS = ("failed last run", "script/app changed", "rest")
+FAILED_STATUSES = ("FAIL", "ERROR")
+
+_SCRIPT_RE = re.compile(r"\b(TC_\w+\.py)\b")
+_IMPORT_RE = re.compile(r"^\s*(?:from|import)\s+(\w+)", re.M)
+_BINARY_RE = re.compile(r"\./([^\s]+)")
+
+
+def git_changed_files(sdk_dir, since: str, until: str = "HEAD") -> set[str] | None:
+    """Repo-relative paths changed between two SDK commits (None if git can't
+    tell — commit not fetched in a shallow checkout, no repo)."""
+    try:
+        r = subprocess.run(["git", "diff", "--name-only", f"{since}..{until}"],
+                           cwd=str(sdk_dir), capture_output=True, text=True)
+    except OSError:
+        return None
+    if r.returncode != 0:
+        return None
+    return {ln.strip() for ln in r.stdout.splitlines() if ln.strip()}
+
+
+def tc_inputs(tc: dict, sdk_dir, apps: list[dict]) -> list[str]:
+    """Repo-relative paths (files, or dir prefixes ending in '/') whose change
+    promotes `tc`: its script, the sibling modules it imports, its DUT app's
+    example tree."""
+    sdk_dir = Path(sdk_dir)
+    out = []
+    m = _SCRIPT_RE.search(tc.get("python_command", ""))
+    if m:
+        out.append(f"src/python_testing/{m.group(1)}")
+        try:
+            src = (sdk_dir / "src" / "python_testing" / m.group(1)).read_text(errors="replace")
+        except OSError:
+            src = ""
+        for mod in sorted(set(_IMPORT_RE.findall(src))):
+            if (sdk_dir / "src" / "python_testing" / f"{mod}.py").is_file():
+                out.append(f"src/python_testing/{mod}.py")
+    b = _BINARY_RE.search(tc.get("dut_command", ""))
+    if b:
+        for app in apps:
+            if app.get("binary_name") == b.group(1) and app.get("source_dir"):
+                # examples/<app>/linux → examples/<app>/ (covers *-common too)
+                parts = Path(app["source_dir"]).parts
+                out.append("/".join(parts[:2]) + "/")
+                break
+    return out
+
+
+def prioritize(commands: list[dict], history, sdk_dir, apps: list[dict],
+               current_commit: str = "HEAD") -> tuple[list[dict], list[int]]:
+    """
+    Reorder `commands` into the tiers above. `history` is a RunHistory (its
+    last() record carries status + commit). Returns (ordered, tier per entry).
+    """
+    diffs: dict[str, set[str] | None] = {}
+
+    def changed(tc: dict, since: str) -> bool:
+        if since not in diffs:
+            diffs[since] = git_changed_files(sdk_dir, since, current_commit or "HEAD")
+        files = diffs[since]
+        if files is None:
+            return False
+        for p in tc_inputs(tc, sdk_dir, apps):
+            if p.endswith("/") and any(f.startswith(p) for f in files):
+                return True
+            if p in files:
+                return True
+        return False
+
+    tiers = []
+    for tc in commands:
+        last = history.last(tc["test_case_id"])
+        if last.get("status") in FAILED_STATUSES:
+            tiers.append(TIER_FAILED)
+        elif not last:
+            tiers.append(TIER_CHANGED)
+        elif last.get("commit") and last["commit"] != current_commit \
+                and changed(tc, last["commit"]):
+            tiers.append(TIER_CHANGED)
+        else:
+            tiers.append(TIER_REST)
+    order = sorted(range(len(commands)), key=lambda i: (tiers[i], i))
+    return [commands[i] for i in order], [tiers[i] for i in order]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("commands", help="test_commands.json")
+    ap.add_argument("--config", default=str(Path(__file__).parent.parent / "config" /
+                                            "build_config.yaml"))
+    args = ap.parse_args()
+
+    import yaml
+    from run_history import RunHistory, DEFAULT_HISTORY_FILE
+    from discover_targets import resolve_pipeline_apps
+    cfg = yaml.safe_load(open(args.config))
+    sdk_dir = Path(os.environ.get("MATTER_SDK_DIR", cfg["rpi"]["sdk_dir"]))
+    te = cfg.get("test_execution", {})
+    history = RunHistory(te.get("history_file", DEFAULT_HISTORY_FILE))
+    head = subprocess.run(["git", "rev-parse", "HEAD"], cwd=str(sdk_dir),
+                          capture_output=True, text=True).stdout.strip()
+    ordered, tiers = prioritize(json.load(open(args.commands)), history, sdk_dir,
+                                resolve_pipeline_apps(sdk_dir, cfg), head)
+    for tc, tier in zip(ordered, tiers):
+        print(f"  [{TIER_LABELS[tier]:>18}] {tc['test_case_id']}")
+
+
+if __name__ == "__main__":
+    main()
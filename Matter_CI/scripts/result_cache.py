@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+result_cache.py
+===============
+Content-addressed TC result cache for run_tests.py (test_execution.result_cache).
+
+A TC's verdict can only change when one of its inputs changes. The key is the
+sha256 of:
+    - every app binary the TC launches (the ./app DUT + absolute binary paths
+      the CI header resolves into the python command, e.g. jfc_server_app),
+    - the TC script + the sibling src/python_testing modules it imports,
+    - the controller environment — the RECORD of every distribution installed
+      in the venv (the matter wheels list a sha256 per file, so a rebuilt wheel
+      with an unchanged version still changes the hash),
+    - any other file the commands reference by absolute path (PICS file, …),
+    - the executed DUT + python commands (after the CI-header / PICS rewrites).
+
+Only PASS verdicts are stored. On a hit the runner reports the TC as CACHED
+with the stored verdict, reason and Ctrl/DUT logs (copied back into
+logs/test_runs/ so the report links still work) instead of running it.
+
+Hidden environmental changes (RPi firmware, network, kernel, mDNS) are not in
+the key, so every `full_run_every`-th run ignores the cache (re-runs and
+re-stores everything); --full-run on run_tests.py forces one.
+
+File hashes are memoised by (inode, mtime, size) in the index, so a 100 MB DUT
+binary is hashed once per build, not once per TC. The index keeps the newest
+`max_entries` entries by last use; evicted entries take their logs with them.
+
+Layout (OUTSIDE the workspace, like run_history):
+    <root>/index.json          {"meta": {...}, "entries": {key: {...}}, "files": {...}}
+    <root>/logs/<key>/         Ctrl/DUT logs of the stored PASS
+
+Usage (inspect the cache):
+    python3 scripts/result_cache.py [--root ~/matter-ci-results/result_cache] [TC-ID]
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_ROOT = "~/matter-ci-results/result_cache"
+
+
+def sha256_file(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def environment_hash(venv_python) -> str:
+    """sha256 over the dist-info name + RECORD of every distribution in the
+    venv of `venv_python` ("" when the venv has no site-packages)."""
+    venv = Path(venv_python).parent.parent
+    h = hashlib.sha256()
+    records = sorted(venv.glob("lib/python*/site-packages/*.dist-info/RECORD"))
+    for rec in records:
+        h.update(rec.parent.name.encode() + b"\0")
+        try:
+            h.update(rec.read_bytes())
+        except OSError:
+            continue
+    return h.hexdigest() if records else ""
+
+
+def cache_key(parts: dict) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, root, max_entries: int = 2000, full_run_every: int = 7,
+                 force_full: bool = False):
+        self.root = Path(root).expanduser()
+        self.index_path = self.root / "index.json"
+        self.max_entries = max(int(max_entries), 1)
+        self.run_id = os.environ.get("GITHUB_RUN_NUMBER", "")
+        self.hits = self.misses = self.stored = 0
+        idx = {}
+        try:
+            idx = json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            pass
+        self.meta: dict = idx.get("meta") or {}
+        self.entries: dict[str, dict] = idx.get("entries") or {}
+        self.files: dict[str, dict] = idx.get("files") or {}
+        runs = int(self.meta.get("runs_since_full", 0))
+        # A run with an empty cache is a full run by definition.
+        self.full_run = (force_full or not self.entries
+                         or (int(full_run_every) > 0 and runs + 1 >= int(full_run_every)))
+        self.why_full = ("forced (--full-run)" if force_full
+                         else "empty cache" if not self.entries
+                         else f"every {full_run_every} run(s)" if self.full_run else "")
+
+    # ── hashing ─────────────────────────────────────────────────────────────
+    def file_sha(self, path) -> str:
+        """sha256 of a file, memoised by (inode, mtime, size)."""
+        p = Path(path).resolve()
+        st = p.stat()
+        stamp = f"{st.st_ino}:{st.st_mtime_ns}:{st.st_size}"
+        memo = self.files.get(str(p))
+        if memo and memo.get("stamp") == stamp:
+            return memo["sha256"]
+        sha = sha256_file(p)
+        self.files[str(p)] = {"stamp": stamp, "sha256": sha}
+        return sha
+
+    # ── lookup / store ──────────────────────────────────────────────────────
+    def lookup(self, key: str) -> dict | None:
+        """The stored entry for `key`, or None (always None on a full run)."""
+        entry = None if self.full_run else self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        entry["used"] = datetime.now().isoformat(timespec="seconds")
+        self.hits += 1
+        return entry
+
+    def peek(self, key: str) -> bool:
+        """Would lookup() hit? (no counters, no LRU touch)."""
+        return not self.full_run and key in self.entries
+
+    def store(self, key: str, tc_id: str, result: dict, logs: list[Path], commit: str = ""):
+        dest = self.root / "logs" / key
+        shutil.rmtree(dest, ignore_errors=True)
+        dest.mkdir(parents=True, exist_ok=True)
+        names = []
+        for p in logs:
+            if p and Path(p).is_file():
+                shutil.copy2(p, dest / Path(p).name)
+                names.append(Path(p).name)
+        now = datetime.now().isoformat(timespec="seconds")
+        self.entries[key] = {
+            "tc": tc_id, "status": result["status"], "note": result.get("note", ""),
+            "counts": result.get("counts") or {}, "elapsed_s": result.get("elapsed_s", 0),
+            "log_file": Path(result.get("log_file", "")).name, "logs": names,
+            "run": self.run_id, "commit": commit, "ts": now, "used": now,
+        }
+        self.stored += 1
+
+    def restore_logs(self, key: str, dest: Path) -> dict[str, Path]:
+        """Copy a stored entry's logs into `dest`. Returns {name: path}."""
+        dest = Path(dest)
+        dest.mkdir(parents=True, exist_ok=True)
+        out = {}
+        for name in self.entries.get(key, {}).get("logs", []):
+            src = self.root / "logs" / key / name
+            if src.is_file():
+                shutil.copy2(src, dest / name)
+                out[name] = dest / name
+        return out
+
+    def invalidate(self, key: str):
+        self.entries.pop(key, None)
+        shutil.rmtree(self.root / "logs" / key, ignore_errors=True)
+
+    # ── persistence ─────────────────────────────────────────────────────────
+    def save(self):
+        """Evict least-recently-used entries past max_entries, advance the
+        full-run counter and write the index atomically."""
+        if len(self.entries) > self.max_entries:
+            lru = sorted(self.entries, key=lambda k: self.entries[k].get("used", ""))
+            for key in lru[:len(self.entries) - self.max_entries]:
+                self.invalidate(key)
+        # Drop memoised hashes of files that no longer exist (old bundles).
+        self.files = {p: v for p, v in self.files.items() if os.path.exists(p)}
+        if self.full_run:
+            self.meta["runs_since_full"] = 0
+            self.meta["last_full_run"] = self.run_id or datetime.now().isoformat(timespec="seconds")
+        else:
+            self.meta["runs_since_full"] = int(self.meta.get("runs_since_full", 0)) + 1
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"meta": self.meta, "entries": self.entries,
+                                   "files": self.files}))
+        os.replace(tmp, self.index_path)
+
+    def summary(self) -> str:
+        mode = f"full run ({self.why_full})" if self.full_run else "cached run"
+        return (f"{mode}: {self.hits} hit(s), {self.misses} miss(es), "
+                f"{self.stored} PASS stored · {len(self.entries)} entries")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("tc", nargs="?", help="only entries of this TC")
+    ap.add_argument("--root", default=DEFAULT_ROOT)
+    args = ap.parse_args()
+    cache = ResultCache(args.root)
+    print(f"{cache.index_path}: {len(cache.entries)} entries, meta {cache.meta}")
+    for key, e in sorted(cache.entries.items(), key=lambda kv: kv[1].get("tc", "")):
+        if args.tc and e.get("tc") != args.tc:
+            continue
+        print(f"  {e.get('tc', '?'):24} {e.get('status', '?'):6} run #{e.get('run') or '?'} "
+              f"{(e.get('commit') or '')[:9]:9} used {e.get('used', '?')}  {key[:12]}")
+
+
+if __name__ == "__main__":
+    main()
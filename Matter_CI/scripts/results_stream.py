@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+results_stream.py
+=================
+Streaming test results: run_tests.py appends one JSON object per finished TC to
+logs/test_results.jsonl (flushed immediately, so partial results are ALWAYS on
+disk — even after a crash or a cancelled job), and the legacy
+logs/test_results.json array is produced from it by a streaming converter at
+the end of the run. Consumers (report, email, regenerate_report) read results
+one at a time via iter_results(), so memory stays flat even for large merged
+multi-RPi runs.
+
+Usage (convert a JSONL stream to the legacy JSON array):
+    python3 scripts/results_stream.py logs/test_results.jsonl logs/test_results.json
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+
+
+class ResultsWriter:
+    """Append-only JSONL writer — one line per TC, flushed as it is written."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(self.path, "w")
+        self.count = 0
+
+    def write(self, result: dict):
+        self._f.write(json.dumps(result) + "\n")
+        self._f.flush()
+        self.count += 1
+
+    def close(self):
+        if not self._f.closed:
+            self._f.close()
+
+
+def iter_results(path) -> "iter[dict]":
+    """
+    Yield result dicts from a .jsonl stream or a legacy .json array. For a
+    .json path with a .jsonl sibling (a run folder written by run_tests.py),
+    the sibling is streamed instead of loading the whole array. A torn last
+    line (writer killed mid-write) is skipped.
+    """
+    path = Path(path)
+    if path.suffix == ".json" and path.with_suffix(".jsonl").exists():
+        path = path.with_suffix(".jsonl")
+    if path.suffix == ".jsonl":
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+        return
+    yield from json.loads(path.read_text())
+
+
+def jsonl_to_json(src: Path, dst: Path) -> int:
+    """
+    Stream a JSONL results file into the legacy indented JSON array, byte-for-
+    byte what json.dump(results, f, indent=2) used to write. Written to a temp
+    file and renamed, so readers never see a half-written array. Returns the
+    number of results.
+    """
+    dst = Path(dst)
+    tmp = dst.with_name(dst.name + ".tmp")
+    n = 0
+    with open(tmp, "w") as out:
+        out.write("[")
+        for r in iter_results(src):
+            body = json.dumps(r, indent=2).replace("\n", "\n  ")
+            out.write(("," if n else "") + "\n  " + body)
+            n += 1
+        out.write("\n]" if n else "]")
+    os.replace(tmp, dst)
+    return n
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("src", help="test_results.jsonl")
+    ap.add_argument("dst", help="test_results.json to write")
+    args = ap.parse_args()
+    if not Path(args.src).exists():
+        sys.exit(f"[ERROR] {args.src} not found")
+    n = jsonl_to_json(Path(args.src), Path(args.dst))
+    print(f"[OK] {args.dst} ({n} results)")
+
+
+if __name__ == "__main__":
+    main()
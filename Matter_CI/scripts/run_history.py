@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+run_history.py
+==============
+Persistent per-TC run history for run_tests.py — one JSON line per finished TC
+in test_execution.history_file (default ~/matter-ci-results/run_history.jsonl,
+OUTSIDE the workspace so actions/checkout doesn't wipe it between runs).
+
+Each record carries at least:
+    {"run": "<GITHUB_RUN_NUMBER>", "ts": "...", "tc": "TC-XXX-1.1",
+     "status": "PASS", "elapsed_s": 41.2, "python_s": 33.9}
+
+Only the newest `window` records per TC are kept in memory, and the file is
+compacted to that size once it grows past max_lines, so it stays small no matter
+how many nightly runs have gone by.
+
+Usage (inspect a TC's history):
+    python3 scripts/run_history.py TC-ACE-1.1 [--file PATH]
+"""
+
+import os
+import json
+import math
+import argparse
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_HISTORY_FILE = "~/matter-ci-results/run_history.jsonl"
+
+# Statuses whose duration reflects a COMPLETED test run (a timeout/crash/cancel
+# duration says nothing about how long the test normally takes).
+COMPLETED = ("PASS", "PASS*", "FAIL", "RERUN")
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0-100); 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class RunHistory:
+    def __init__(self, path, window: int = 20, max_lines: int = 20000):
+        self.path = Path(path).expanduser()
+        self.window = max(int(window), 1)
+        self.max_lines = max_lines
+        self.run_id = os.environ.get("GITHUB_RUN_NUMBER", "")
+        self.by_tc: dict[str, deque] = {}
+        self._lines = 0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    self._lines += 1
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue   # torn line from an interrupted run
+                    tc = rec.get("tc")
+                    if tc:
+                        self.by_tc.setdefault(tc, deque(maxlen=self.window)).append(rec)
+        except OSError:
+            pass
+
+    # ── queries ─────────────────────────────────────────────────────────────
+    def records(self, tc: str) -> list[dict]:
+        """Newest-last history records for a TC (at most `window`)."""
+        return list(self.by_tc.get(tc, ()))
+
+    def last(self, tc: str) -> dict:
+        recs = self.by_tc.get(tc)
+        return recs[-1] if recs else {}
+
+    def durations(self, tc: str, key: str = "python_s") -> list[float]:
+        """Durations of completed runs (falls back to elapsed_s per record)."""
+        out = []
+        for r in self.by_tc.get(tc, ()):
+            if r.get("status") not in COMPLETED:
+                continue
+            v = r.get(key, r.get("elapsed_s"))
+            if isinstance(v, (int, float)) and v > 0:
+                out.append(float(v))
+        return out
+
+    # ── writes ──────────────────────────────────────────────────────────────
+    def append(self, tc: str, record: dict):
+        """Persist one finished TC (record gets run/ts/tc filled in)."""
+        rec = {"run": self.run_id, "ts": datetime.now().isoformat(timespec="seconds"),
+               "tc": tc, **record}
+        self.by_tc.setdefault(tc, deque(maxlen=self.window)).append(rec)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(rec) + "\n")
+            self._lines += 1
+            if self._lines > self.max_lines:
+                self.compact()
+        except OSError:
+            pass
+
+    def compact(self):
+        """Rewrite the file with only the in-memory window per TC."""
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w") as f:
+            n = 0
+            for recs in self.by_tc.values():
+                for rec in recs:
+                    f.write(json.dumps(rec) + "\n")
+                    n += 1
+        os.replace(tmp, self.path)
+        self._lines = n
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("tc", help="Test case id, e.g. TC-ACE-1.1")
+    ap.add_argument("--file", default=DEFAULT_HISTORY_FILE)
+    args = ap.parse_args()
+    hist = RunHistory(args.file, window=1000)
+    recs = hist.records(args.tc)
+    for r in recs:
+        print(json.dumps(r))
+    d = hist.durations(args.tc)
+    if d:
+        print(f"\n{len(d)} completed run(s): p50 {percentile(d, 50)}s · "
+              f"p99 {percentile(d, 99)}s · max {max(d)}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -26,9 +26,12 @@ import shlex
 import shutil
 import subprocess
 import time
+import tempfile
 import threading
 import queue
 import argparse
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -39,6 +42,28 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 # instead of a hardcoded apps: block in build_config.yaml.
 sys.path.insert(0, str(SCRIPT_DIR))
 from discover_targets import resolve_pipeline_apps
+from controller_forkserver import ForkServerClient
+from fabric_snapshot import (FabricSnapshotCache, strip_commissioning,
+                             strip_kvs_reset, strip_flags)
+from results_stream import ResultsWriter, iter_results, jsonl_to_json
+from run_history import RunHistory, percentile, DEFAULT_HISTORY_FILE, COMPLETED
+from runtime_store import RuntimeStore, DEFAULT_ROOT as RUNTIME_ROOT
+from priority_order import prioritize, TIER_LABELS
+import budget_select
+from result_cache import ResultCache, environment_hash, cache_key, DEFAULT_ROOT as RESULT_CACHE_ROOT
+import latency_metrics
+import footprint_tracker
+import log_scan
+
+# DUT-log patterns — bytes, run on the mmap'd log by log_scan (no full-log
+# str copies on the 4 GB RPi). Payload groups stop at \x1b: the DUT wraps its
+# log lines in ANSI colour codes ("…]\x1b[0m").
+_SHLIB_ERR_RE   = re.compile(rb"error while loading shared libraries:[^\n]+")
+_QR_CODE_RE     = re.compile(rb"SetupQRCode:\s*\[?(MT:[^\]\s\x1b]+)")
+_MANUAL_CODE_RE = re.compile(rb"Manual pairing code:\s*\[?([0-9][0-9\- ]*[0-9])")
+_PIPE_CMD_RE    = re.compile(rb"Unhandled command '([^']+)'")
+_PIPE_ABORT_RE  = re.compile(rb"Named pipe command not supported|VerifyOrDie failure")
+_DUT_CRASH_RE   = re.compile(rb"core dumped|Aborted|Segmentation fault|terminate called")
 
 # =============================================================================
 # Global cancel flag — set by SIGTERM/SIGINT handler
@@ -93,6 +118,7 @@ FAIL      = "FAIL"
 RERUN     = "RERUN"
 ERROR     = "ERROR"
 CANCEL    = "CANCEL"
+CACHED    = "CACHED"   # previous PASS reused — binaries/script/venv/commands unchanged
 
 
 # =============================================================================
@@ -137,11 +163,193 @@ def count_steps(log_text: str) -> dict:
     }
 
 
+# Mobly writes <logs-path>/<testbed>/<start time>/test_summary.yaml: one YAML
+# document per test record (written as each test ends), then a Summary document
+# with the test-level counts once the run completes. The verdict comes from
+# there; the console log is only scraped when no complete summary exists.
+_MOBLY_SUMMARY_KEYS = ("Error", "Executed", "Failed", "Passed", "Requested", "Skipped")
+
+
+# Commissioning / pairing failure markers in the controller log, and the reason
+# both verdict paths give for them. run_tests keys its commissioning retries and
+# fabric-snapshot invalidation on this reason with status ERROR.
+_COMMISSIONING_FAIL_RE = re.compile(
+    r"CommissioningError|Failed to commission|"
+    r"Commissioning complete failed|"
+    r"CHIP_ERROR_CONNECTION_ABORTED|"
+    r"Failed to pair with device|"
+    r"Unable to find the device",
+    re.IGNORECASE)
+COMMISSIONING_FAIL_REASON = (
+    "Commissioning failed — DUT could not be paired. "
+    "Check discriminator, passcode, and that DUT is in commissioning mode."
+)
+
+
+def load_mobly_summary(logs_path, since: float = 0.0) -> dict | None:
+    """
+    {"records": [...], "counts": {...}} from the newest test_summary.yaml under
+    logs_path written at/after `since`, or None when there is none or it has no
+    Summary document (the controller died mid-run).
+    """
+    import yaml
+    root = Path(logs_path)
+    if not root.is_dir():
+        return None
+    candidates = []
+    for f in root.rglob("test_summary.yaml"):
+        try:
+            mtime = f.stat().st_mtime
+        except OSError:
+            continue
+        if mtime >= since:
+            candidates.append((mtime, f))
+    if not candidates:
+        return None
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    try:
+        with open(max(candidates)[1]) as fh:
+            docs = [d for d in yaml.load_all(fh, Loader=loader) if isinstance(d, dict)]
+    except (OSError, yaml.YAMLError):
+        return None
+    summary = next((d for d in docs if d.get("Type") == "Summary"), None)
+    if summary is None:
+        return None
+    return {
+        "records": [d for d in docs if d.get("Type") == "Record"],
+        "counts":  {k.lower(): int(summary.get(k) or 0) for k in _MOBLY_SUMMARY_KEYS},
+    }
+
+
+def parse_summary_result(summary: dict, log_text: str,
+                         pass_threshold: float = 0.75) -> tuple[str, dict, str]:
+    """
+    parse_result() for a run with a complete mobly test_summary.yaml. The
+    first FAIL/ERROR record decides the verdict and reason: mobly itself files
+    TestFailure/AssertionError as FAIL and any other exception as ERROR, and a
+    setup_class record is always ERROR. A commissioning failure (record of
+    test_run_commissioning, TestAbortAll, or the pairing-failure log markers)
+    is ERROR with COMMISSIONING_FAIL_REASON, like parse_result's Signal 2. Step
+    counts still come from the console step markers (the framework's step
+    hooks only log them).
+    """
+    steps = count_steps(log_text)
+    bad = next((r for r in summary["records"]
+                if r.get("Result") in ("FAIL", "ERROR")), None)
+    if bad:
+        test_name = re.sub(r"^test_", "", str(bad.get("Test Name") or "?"))
+        is_setup  = test_name in ("setup_class", "teardown_class")
+        phase     = test_name if is_setup else "test"
+        if is_setup:
+            test_name = str(bad.get("Test Class") or test_name)
+        sig     = str(bad.get("Termination Signal Type") or "")
+        # Commissioning failures are ERROR, not a DUT conformance FAIL: the
+        # framework aborts test_run_commissioning with signals.TestAbortAll,
+        # which mobly files as a FAIL record. The Signal 2 log markers count too
+        # (as in parse_result, an assertion failure in a test body — e.g. a
+        # TC-CGEN test that drives commissioning into failure on purpose — stays
+        # FAIL).
+        is_assertion = sig in ("TestFailure", "AssertionError") and not is_setup
+        if (test_name == "run_commissioning" or sig == "TestAbortAll"
+                or (not is_assertion and _COMMISSIONING_FAIL_RE.search(log_text))):
+            return ERROR, dict(steps), COMMISSIONING_FAIL_REASON
+        details = _clean_detail(str(bad.get("Details") or ""))
+        if details in ("", "None"):
+            details = ""
+        if bad.get("Result") == "ERROR" and sig and not details.startswith(sig):
+            details = f"{sig}: {details}" if details else sig
+        if details:
+            reason = f"{phase} failed in {test_name}: {details}"
+        else:
+            reason = (f"{phase} failed in {test_name} — "
+                      f"crashed before running any test steps")
+        status = FAIL if (bad.get("Result") == "FAIL" and not is_setup) else ERROR
+        step_counts = dict(steps)
+        if status == FAIL and step_counts["step_total"] > 0:
+            step_counts["step_failed"] = 1
+            step_counts["step_passed"] = max(
+                step_counts["step_total"] - step_counts["step_skipped"] - 1, 0)
+        return status, step_counts, reason
+    return _verdict_from_counts(dict(summary["counts"]), steps, pass_threshold)
+
+
+def _verdict_from_counts(counts: dict, steps: dict,
+                         pass_threshold: float) -> tuple[str, dict, str]:
+    """
+    Verdict from mobly's test-level counts (error/executed/failed/passed/
+    requested/skipped — from the summary line or test_summary.yaml) plus the
+    deduped step counts from count_steps().
+    """
+    if counts["failed"] > 0 or counts["error"] > 0:
+        # Find which step failed for better reason message
+        parts = []
+        if counts["failed"] > 0:
+            parts.append(f"{counts['failed']} step(s) failed")
+        if counts["error"] > 0:
+            parts.append(f"{counts['error']} error(s)")
+        reason = ", ".join(parts)
+        return FAIL, counts, reason
+
+    # Merge the real, deduped STEP-level counts (from the log) into the
+    # result — these drive both the Steps column and the pass tolerance.
+    counts.update(steps)
+    total_steps   = steps["step_total"]
+    skipped_steps = steps["step_skipped"]
+    passed_steps  = steps["step_passed"]
+
+    # ── Step-level skips ────────────────────────────────────────────────
+    # We do NOT assume skips are caused by missing PICS — a step can skip for
+    # a PICS/feature guard, an unmet precondition, or another reason.
+    if total_steps > 0 and skipped_steps > 0:
+        pass_ratio = passed_steps / total_steps
+        pct = round(pass_ratio * 100)
+        thr = round(pass_threshold * 100)
+
+        if passed_steps == 0:
+            # Nothing actually ran → not a meaningful pass.
+            return RERUN, counts, (
+                f"All {total_steps} step(s) skipped — may be PICS/feature-gated "
+                f"(if the test needs it, set pics_folder), an unsupported "
+                f"feature, or another issue. Check the Ctrl Log."
+            )
+        if pass_ratio >= pass_threshold:
+            # Enough steps passed → accept as a full PASS; the remaining
+            # skips are tolerated (often DUT-implementation / feature based).
+            return PASS, counts, (
+                f"{passed_steps}/{total_steps} steps passed, {skipped_steps} "
+                f"skipped ({pct}% ≥ {thr}% threshold — skips accepted)."
+            )
+        # Too many skips to be confident → flag as partial.
+        return PASS_WARN, counts, (
+            f"Partial execution: {passed_steps}/{total_steps} steps passed, "
+            f"{skipped_steps} skipped ({pct}% < {thr}% threshold). Skips may be "
+            f"PICS/feature-gated (set pics_folder) or an unmet precondition — "
+            f"check the Ctrl Log for each 'Skipping' reason."
+        )
+
+    # Fallback: no step markers found, but mobly reports test-level skips.
+    if total_steps == 0 and counts["skipped"] > 0 and counts["passed"] > 0:
+        return PASS_WARN, counts, (
+            f"Partial execution: {counts['passed']} test(s) passed, "
+            f"{counts['skipped']}/{counts['executed']} skipped — check the Ctrl Log."
+        )
+    if total_steps == 0 and counts["executed"] > 0 and counts["skipped"] == counts["executed"]:
+        return RERUN, counts, (
+            f"All {counts['skipped']}/{counts['executed']} test(s) skipped — "
+            "check the Ctrl Log for the reason."
+        )
+
+    # Clean pass — all steps executed and passed
+    return PASS, counts, ""
+
+
 def parse_result(log_text: str, exit_code: int = 0,
                  pass_threshold: float = 0.75) -> tuple[str, dict, str]:
     """
     Returns (status, counts_dict, reason_string).
     reason_string is empty for a clean PASS, populated for all other statuses.
+    Console-log fallback: the runner prefers parse_summary_result() on mobly's
+    test_summary.yaml and only scrapes the log when no complete summary exists.
     pass_threshold: fraction of steps that must pass for a run with some skipped
     steps to still count as a full PASS (default 0.75 = 75%).
     """
@@ -227,17 +435,8 @@ def parse_result(log_text: str, exit_code: int = 0,
         r"Test results:\s*Error\s+0,\s*Executed\s+[1-9]\d*,\s*"
         r"Failed\s+0,\s*Passed\s+[1-9]\d*",
         log_text, re.IGNORECASE)
-    if not passed_cleanly and re.search(
-            r"CommissioningError|Failed to commission|"
-            r"Commissioning complete failed|"
-            r"CHIP_ERROR_CONNECTION_ABORTED|"
-            r"Failed to pair with device|"
-            r"Unable to find the device",
-            log_text, re.IGNORECASE):
-        return ERROR, dict(steps), (
-            "Commissioning failed — DUT could not be paired. "
-            "Check discriminator, passcode, and that DUT is in commissioning mode."
-        )
+    if not passed_cleanly and _COMMISSIONING_FAIL_RE.search(log_text):
+        return ERROR, dict(steps), COMMISSIONING_FAIL_REASON
 
     # ── Signal 3 — Mobly summary line ─────────────────────────────────────────
     summary_pattern = (
@@ -260,67 +459,7 @@ def parse_result(log_text: str, exit_code: int = 0,
             "skipped":   int(match.group(6)),
         }
 
-        if counts["failed"] > 0 or counts["error"] > 0:
-            # Find which step failed for better reason message
-            parts = []
-            if counts["failed"] > 0:
-                parts.append(f"{counts['failed']} step(s) failed")
-            if counts["error"] > 0:
-                parts.append(f"{counts['error']} error(s)")
-            reason = ", ".join(parts)
-            return FAIL, counts, reason
-
-        # Merge the real, deduped STEP-level counts (from the log) into the
-        # result — these drive both the Steps column and the pass tolerance.
-        counts.update(steps)
-        total_steps   = steps["step_total"]
-        skipped_steps = steps["step_skipped"]
-        passed_steps  = steps["step_passed"]
-
-        # ── Step-level skips ────────────────────────────────────────────────
-        # We do NOT assume skips are caused by missing PICS — a step can skip for
-        # a PICS/feature guard, an unmet precondition, or another reason.
-        if total_steps > 0 and skipped_steps > 0:
-            pass_ratio = passed_steps / total_steps
-            pct = round(pass_ratio * 100)
-            thr = round(pass_threshold * 100)
-
-            if passed_steps == 0:
-                # Nothing actually ran → not a meaningful pass.
-                return RERUN, counts, (
-                    f"All {total_steps} step(s) skipped — may be PICS/feature-gated "
-                    f"(if the test needs it, set pics_folder), an unsupported "
-                    f"feature, or another issue. Check the Ctrl Log."
-                )
-            if pass_ratio >= pass_threshold:
-                # Enough steps passed → accept as a full PASS; the remaining
-                # skips are tolerated (often DUT-implementation / feature based).
-                return PASS, counts, (
-                    f"{passed_steps}/{total_steps} steps passed, {skipped_steps} "
-                    f"skipped ({pct}% ≥ {thr}% threshold — skips accepted)."
-                )
-            # Too many skips to be confident → flag as partial.
-            return PASS_WARN, counts, (
-                f"Partial execution: {passed_steps}/{total_steps} steps passed, "
-                f"{skipped_steps} skipped ({pct}% < {thr}% threshold). Skips may be "
-                f"PICS/feature-gated (set pics_folder) or an unmet precondition — "
-                f"check the Ctrl Log for each 'Skipping' reason."
-            )
-
-        # Fallback: no step markers found, but mobly reports test-level skips.
-        if total_steps == 0 and counts["skipped"] > 0 and counts["passed"] > 0:
-            return PASS_WARN, counts, (
-                f"Partial execution: {counts['passed']} test(s) passed, "
-                f"{counts['skipped']}/{counts['executed']} skipped — check the Ctrl Log."
-            )
-        if total_steps == 0 and counts["executed"] > 0 and counts["skipped"] == counts["executed"]:
-            return RERUN, counts, (
-                f"All {counts['skipped']}/{counts['executed']} test(s) skipped — "
-                "check the Ctrl Log for the reason."
-            )
-
-        # Clean pass — all steps executed and passed
-        return PASS, counts, ""
+        return _verdict_from_counts(counts, steps, pass_threshold)
 
     # ── Signal 4 — No summary + non-zero exit code ────────────────────────────
     if exit_code != 0:
@@ -424,21 +563,59 @@ def set_cmd_flag(cmd: str, flag: str, value: str) -> str:
 # =============================================================================
 # DUT manager
 # =============================================================================
+def group_peak_rss_kb(pgid: int) -> int:
+    """
+    Largest VmHWM (peak resident set, kB) among the live processes of a process
+    group — the DUT runs as `sh -c "rm -rf … && <app>"` under setsid, so the app
+    is a child of the group leader. 0 when /proc is unavailable.
+    """
+    peak = 0
+    try:
+        pids = [d for d in os.listdir("/proc") if d.isdigit()]
+    except OSError:
+        return 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                # pgrp is the 3rd field after the parenthesised comm (which may
+                # itself contain spaces/parens).
+                if int(f.read().rsplit(")", 1)[1].split()[2]) != pgid:
+                    continue
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        peak = max(peak, int(line.split()[1]))
+                        break
+        except (OSError, ValueError, IndexError):
+            continue
+    return peak
+
+
 class DUTManager:
-    def __init__(self, cfg: dict):
+    # Process groups of DUTs launched by a live DUTManager (the current TC's DUT
+    # and, with pipelining, the next TC's pre-launched one). The leftover-DUT
+    # sweep in launch() never kills these.
+    _owned_pgids: set = set()
+
+    def __init__(self, cfg: dict, apps: list = None):
         self.sdk_dir   = Path(os.environ.get("MATTER_SDK_DIR", cfg["rpi"]["sdk_dir"]))
         self.cfg       = cfg
         # Resolve the reference-app list once (dynamic discovery) — same list
         # the build produced. Used to map a DUT command to its binary.
-        self.apps      = resolve_pipeline_apps(self.sdk_dir, cfg)
+        # A spare manager for a pre-launched DUT reuses the resolved app table.
+        self.apps      = apps if apps is not None else resolve_pipeline_apps(self.sdk_dir, cfg)
         self._proc     = None
         self._log_file = None
         self._app_name = None
         self.last_straggler_count = 0   # leftover DUTs seen before the last launch
         self.last_full_cmd = ""         # the exact DUT shell command last launched
+        self._slot_disc = None          # discriminator override of a pipelined slot
+        self._slot_env  = None          # environment (own TMPDIR) of a pipelined slot
         self._fsa_thread = None         # Fabric-Sync: stdin-fifo forwarder thread
         self._fsa_stop   = None
         self._fsa_pipe   = None
+        self.binary_name = ""           # deployed binary of the running DUT
+        self.peak_rss_kb = 0            # VmHWM high-water mark (footprint tracking)
 
     def _find_binary(self, dut_cmd: str) -> tuple[Path | None, str]:
         """
@@ -486,12 +663,15 @@ class DUTManager:
         )
 
 
-    def launch(self, dut_cmd: str, log_path: Path, append: bool = False) -> tuple[bool, str]:
+    def launch(self, dut_cmd: str, log_path: Path, append: bool = False,
+               discriminator=None, env: dict = None) -> tuple[bool, str]:
         """
         Launch DUT app in background.
         Returns (True, "") on success, (False, error_reason) on failure.
         append=True keeps the existing DUT log (used for a mid-test factory-reset
         relaunch, so the pre- and post-reset logs are both preserved).
+        discriminator overrides test_execution.discriminator (pipelined slots);
+        env replaces the inherited environment (a slot's own TMPDIR).
         """
         global _ACTIVE_DUT
         _ACTIVE_DUT = self
@@ -511,25 +691,46 @@ class DUTManager:
         # NOTE: filter out the pgrep/sh pipeline itself — its own command line
         # contains the '<sdk>/out/' pattern and would otherwise self-match and
         # report a phantom "leftover".
+        # DUTs still owned by a live manager (a pipelined pre-launch) are skipped.
         ps = subprocess.run(
             f"pgrep -af '{self.sdk_dir}/out/' 2>/dev/null | grep -Ev 'pgrep|grep -' || true",
             shell=True, capture_output=True, text=True)
-        strays = [ln for ln in ps.stdout.splitlines() if ln.strip()]
+        strays = []
+        for ln in ps.stdout.splitlines():
+            if not ln.strip():
+                continue
+            try:
+                if os.getpgid(int(ln.split()[0])) in DUTManager._owned_pgids:
+                    continue
+            except (ValueError, ProcessLookupError, OSError):
+                continue   # already gone
+            strays.append(ln)
         self.last_straggler_count = len(strays)
         if strays:
             print(f"  [DUT] ⚠️  {len(strays)} leftover DUT process(es) still running "
                   f"before launch — killing (indicates a prior kill race):")
             for ln in strays[:5]:
                 print(f"          {ln[:110]}")
-            subprocess.run(f"pkill -f '{self.sdk_dir}/out/' 2>/dev/null || true",
-                           shell=True)
+            for ln in strays:
+                try:
+                    os.kill(int(ln.split()[0]), signal.SIGTERM)
+                except (ValueError, ProcessLookupError, OSError):
+                    pass
             time.sleep(self.cfg["test_execution"].get("dut_settle_wait", 2))
 
         # Advertise the DUT on our configured discriminator (not the default 3840).
         # EXCEPT controller apps (e.g. chip-camera-controller for WEBRTCR/WEBRTCP):
         # they aren't commissionable devices and must NOT be launched with a
         # --discriminator.
-        disc = self.cfg["test_execution"].get("discriminator", "")
+        # A mid-test reset relaunch (append=True) stays on the slot's discriminator
+        # and environment.
+        if discriminator is None and append:
+            discriminator = self._slot_disc
+        if env is None and append:
+            env = self._slot_env
+        self._slot_disc, self._slot_env = discriminator, env
+        disc = (discriminator if discriminator is not None
+                else self.cfg["test_execution"].get("discriminator", ""))
         if is_controller_app(dut_cmd):
             before = dut_cmd
             dut_cmd = ensure_camera_controller_server_args(dut_cmd)
@@ -565,7 +766,12 @@ class DUTManager:
             stderr=subprocess.STDOUT,
             preexec_fn=os.setsid,
             cwd=str(binary.parent),
+            env=env,
         )
+        DUTManager._owned_pgids.add(self._proc.pid)   # setsid → pgid == pid
+        if not append:   # a reset relaunch keeps the TC's high-water mark
+            self.binary_name = binary.name
+            self.peak_rss_kb = 0
 
         wait = self.cfg["test_execution"].get("dut_startup_wait", 5)
         print(f"  [DUT] Waiting {wait}s for startup...")
@@ -577,17 +783,13 @@ class DUTManager:
             # shared library on the RPi (e.g. camera app needs ffmpeg/gstreamer
             # runtime libs, which are separate from the build-time -dev packages).
             detail, hint = "", ""
-            try:
-                tail = log_path.read_text(errors="replace")
-                m = re.search(r"error while loading shared libraries:[^\n]+", tail)
-                if m:
-                    detail = f" — {m.group(0).strip()}"
-                    hint = (" The DUT is missing a RUNTIME shared library on the RPi. "
-                            "Install the app's runtime libs (camera: `sudo apt-get install "
-                            "-y ffmpeg gstreamer1.0-plugins-base gstreamer1.0-plugins-good "
-                            "gstreamer1.0-plugins-bad gstreamer1.0-libav libcurl4`).")
-            except OSError:
-                pass
+            shlib = log_scan.search(log_path, _SHLIB_ERR_RE)
+            if shlib:
+                detail = f" — {shlib.strip()}"
+                hint = (" The DUT is missing a RUNTIME shared library on the RPi. "
+                        "Install the app's runtime libs (camera: `sudo apt-get install "
+                        "-y ffmpeg gstreamer1.0-plugins-base gstreamer1.0-plugins-good "
+                        "gstreamer1.0-plugins-bad gstreamer1.0-libav libcurl4`).")
             if not detail and rc == 127:
                 detail = " — rc=127 (missing binary or shared library)"
             print(f"  [DUT] ❌ Process exited immediately (rc={rc}){detail}")
@@ -669,7 +871,21 @@ class DUTManager:
         print(f"  [DUT] ✅ Running (fabric-sync PID {self._proc.pid})")
         return True, ""
 
-    def stop(self):
+    def adopt(self, other: "DUTManager"):
+        """Take over a running DUT launched by another (spare) manager."""
+        global _ACTIVE_DUT
+        self.stop()
+        self._proc, self._log_file = other._proc, other._log_file
+        self.last_full_cmd = other.last_full_cmd
+        self.last_straggler_count = other.last_straggler_count
+        self._slot_disc, self._slot_env = other._slot_disc, other._slot_env
+        self.binary_name, self.peak_rss_kb = other.binary_name, other.peak_rss_kb
+        other._proc = other._log_file = None
+        _ACTIVE_DUT = self
+
+    def stop(self, settle: bool = True):
+        """Stop the DUT. settle=False skips the post-kill settle wait (the next
+        DUT is already up on a different discriminator/ports — pipelining)."""
         global _ACTIVE_DUT
         # Tear down the Fabric-Sync stdin forwarder + fifo first.
         if self._fsa_stop is not None:
@@ -685,6 +901,9 @@ class DUTManager:
         self._fsa_stop = None
         self._fsa_pipe = None
         if self._proc and self._proc.poll() is None:
+            # Sample the peak RSS while the group is still alive — the kernel
+            # drops /proc/<pid>/status with the process.
+            self.peak_rss_kb = max(self.peak_rss_kb, group_peak_rss_kb(self._proc.pid))
             try:
                 os.killpg(os.getpgid(self._proc.pid), signal.SIGTERM)
                 self._proc.wait(timeout=10)
@@ -697,7 +916,10 @@ class DUTManager:
             # Brief settle so the killed instance's mDNS records / UDP ports are
             # released before the next test relaunches on the SAME discriminator
             # (avoids the commissioner briefly targeting a stale advertisement).
-            time.sleep(self.cfg["test_execution"].get("dut_settle_wait", 2))
+            if settle:
+                time.sleep(self.cfg["test_execution"].get("dut_settle_wait", 2))
+        if self._proc is not None:
+            DUTManager._owned_pgids.discard(self._proc.pid)
         if self._log_file:
             self._log_file.close()
         self._proc = None
@@ -709,7 +931,9 @@ class DUTManager:
 # Test runner
 # =============================================================================
 class TestRunner:
-    def __init__(self, cfg: dict, commands: list[dict]):
+    def __init__(self, cfg: dict, commands: list[dict], full_run: bool = False,
+                 priority: bool = False, budget_s: float = 0.0,
+                 sa_key: bytes | None = None):
         self.cfg      = cfg
         self.commands = commands
         self.sdk_dir  = Path(os.environ.get("MATTER_SDK_DIR", cfg["rpi"]["sdk_dir"]))
@@ -724,7 +948,57 @@ class TestRunner:
             print(f"[ERROR] Run pipeline with build mode to install python controller first")
             sys.exit(1)
         self.log_dir.mkdir(parents=True, exist_ok=True)
-        self.results: list[dict] = []
+        # Results are streamed to logs/test_results.jsonl as each TC finishes
+        # (results_stream.py) — only per-status tallies stay in memory, and the
+        # partial results are on disk even if the run dies mid-way.
+        self.results_path = PROJECT_ROOT / "logs" / "test_results.jsonl"
+        self.status_counts: dict[str, int] = {}
+        # Per-TC run history (run_history.py) — persistent across runs, outside
+        # the workspace. Feeds the adaptive per-TC timeouts below.
+        te = cfg["test_execution"]
+        self.history = RunHistory(te.get("history_file", DEFAULT_HISTORY_FILE),
+                                  window=te.get("history_window", 20))
+        # Adaptive timeout: max(p99 × factor, floor) of the TC's completed-run
+        # durations, capped by timeout_seconds. TCs with too little history keep
+        # timeout_seconds. Stops a hung 15s test from burning the full global
+        # timeout.
+        self.adaptive_timeout = bool(te.get("adaptive_timeout", True))
+        self.adaptive_factor  = float(te.get("adaptive_timeout_factor", 3.0))
+        self.adaptive_floor   = float(te.get("adaptive_timeout_floor", 120))
+        self.adaptive_min_samples = int(te.get("adaptive_timeout_min_samples", 3))
+        self._tc_timeout = self.timeout              # effective timeout of the current TC
+        # Hang detector: a controller that prints NOTHING for this many seconds
+        # (e.g. awaiting an event that never comes) gets a stack dump and is
+        # killed with a HANG reason instead of idling until the timeout.
+        # Per-TC overrides (exact id or id prefix) for legitimately quiet tests.
+        # 0 disables.
+        self.hang_inactivity = float(te.get("hang_inactivity_seconds", 600) or 0)
+        self.hang_overrides  = dict(te.get("hang_inactivity_overrides") or {})
+        self._tc_hang_s = self.hang_inactivity
+        # Pipelined DUT pre-launch: while TC N's controller runs, TC N+1's DUT is
+        # launched and warmed in the OTHER of two slots — own state root
+        # (/tmp/matterci_slot<k>, --KVS), own ports and discriminator D+k — so
+        # the handoff is instant and can't collide with the running test. The
+        # gap between one controller exiting and the next starting is recorded
+        # per TC (counts.idle_gap_s) with or without pipelining.
+        self.prelaunch = bool(te.get("pipeline_dut_prelaunch", False))
+        if self.prelaunch and self.discriminator in (None, ""):
+            print("[WARN] pipeline_dut_prelaunch needs test_execution.discriminator "
+                  "(slots advertise on discriminator+slot) — disabled.")
+            self.prelaunch = False
+        # Tests that browse ALL commissionable nodes / test discovery — a second
+        # advertising DUT would disturb them, so nothing is pre-launched during them.
+        self.prelaunch_exclude = tuple(te.get("prelaunch_exclude") or
+                                       ("TC_SC_", "TC_DD_", "TC_CADMIN", "TC_DA_"))
+        self._prelaunch: dict | None = None          # {tc_id, slot, cmd, dut, thread, ok}
+        self._next_tc: dict | None = None
+        self._cur_slot = 0
+        self._disc_override = None                   # slot discriminator for this attempt
+        self._last_controller_end = None
+        self._gaps: list[tuple[float, bool]] = []    # (idle gap, was pre-launched)
+        self._writer: "ResultsWriter | None" = None
+        self._forked_count  = 0
+        self._import_saved  = 0.0
         # Retry settings
         self.retry_on_commissioning = cfg["test_execution"].get(
             "retry_on_commissioning_failure", 3)
@@ -769,6 +1043,83 @@ class TestRunner:
         self.apply_ci_test_args = bool(cfg["test_execution"].get("apply_ci_test_args", True))
         self._ci_header_cache: dict[str, str] = {}   # script name -> CI header text
         self._sdk_app_map_cache = None               # ${ENV_KEY} -> binary path
+        # Controller forkserver: one venv python pre-imports mobly + the chip/
+        # matter stack and forks each DUT test from that warm image instead of
+        # paying the interpreter + import cost per TC (controller_forkserver.py).
+        # Started lazily on first use; any failure falls back to a plain Popen.
+        self.use_forkserver = bool(cfg["test_execution"].get("controller_forkserver", False))
+        self._forkserver: "ForkServerClient | None" = None
+        self._forkserver_failed = False
+        self._last_spawn: dict = {}                  # how the last controller started
+        # Commissioned-fabric snapshots (fabric_snapshot.py): commission each
+        # DUT command once, then restore DUT KVS + admin_storage for compatible
+        # TCs and skip their commissioning. Off by default; any session error on
+        # a restored run falls back to fresh commissioning for that TC.
+        self.fabric_snapshot = None
+        if cfg["test_execution"].get("fabric_snapshot", False):
+            self.fabric_snapshot = FabricSnapshotCache(
+                Path("/tmp/matterci_fabric_snapshots"),
+                exclude=cfg["test_execution"].get("fabric_snapshot_exclude") or ())
+        self._snapshot_bypass: set[str] = set()      # TCs forced back to fresh commissioning
+        # tmpfs runtime (runtime_store.py): DUT KVS, controller storage, app-pipe
+        # FIFOs, restart flags and slot roots live on a tmpfs instead of the SD
+        # card, and each TC's logs are written there live and flushed (optionally
+        # gzip'd) to log_dir once it finishes. Past the memory cap a TC's logs
+        # spill straight to log_dir. Off by default.
+        self.runtime: "RuntimeStore | None" = None
+        if te.get("runtime_tmpfs", False):
+            store = RuntimeStore(te.get("runtime_tmpfs_dir") or RUNTIME_ROOT,
+                                 max_mb=te.get("runtime_tmpfs_max_mb", 256),
+                                 min_free_mb=te.get("runtime_tmpfs_min_free_mb", 128),
+                                 compress=bool(te.get("runtime_log_compress", False)))
+            if store.in_memory:
+                self.runtime = store
+            else:
+                print(f"[WARN] runtime_tmpfs_dir {store.root} is not on a tmpfs — "
+                      f"runtime state and logs stay on disk.")
+                shutil.rmtree(store.root, ignore_errors=True)
+        self._live_log_dir = self.log_dir            # where the current TC's logs are written
+        # Protocol latency metrics (latency_metrics.py): PASE/CASE/commissioning/
+        # first IM round-trips/DUT boot-to-advertise per TC, kept in the run
+        # history with the SDK commit and flagged when slower than the median of
+        # the TC's previous N commits by more than pct % AND min seconds.
+        self.latency = bool(te.get("latency_metrics", True))
+        self.latency_pct = float(te.get("latency_regression_pct", 50))
+        self.latency_min_s = float(te.get("latency_regression_min_s", 0.25))
+        self.latency_commits = int(te.get("latency_baseline_commits", 5))
+        bi = read_build_info()
+        self.sdk_commit = bi.get("commit") or bi.get("commit_short") or ""
+        self._latency_flagged: list[tuple[str, dict]] = []
+        # Per-app DUT peak RSS (VmHWM, sampled at stop) → logs/app_memory.json,
+        # which footprint_tracker.py diffs against previous nightlies.
+        self.app_memory: dict[str, dict] = {}
+        # Content-addressed result cache (result_cache.py): a TC whose binaries,
+        # script, controller venv and executed commands all hash the same as a
+        # stored PASS is reported as CACHED instead of re-run. Every
+        # result_cache_full_run_every-th run (or --full-run) ignores it.
+        # Fail-fast ordering (priority_order.py): last run's failures, then TCs
+        # whose script / app changed, then the rest — with a partial report
+        # upload once the first two tiers are done.
+        self.priority = priority or bool(te.get("priority_order", False))
+        self._priority_n = 0
+        self._partial_upload = None
+        self._sa_key = sa_key          # Drive key for that upload — memory only
+        # Time budget (--budget, budget_select.py): run only the TCs whose
+        # history-estimated durations fit, covering as many clusters as
+        # possible; the skipped TCs are listed in the report and the
+        # prediction error is logged after the run.
+        self.budget_s = budget_s
+        self.budget_plan: dict | None = None
+        self._wall: dict[str, float] = {}
+        self.result_cache = None
+        self._cache_keys: dict[str, str | None] = {}
+        if te.get("result_cache", False):
+            self.result_cache = ResultCache(
+                te.get("result_cache_dir", RESULT_CACHE_ROOT),
+                max_entries=te.get("result_cache_max_entries", 2000),
+                full_run_every=te.get("result_cache_full_run_every", 7),
+                force_full=full_run)
+            self._venv_hash = environment_hash(self.venv_python)
 
     def _ci_header(self, script_name: str) -> str:
         """The test's '=== BEGIN CI TEST ARGUMENTS ===' block, comment-stripped (cached)."""
@@ -822,10 +1173,13 @@ class TestRunner:
                       else None)
         return dut_cmd, stdin_pipe
 
-    def _apply_ci_test_args(self, dut_cmd: str, py_cmd: str) -> tuple[str, str]:
+    def _apply_ci_test_args(self, dut_cmd: str, py_cmd: str,
+                            quiet: bool = False) -> tuple[str, str]:
         """Inject the test's declared CI args so operator/CI-sim tests run
         unattended — from the SDK CI header, so values are always correct and
-        self-updating (fixes missing --enable-key and simulate_* flags)."""
+        self-updating (fixes missing --enable-key and simulate_* flags).
+        quiet=True skips the per-arg log lines (planning / cache-key lookups)."""
+        say = (lambda *_a, **_k: None) if quiet else print
         if not self.apply_ci_test_args:
             return dut_cmd, py_cmd
         m = re.search(r"\b(TC_\w+\.py)\b", py_cmd)
@@ -838,7 +1192,7 @@ class TestRunner:
         ek = re.search(r"--enable-key\s+([0-9a-fA-F]{2,})", hdr)
         if ek and "--enable-key" not in dut_cmd:
             dut_cmd = set_cmd_flag(dut_cmd, "--enable-key", ek.group(1))
-            print(f"  [DUT] +--enable-key (test event triggers) from CI header")
+            say(f"  [DUT] +--enable-key (test event triggers) from CI header")
         # 1b) python per-test timeout. Some tests (e.g. TC-CADMIN window-timing,
         # long failsafe/OTA tests) monitor a full commissioning window and declare
         # a --timeout in their CI header FAR larger than the framework default
@@ -849,7 +1203,7 @@ class TestRunner:
         tm = re.search(r"--timeout\s+(\d+)", hdr)
         if tm and not re.search(r"--timeout\b", py_cmd):
             py_cmd = f"{py_cmd.rstrip()} --timeout {tm.group(1)}"
-            print(f"  [CI-ARG] +--timeout {tm.group(1)}s (from CI header)")
+            say(f"  [CI-ARG] +--timeout {tm.group(1)}s (from CI header)")
         # 2) python typed args (bool/int/hex/string/float)-arg NAME:VAL. For each
         #    arg the SDK header declares, with its value resolved from ${...}:
         #      - Sheet has NAME:<placeholder>  → replace the placeholder value
@@ -868,21 +1222,21 @@ class TestRunner:
                 r"--(bool|int|hex|string|float)-arg\s+([\w.]+):(\S+)", hdr):
             if name in NO_AUTOINJECT_ARGS and not re.search(
                     rf"-arg\s+{re.escape(name)}:", py_cmd):
-                print(f"  [CI-ARG] skip {name} (SDK-CI replay arg — not for live runs)")
+                say(f"  [CI-ARG] skip {name} (SDK-CI replay arg — not for live runs)")
                 continue
             val = self._resolve_sdk_placeholders(val)
             if "${" in val:
-                print(f"  [CI-ARG] skip {name} (unresolved SDK placeholder {val})")
+                say(f"  [CI-ARG] skip {name} (unresolved SDK placeholder {val})")
                 continue
             if re.search(rf"{re.escape(name)}:<[^>]*>", py_cmd):
                 py_cmd = re.sub(rf"{re.escape(name)}:<[^>]*>",
                                 lambda mm: f"{name}:{val}", py_cmd)
-                print(f"  [CI-ARG] resolved {name} → {val}")
+                say(f"  [CI-ARG] resolved {name} → {val}")
             elif re.search(rf"-arg\s+{re.escape(name)}:", py_cmd):
                 continue
             else:
                 py_cmd = f"{py_cmd.rstrip()} --{typ}-arg {name}:{val}"
-                print(f"  [CI-ARG] +--{typ}-arg {name}:{val}")
+                say(f"  [CI-ARG] +--{typ}-arg {name}:{val}")
 
         # Strip any leftover angle-bracket placeholder on a named arg whose value
         # is concrete (e.g. dut_rpc_server_ip:<127.0.0.1> → 127.0.0.1). A bracketed
@@ -901,7 +1255,7 @@ class TestRunner:
             pm = re.search(r"--rpc-server-port[\"',\s]+(\d+)", src)
             if pm:
                 py_cmd = re.sub(r"(dut_rpc_server_port):\S+", rf"\1:{pm.group(1)}", py_cmd)
-                print(f"  [CI-ARG] dut_rpc_server_port → {pm.group(1)} (from the test's admin app)")
+                say(f"  [CI-ARG] dut_rpc_server_port → {pm.group(1)} (from the test's admin app)")
             py_cmd = re.sub(r"(dut_rpc_server_ip):\S+", r"\1:127.0.0.1", py_cmd)
         return dut_cmd, py_cmd
 
@@ -948,13 +1302,19 @@ class TestRunner:
         storage_name = self.admin_storage
 
         # Remove from all possible locations
-        for search_dir in [PROJECT_ROOT, self.scripts_dir]:
+        search_dirs = [PROJECT_ROOT, self.scripts_dir]
+        if self.runtime is not None:
+            search_dirs.append(self.runtime.state)
+            (self.runtime.state / "chip_kvs").unlink(missing_ok=True)
+        for search_dir in search_dirs:
             admin = search_dir / storage_name
             if admin.exists():
                 admin.unlink()
                 print(f"  [CLEAN] Removed {admin}")
 
-        # Clean chip tmp files (prevents state bleed between tests)
+        # Clean chip tmp files (prevents state bleed between tests). A pipelined
+        # slot DUT keeps its chip_*.ini under its own TMPDIR, so this is safe
+        # while one is pre-launched.
         subprocess.run(
             "rm -f /tmp/chip_*.ini /tmp/chip_*.json /tmp/chip_kvs",
             shell=True, capture_output=True
@@ -990,7 +1350,8 @@ class TestRunner:
         # value the DUT advertises on (see DUTManager.launch). For self-launching
         # tests (JFDS) this becomes discriminators[0], which they pass to their
         # own apps — so it's still correct. Skipped only for qr/manual-code cmds.
-        cmd = apply_discriminator(cmd, self.discriminator)
+        cmd = apply_discriminator(
+            cmd, self.discriminator if self._disc_override is None else self._disc_override)
 
         # Ensure a --passcode accompanies --discriminator: the framework requires
         # equal counts, and self-launching tests read setup_passcodes[0] (which
@@ -1102,19 +1463,16 @@ class TestRunner:
         wait_s = self.cfg.get("test_execution", {}).get("pairing_code_wait", 30)
         deadline = time.time() + wait_s
         while time.time() < deadline:
-            try:
-                dlog = dut_log.read_text(errors="replace")
-            except OSError:
-                dlog = ""
-            # DUT log lines are wrapped in ANSI colour codes (e.g. "…]\x1b[0m") —
-            # strip them so the payload isn't followed by escape bytes.
-            dlog = re.sub(r"\x1b\[[0-9;]*m", "", dlog)
+            # One mmap per poll, both patterns on it; the DUT log keeps growing
+            # while we wait, so each poll maps its current size.
+            pats = {}
             if want_qr and not qr:
-                m = re.search(r"SetupQRCode:\s*\[?(MT:[^\]\s]+)\]?", dlog)
-                qr = m.group(1) if m else None
+                pats["qr"] = (_QR_CODE_RE, 1)
             if want_mc and not mc:
-                m = re.search(r"Manual pairing code:\s*\[?([0-9][0-9\- ]*[0-9])\]?", dlog)
-                mc = m.group(1) if m else None
+                pats["mc"] = (_MANUAL_CODE_RE, 1)
+            found = log_scan.search_many(dut_log, pats)
+            qr = qr or found.get("qr")
+            mc = mc or found.get("mc")
             if (not want_qr or qr) and (not want_mc or mc):
                 break
             time.sleep(0.5)
@@ -1155,7 +1513,7 @@ class TestRunner:
         reboot = mode.lower().startswith(("restart", "reboot"))
         if reboot:
             # Drop the leading `rm -rf <path> &&` so persisted data survives.
-            launch_cmd = re.sub(r"^\s*rm\s+-rf\s+\S+\s*&&\s*", "", dut_cmd)
+            launch_cmd = strip_kvs_reset(dut_cmd)
             note(f"[RESET] '{mode}' → REBOOT (preserve persisted data) — relaunching")
         else:
             launch_cmd = dut_cmd     # keeps `rm -rf /tmp/chip_*` → wipes KVS
@@ -1164,9 +1522,282 @@ class TestRunner:
         ok, err = dut.launch(launch_cmd, dut_log, append=True)
         note("[RESET] DUT back up" if ok else f"[RESET] DUT relaunch FAILED: {err}")
 
+    # ── tmpfs runtime ────────────────────────────────────────────────────────
+    def _runtime_path(self, name: str) -> str:
+        """Per-TC runtime file: on the runtime tmpfs when enabled, else /tmp."""
+        return str(self.runtime.state / name) if self.runtime is not None else f"/tmp/{name}"
+
+    def _with_runtime_kvs(self, dut_cmd: str) -> str:
+        """Point the DUT's KVS at the runtime tmpfs (no-op when off or the command
+        sets its own --KVS). The path is added to the command's leading `rm -rf`
+        too, so launches and factory resets still start from a wiped KVS."""
+        if (self.runtime is None or re.search(r"(?<!\S)--KVS\b", dut_cmd)
+                or is_controller_app(dut_cmd)):
+            return dut_cmd
+        kvs = self._runtime_path("chip_kvs")
+        dut_cmd = re.sub(r"^(\s*rm\s+-rf\s+[^&]+?)\s*&&",
+                         lambda m: f"{m.group(1)} {kvs} &&", dut_cmd, count=1)
+        return set_cmd_flag(dut_cmd, "--KVS", kvs)
+
+    def _live_dir(self, tc_id: str) -> Path:
+        """Where this TC writes its logs: the tmpfs, or log_dir when the runtime
+        is off / over its memory cap (spill). A TC whose DUT was pre-launched
+        keeps the directory that DUT is already logging to."""
+        if self.runtime is None:
+            return self.log_dir
+        pre = self._prelaunch
+        if pre and pre["tc_id"] == tc_id:
+            return pre["log_dir"]
+        ok, why = self.runtime.admit()
+        if not ok:
+            print(f"  [RUNTIME] {why} — this TC's logs spill to {self.log_dir}")
+            return self.log_dir
+        return self.runtime.logs
+
+    def _flush_logs(self, tc_id: str) -> dict[str, Path]:
+        """Move a finished TC's logs (Ctrl/DUT, attempts, snapshot) to log_dir."""
+        safe = re.sub(r"[^A-Za-z0-9_]", "_", tc_id)
+        pattern = re.compile(rf"^(?:{re.escape(tc_id)}|{safe}_snapshot)"
+                             rf"(?:_dut)?(?:_attempt\d+)?\.log$")
+        return self.runtime.flush(self.log_dir, pattern)
+
+    # ── Pipelined DUT pre-launch ─────────────────────────────────────────────
+    def _slot_dut_cmd(self, dut_cmd: str, slot: int) -> tuple[str, int, dict]:
+        """(DUT command, discriminator, env) for a pipelined slot: the command's
+        own `rm -rf …` is replaced by a per-slot state root (so it can't wipe the
+        running DUT's /tmp/chip_* KVS), plus per-slot --KVS and ports. The env
+        points TMPDIR at that root, so the SDK's chip_config/counters/factory.ini
+        are the slot's own too, never the running DUT's /tmp ones."""
+        root = self._runtime_path(f"matterci_slot{slot}")
+        cmd = strip_kvs_reset(dut_cmd)
+        cmd = set_cmd_flag(cmd, "--KVS", f"{root}/chip_kvs")
+        if slot:
+            cmd = set_cmd_flag(cmd, "--secured-device-port", str(5540 + 100 * slot))
+            cmd = set_cmd_flag(cmd, "--unsecured-commissioner-port", str(5550 + 100 * slot))
+        disc = (int(self.discriminator) + slot) % 4096
+        return (f"rm -rf {root} && mkdir -p {root} && {cmd}", disc,
+                dict(os.environ, TMPDIR=str(root)))
+
+    def _planned_dut_cmd(self, tc: dict) -> str | None:
+        """The DUT command _run_attempt will launch for `tc` (same CI-arg /
+        app-pipe rewrites, computed quietly), or None when the TC can't be
+        pre-launched: no ./app, controller app, JF / Fabric-Sync, or a fabric
+        snapshot restore (needs the restored KVS at launch)."""
+        tc_id = tc["test_case_id"]
+        safe = re.sub(r"[^A-Za-z0-9_]", "_", tc_id)
+        dut_cmd, py_cmd = self._apply_ci_test_args(tc["dut_command"], tc["python_command"],
+                                                   quiet=True)
+        py_cmd = self._ensure_pics(py_cmd)
+        if (not re.search(r"\./\S+", dut_cmd) or is_controller_app(dut_cmd)
+                or re.search(r"\bjf[ac]_server_app\b", py_cmd)
+                or self._fabric_sync_dut(py_cmd, safe)[0]):
+            return None
+        if self.fabric_snapshot is not None:
+            sm = re.search(r"\b(TC_\w+\.py)\b", py_cmd)
+            if self.fabric_snapshot.eligible(
+                    tc_id, self._ci_header(sm.group(1)) if sm else "", py_cmd)[0]:
+                return None
+        dut_cmd = self._with_runtime_kvs(dut_cmd)
+        if self._uses_app_pipe(py_cmd):
+            dut_cmd = set_cmd_flag(dut_cmd, "--app-pipe",
+                                   self._runtime_path(f"chip_apppipe_{safe}"))
+        return dut_cmd
+
+    def _start_prelaunch(self, current_tc_id: str, dut: "DUTManager"):
+        """Launch + warm the next TC's DUT in the other slot (background thread)."""
+        nxt = self._next_tc
+        if not (self.prelaunch and nxt) or self._prelaunch is not None:
+            return
+        norm = "TC_" + re.sub(r"^TC[-_]", "", current_tc_id).replace("-", "_").replace(".", "_")
+        if norm.startswith(self.prelaunch_exclude):
+            return
+        planned = self._planned_dut_cmd(nxt)
+        if not planned:
+            return
+        # A result-cache hit won't launch a DUT at all.
+        if self.result_cache is not None:
+            key = self._cache_key(nxt, dut)
+            if key and self.result_cache.peek(key):
+                return
+        slot = 1 - self._cur_slot
+        cmd, disc, env = self._slot_dut_cmd(planned, slot)
+        spare = DUTManager(self.cfg, apps=dut.apps)
+        pre = {"tc_id": nxt["test_case_id"], "planned": planned, "slot": slot,
+               "cmd": cmd, "disc": disc, "dut": spare, "ok": False,
+               "log_dir": self._live_log_dir}
+
+        def _launch():
+            print(f"  [PRELAUNCH] Warming {pre['tc_id']}'s DUT in slot {slot} "
+                  f"(discriminator {disc}) while this test runs")
+            pre["ok"], _ = spare.launch(cmd, pre["log_dir"] / f"{pre['tc_id']}_dut.log",
+                                        discriminator=disc, env=env)
+
+        pre["thread"] = threading.Thread(target=_launch, daemon=True)
+        pre["thread"].start()
+        self._prelaunch = pre
+
+    def _adopt_prelaunch(self, tc_id: str, dut: "DUTManager", dut_cmd: str) -> str | None:
+        """Hand the pre-launched DUT to this TC if it was warmed for exactly this
+        command. Returns the slot's DUT command (for resets), else None."""
+        pre = self._prelaunch
+        if not pre or pre["tc_id"] != tc_id or pre["planned"] != dut_cmd:
+            self._discard_prelaunch()
+            return None
+        pre["thread"].join()
+        self._prelaunch = None
+        if not pre["ok"] or pre["dut"]._proc is None or pre["dut"]._proc.poll() is not None:
+            pre["dut"].stop(settle=False)
+            print("  [PRELAUNCH] Pre-launched DUT is not running — launching normally")
+            time.sleep(self.cfg["test_execution"].get("dut_settle_wait", 2))
+            return None
+        dut.adopt(pre["dut"])
+        self._cur_slot = pre["slot"]
+        self._disc_override = pre["disc"]
+        print(f"  [PRELAUNCH] Adopted warm DUT (slot {pre['slot']}, discriminator "
+              f"{pre['disc']}) — no launch/startup wait")
+        return pre["cmd"]
+
+    def _discard_prelaunch(self):
+        """Stop a pre-launched DUT that won't be used (retry, mismatch, end of run)."""
+        pre, self._prelaunch = self._prelaunch, None
+        if pre:
+            pre["thread"].join()
+            pre["dut"].stop(settle=False)
+            # The previous DUT's stop skipped its settle wait on the assumption
+            # of a handoff — honour it now before anything relaunches.
+            time.sleep(self.cfg["test_execution"].get("dut_settle_wait", 2))
+
+    def _controller_storage(self, py_cmd: str) -> Path:
+        """Where the python controller keeps its fabric (admin_storage.json)."""
+        m = re.search(r"--storage-path(?:[=\s]+)(\S+)", py_cmd)
+        return (self.scripts_dir / m.group(1).strip("'\"")) if m \
+            else self.scripts_dir / self.admin_storage
+
+    def _take_fabric_snapshot(self, key: str, dut: "DUTManager", dut_cmd: str,
+                              py_cmd: str, safe: str) -> bool:
+        """Commission the DUT once with --commission-only and snapshot the result.
+
+        Runs the TC's own script (so commissioning uses exactly its flags) against
+        a fresh DUT, stops the DUT so the KVS is flushed, then captures DUT KVS +
+        controller storage. On any failure the key is marked broken and the TCs
+        sharing it simply commission fresh.
+        """
+        print(f"  [SNAP] No fabric snapshot for this DUT command yet — "
+              f"commissioning once (--commission-only) to take it")
+        t0 = time.time()
+        dut_cmd = strip_flags(dut_cmd, ("--app-pipe",))
+        ok, err = dut.launch(dut_cmd, self._live_log_dir / f"{safe}_snapshot_dut.log")
+        if not ok:
+            self.fabric_snapshot.mark_broken(key)
+            print(f"  [SNAP] ⚠️  DUT launch failed ({err}) — no snapshot")
+            return False
+        parts = self._build_python_cmd(
+            strip_flags(py_cmd, ("--app-pipe", "--restart-flag-file"))) + ["--commission-only"]
+        try:
+            with open(self._live_log_dir / f"{safe}_snapshot.log", "w") as lf:
+                rc = subprocess.run(parts, stdout=lf, stderr=subprocess.STDOUT,
+                                    timeout=min(self.timeout, 300),
+                                    cwd=str(self.scripts_dir),
+                                    env=self._controller_env()).returncode
+        except subprocess.TimeoutExpired:
+            rc = None
+        dut.stop()
+        if rc == 0:
+            ok, err = self.fabric_snapshot.capture(key, dut_cmd, self._controller_storage(py_cmd))
+        else:
+            self.fabric_snapshot.mark_broken(key)
+            ok, err = False, ("commissioning timed out" if rc is None
+                              else f"commissioning exited rc={rc}")
+        self._clean_storage()
+        if ok:
+            print(f"  [SNAP] Snapshot {key} taken in {round(time.time() - t0, 1)}s")
+        else:
+            print(f"  [SNAP] ⚠️  {err} — TCs on this DUT command commission fresh")
+        return ok
+
+    def _controller_env(self) -> dict:
+        # ci_site/ carries a sitecustomize that registers a SIGUSR1 faulthandler
+        # (stack dumps for the hang detector) — prepended, never replacing.
+        site = str(SCRIPT_DIR / "ci_site")
+        pp = os.environ.get("PYTHONPATH", "")
+        return {**os.environ,
+                "PATH": f"{self.venv_python.parent}:{os.environ.get('PATH','')}",
+                "PYTHONPATH": f"{site}:{pp}" if pp else site}
+
+    def _hang_threshold(self, tc_id: str) -> float:
+        """Inactivity threshold for this TC: exact-id override, else the longest
+        matching id-prefix override, else hang_inactivity_seconds."""
+        if tc_id in self.hang_overrides:
+            return float(self.hang_overrides[tc_id] or 0)
+        prefixes = [p for p in self.hang_overrides if tc_id.startswith(p)]
+        if prefixes:
+            return float(self.hang_overrides[max(prefixes, key=len)] or 0)
+        return self.hang_inactivity
+
+    def _dump_stacks(self, proc, note):
+        """Best-effort stack dump of a hung controller into its Ctrl Log: py-spy
+        (native + python frames) when installed, else SIGUSR1 → faulthandler."""
+        pyspy = shutil.which("py-spy") or shutil.which("py-spy", path=str(self.venv_python.parent))
+        if pyspy:
+            try:
+                r = subprocess.run([pyspy, "dump", "--pid", str(proc.pid)],
+                                   capture_output=True, text=True, timeout=30)
+                if r.returncode == 0 and r.stdout.strip():
+                    note("[HANG] py-spy stack dump:\n" + r.stdout.rstrip())
+                    return
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        try:
+            os.kill(proc.pid, signal.SIGUSR1)
+            note("[HANG] Sent SIGUSR1 — faulthandler stack dump follows (all threads)")
+            time.sleep(2)   # let the dump drain through the output pipe
+        except (ProcessLookupError, OSError):
+            pass
+
+    def _spawn_controller(self, cmd_parts: list[str]):
+        """
+        Start the python test with piped stdin/stdout (stderr merged) in its own
+        session. Uses the controller forkserver when enabled and the command is a
+        plain `<venv python> <script.py> …`; otherwise — or if the forkserver is
+        unavailable or the request fails — a regular subprocess.Popen. Records how
+        it was started in self._last_spawn for the result counts.
+        """
+        env = self._controller_env()
+        self._last_spawn = {}
+        eligible = (self.use_forkserver and not self._forkserver_failed
+                    and len(cmd_parts) > 1
+                    and cmd_parts[0] == str(self.venv_python)
+                    and str(cmd_parts[1]).endswith(".py"))
+        if eligible and self._forkserver is None:
+            self._forkserver = ForkServerClient(
+                self.venv_python, self.scripts_dir, env,
+                self.log_dir.parent / "forkserver.log")
+            ok, err = self._forkserver.start()
+            if ok:
+                print(f"  [FORKSRV] Ready — pre-imported {len(self._forkserver.modules)} "
+                      f"module(s) in {self._forkserver.import_s}s (a fresh interpreter "
+                      f"takes {self._forkserver.cold_s}s to import them)")
+            else:
+                print(f"  [FORKSRV] ⚠️  {err} — using a fresh interpreter per test.")
+                self._forkserver_failed = True
+                self._forkserver = None
+        if eligible and self._forkserver is not None:
+            try:
+                t0 = time.monotonic()
+                proc = self._forkserver.spawn(cmd_parts, env, self.scripts_dir)
+                self._last_spawn = {"forkserver": True, "t0": t0}
+                return proc
+            except (OSError, ValueError, KeyError) as e:
+                print(f"  [FORKSRV] ⚠️  spawn failed ({e}) — falling back to subprocess.")
+        return subprocess.Popen(
+            cmd_parts, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, text=True, bufsize=1,
+            cwd=str(self.scripts_dir), preexec_fn=os.setsid, env=env,
+        )
+
     def _run_python_prompted(self, cmd_parts, log_path: Path, header_lines: list,
                              dut: "DUTManager", dut_cmd: str, dut_log: Path,
-                             restart_flag: str = None) -> tuple[int, bool]:
+                             restart_flag: str = None) -> tuple[int, bool, float]:
         """Run the python test with a live pipe so it runs unattended:
 
         1) restart-flag-file (SDK CI mechanism): a test that calls
@@ -1177,7 +1808,11 @@ class TestRunner:
            a 'factory reset' prompt also triggers a reset; any other prompt is
            auto-confirmed with Enter.
 
-        Returns (returncode, timed_out).
+        3) hang detector: no output line for the TC's inactivity threshold →
+           stack dump (py-spy / SIGUSR1 faulthandler) into the log, then kill.
+
+        Returns (returncode, timed_out, hung_s) — hung_s is the idle time in
+        seconds after which the hang detector killed the test, 0 when it didn't.
         """
         lf = open(log_path, "w")
         for ln in header_lines:
@@ -1186,18 +1821,18 @@ class TestRunner:
         lf.flush()
         log_lock = threading.Lock()
 
-        proc = subprocess.Popen(
-            cmd_parts, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT, text=True, bufsize=1,
-            cwd=str(self.scripts_dir), preexec_fn=os.setsid,
-            env={**os.environ,
-                 "PATH": f"{self.venv_python.parent}:{os.environ.get('PATH','')}"},
-        )
+        proc = self._spawn_controller(cmd_parts)
+        if self._last_spawn.get("forkserver"):
+            lf.write("[CI] Controller forked from pre-imported forkserver\n\n")
+            lf.flush()
 
         q: "queue.Queue" = queue.Queue()
+        first_line: list[float] = []                     # monotonic time of 1st output
 
         def _reader():
             for line in proc.stdout:
+                if not first_line:
+                    first_line.append(time.monotonic())
                 with log_lock:
                     lf.write(line)
                     lf.flush()
@@ -1213,13 +1848,23 @@ class TestRunner:
                 lf.flush()
             print(f"  {msg}")
 
-        deadline = time.time() + self.timeout
+        deadline = time.time() + self._tc_timeout
         timed_out = False
+        hung_s = 0.0                         # > 0 → killed by the hang detector
+        last_output = time.time()
         while True:
             remaining = deadline - time.time()
             if remaining <= 0:
                 timed_out = True
                 break
+            # Hang detector: no output line for the TC's inactivity threshold.
+            idle = time.time() - last_output
+            if self._tc_hang_s and idle >= self._tc_hang_s:
+                hung_s = round(idle)
+                _note(f"[HANG] No controller output for {hung_s}s "
+                      f"(threshold {int(self._tc_hang_s)}s) — dumping stacks and killing")
+                self._dump_stacks(proc, _note)
+                break
 
             # (1) restart-flag-file: the test wrote it and is polling for removal.
             # Reset the DUT, then delete the flag to unblock the test (which then
@@ -1234,6 +1879,7 @@ class TestRunner:
                     os.remove(restart_flag)
                 except OSError:
                     pass
+                last_output = time.time()            # the reset itself is quiet
                 continue
 
             try:
@@ -1242,6 +1888,7 @@ class TestRunner:
                 continue
             if line is None:
                 break                                    # test process finished
+            last_output = time.time()
             # (2) stdin prompt line: ">>> <msg> (press enter to confirm)".
             if "press enter to confirm" in line:
                 low = line.lower()
@@ -1256,19 +1903,48 @@ class TestRunner:
                     proc.stdin.flush()
                 except (BrokenPipeError, OSError):
                     pass
+                last_output = time.time()
 
-        if timed_out:
+        if timed_out or hung_s:
             try:
                 os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
             except (ProcessLookupError, OSError):
                 pass
+        if timed_out:
             with log_lock:
-                lf.write(f"\n\n[CI] TIMEOUT after {self.timeout}s\n")
+                lf.write(f"\n\n[CI] TIMEOUT after {self._tc_timeout}s\n")
+                lf.flush()
+        elif hung_s:
+            with log_lock:
+                lf.write(f"\n\n[CI] HANG — no output for {hung_s}s, killed\n")
                 lf.flush()
         rc = proc.wait()
         reader.join(timeout=5)
+        # Import time this forked TC saved: the cold baseline minus the child's
+        # startup (fork → first output line). A lower bound — that startup also
+        # covers the script's own, not preloaded, imports.
+        fs = self._forkserver
+        if self._last_spawn.get("forkserver") and first_line and fs and fs.cold_s:
+            startup = first_line[0] - self._last_spawn["t0"]
+            self._last_spawn["import_saved_s"] = round(max(fs.cold_s - startup, 0.0), 2)
+            with log_lock:
+                lf.write(f"\n[CI] Forked controller started in {round(startup, 2)}s "
+                         f"(fresh interpreter imports: {fs.cold_s}s)\n")
         lf.close()
-        return rc, timed_out
+        return rc, timed_out, hung_s
+
+    def _parse_outcome(self, log_text: str, exit_code: int, summary_dir,
+                       since: float) -> tuple[str, dict, str]:
+        """Verdict from this run's mobly test_summary.yaml; console-log regex
+        parsing (parse_result) only when there is no complete summary."""
+        summary = load_mobly_summary(summary_dir, since) if summary_dir else None
+        if summary is None:
+            return parse_result(log_text, exit_code=exit_code,
+                                pass_threshold=self.pass_threshold)
+        status, counts, reason = parse_summary_result(
+            summary, log_text, pass_threshold=self.pass_threshold)
+        counts["mobly_summary"] = True
+        return status, counts, reason
 
     def _run_attempt(self, tc: dict, dut: DUTManager,
                      attempt: int, log_path: Path, dut_log: Path) -> tuple:
@@ -1287,6 +1963,11 @@ class TestRunner:
         # PIXIT typed args + resolved app paths to the python cmd) so operator/
         # event-trigger/joint-fabric tests run unattended with correct values.
         dut_cmd, py_cmd = self._apply_ci_test_args(dut_cmd, py_cmd)
+        safe = re.sub(r"[^A-Za-z0-9_]", "_", tc_id)
+        self._last_spawn = {}
+        self._disc_override = None
+        if attempt > 1:
+            self._discard_prelaunch()   # a retry relaunches fresh on the default slot
 
         # Ensure --PICS is present for EVERY test (not just app-pipe ones) so the
         # configured PICS source — which carries PICS_SDK_CI_ONLY — is active and
@@ -1295,13 +1976,25 @@ class TestRunner:
         # dut_rpc_server_port + setup_passcodes) and fail. Leaves an existing
         # --PICS or --PICS placeholder in the Sheet command untouched.
         py_cmd = self._ensure_pics(py_cmd)
+        # tmpfs runtime: the controller's fabric storage lives there too.
+        if self.runtime is not None and "--storage-path" not in py_cmd:
+            py_cmd = (f"{py_cmd.rstrip()} --storage-path "
+                      f"{self._runtime_path(self.admin_storage)}")
+        # Per-TC mobly log dir, so the verdict is read from the run's own
+        # test_summary.yaml (see _parse_outcome). A Sheet-provided --logs-path
+        # is kept (and read, but never wiped).
+        m = re.search(r"--logs-path(?:[=\s]+)(\S+)", py_cmd)
+        mobly_dir = None if m else self._runtime_path(f"matterci_mobly_{safe}")
+        if mobly_dir:
+            py_cmd = f"{py_cmd.rstrip()} --logs-path {mobly_dir}"
+        summary_dir = (str(self.scripts_dir / m.group(1).strip("'\"")) if m
+                       else mobly_dir)
 
         # Self-orchestrating tests (e.g. Joint Fabric JFDS/JFADMIN) launch their
         # OWN helper apps and pass their paths via --string-arg; the DUT command
         # has no `./app` for us to launch (and launching one would collide). Detect
         # that and skip our DUT launch + discriminator override.
         has_dut_app = bool(re.search(r"\./\S+", dut_cmd))
-        safe = re.sub(r"[^A-Za-z0-9_]", "_", tc_id)
 
         # Joint-Fabric self-orchestrating tests (they pass jfa_server_app /
         # jfc_server_app and run in CI mode via PICS_SDK_CI_ONLY) launch their OWN
@@ -1344,10 +2037,13 @@ class TestRunner:
         # MATCHING --app-pipe into BOTH the DUT app and the python command (SDK CI
         # pattern), and ensure --PICS so PICS_SDK_CI_ONLY makes the test take the
         # pipe path instead of prompting an operator. Pipe lives under /tmp/chip_*
-        # so the DUT's own `rm -rf /tmp/chip_*` + our cleanup wipe it.
+        # so the DUT's own `rm -rf /tmp/chip_*` + our cleanup wipe it (on the
+        # tmpfs runtime it's removed explicitly before launch and after the TC).
+        if has_dut_app:
+            dut_cmd = self._with_runtime_kvs(dut_cmd)
         app_pipe = None
         if has_dut_app and self._uses_app_pipe(py_cmd):
-            app_pipe = f"/tmp/chip_apppipe_{safe}"
+            app_pipe = self._runtime_path(f"chip_apppipe_{safe}")
             dut_cmd  = set_cmd_flag(dut_cmd, "--app-pipe", app_pipe)
             py_cmd   = set_cmd_flag(py_cmd, "--app-pipe", app_pipe)
             # (--PICS already ensured above for every test)
@@ -1364,12 +2060,41 @@ class TestRunner:
         # a test never resets — the flag is simply never created.
         restart_flag = None
         if has_dut_app:
-            restart_flag = f"/tmp/matterci_restart_{safe}"
+            restart_flag = self._runtime_path(f"matterci_restart_{safe}")
             if "--restart-flag-file" not in py_cmd:
                 py_cmd = f"{py_cmd.rstrip()} --restart-flag-file {restart_flag}"
             subprocess.run(f"rm -f '{restart_flag}' 2>/dev/null || true", shell=True)
 
         self._clean_storage()
+
+        # Fabric snapshot: restore a commissioned DUT KVS + controller storage for
+        # eligible TCs and drop --commissioning-method (taking the snapshot first
+        # if this DUT command has none yet). Restored DUTs boot WITHOUT the
+        # command's `rm -rf /tmp/chip_*`, or the KVS would be wiped again.
+        snap_key = None
+        if (has_dut_app and self.fabric_snapshot is not None
+                and tc_id not in self._snapshot_bypass):
+            sm = re.search(r"\b(TC_\w+\.py)\b", py_cmd)
+            eligible, why = self.fabric_snapshot.eligible(
+                tc_id, self._ci_header(sm.group(1)) if sm else "", py_cmd)
+            if not eligible:
+                print(f"  [SNAP] Fresh commissioning — {why}")
+            else:
+                key = self.fabric_snapshot.key(dut_cmd, py_cmd)
+                if self.fabric_snapshot.usable(key) and not self.fabric_snapshot.has(key):
+                    self._discard_prelaunch()
+                    self._take_fabric_snapshot(key, dut, dut_cmd, py_cmd, safe)
+                storage = self._controller_storage(py_cmd)
+                if (self.fabric_snapshot.usable(key) and self.fabric_snapshot.has(key)
+                        and self.fabric_snapshot.restore(key, storage)):
+                    snap_key = key
+                    py_cmd = strip_commissioning(py_cmd)
+                    if app_pipe and os.path.exists(app_pipe):
+                        os.remove(app_pipe)   # no DUT-side wipe on this launch
+                    print(f"  [SNAP] Restored commissioned fabric {key} — "
+                          f"skipping commissioning")
+        if self._prelaunch and (not has_dut_app or snap_key):
+            self._discard_prelaunch()   # this TC can't use a pre-launched DUT
         start = time.time()
 
         if fsa_cmd:
@@ -1386,7 +2111,16 @@ class TestRunner:
                   "skipping DUT launch (the test launches its own apps).")
             subprocess.run("rm -rf /tmp/chip_* 2>/dev/null || true", shell=True)
         else:
-            launched, launch_err = dut.launch(dut_cmd, dut_log)
+            slot_cmd = None if snap_key else self._adopt_prelaunch(tc_id, dut, dut_cmd)
+            if slot_cmd:
+                launched, launch_err = True, ""
+                dut_cmd = slot_cmd      # factory-reset/reboot relaunches stay in the slot
+            else:
+                self._cur_slot = 0
+                if app_pipe and os.path.exists(app_pipe):
+                    os.remove(app_pipe)   # a stale FIFO would end the pipe wait early
+                launched, launch_err = dut.launch(
+                    strip_kvs_reset(dut_cmd) if snap_key else dut_cmd, dut_log)
             if not launched:
                 elapsed = round(time.time() - start, 2)
                 c = {"stragglers_before": dut.last_straggler_count} if dut.last_straggler_count else {}
@@ -1436,6 +2170,16 @@ class TestRunner:
         # commands are visible when you open it from the report.
         header = [f"[CI] Executed DUT command    : {executed_dut}",
                   f"[CI] Executed Python command : {executed_py}"]
+        if mobly_dir:
+            shutil.rmtree(mobly_dir, ignore_errors=True)   # snapshot run / earlier attempt
+        py_start = time.time()
+        # Idle gap: previous controller exit → this controller start (DUT stop/
+        # settle, storage clean, launch + startup wait, pipe/pairing waits).
+        idle_gap = (round(py_start - self._last_controller_end, 2)
+                    if self._last_controller_end else None)
+        # Warm the NEXT TC's DUT in the other slot while this test runs.
+        if has_dut_app:
+            self._start_prelaunch(tc_id, dut)
         try:
             # DUT tests run through the interactive runner: it tees output and
             # enforces the timeout exactly like subprocess.run, but ALSO answers
@@ -1447,14 +2191,19 @@ class TestRunner:
             # wait_for_user_input, which always prints that marker first. No-DUT
             # self-orchestrating tests keep the plain path (nothing to reset).
             if has_dut_app:
-                rc, timed_out = self._run_python_prompted(
+                rc, timed_out, hung_s = self._run_python_prompted(
                     cmd_parts, log_path, header, dut, dut_cmd, dut_log, restart_flag)
                 if timed_out:
-                    status, counts, reason = ERROR, {}, f"Test timed out after {self.timeout}s"
+                    status, counts, reason = ERROR, {}, f"Test timed out after {self._tc_timeout}s"
+                elif hung_s:
+                    status, counts = ERROR, {"hang_s": hung_s}
+                    reason = (f"HANG: no controller output for {hung_s}s "
+                              f"(inactivity threshold {int(self._tc_hang_s)}s) — "
+                              f"stack dump in the Ctrl Log")
                 else:
                     log_text = log_path.read_text(errors="replace")
-                    status, counts, reason = parse_result(
-                        log_text, exit_code=rc, pass_threshold=self.pass_threshold)
+                    status, counts, reason = self._parse_outcome(
+                        log_text, rc, summary_dir, py_start)
             else:
                 with open(log_path, "w") as lf:
                     for ln in header:
@@ -1465,29 +2214,35 @@ class TestRunner:
                         cmd_parts,
                         stdout=lf,
                         stderr=subprocess.STDOUT,
-                        timeout=self.timeout,
+                        timeout=self._tc_timeout,
                         cwd=str(self.scripts_dir),
                         env={**os.environ,
                              "PATH": f"{self.venv_python.parent}:{os.environ.get('PATH','')}"},
                     )
                 log_text  = log_path.read_text(errors="replace")
-                status, counts, reason = parse_result(
-                    log_text, exit_code=proc.returncode,
-                    pass_threshold=self.pass_threshold)
+                status, counts, reason = self._parse_outcome(
+                    log_text, proc.returncode, summary_dir, py_start)
 
         except subprocess.TimeoutExpired:
-            status, counts, reason = ERROR, {}, f"Test timed out after {self.timeout}s"
+            status, counts, reason = ERROR, {}, f"Test timed out after {self._tc_timeout}s"
             with open(log_path, "a") as lf:
-                lf.write(f"\n\n[CI] TIMEOUT after {self.timeout}s\n")
+                lf.write(f"\n\n[CI] TIMEOUT after {self._tc_timeout}s\n")
 
         except Exception as exc:
             status, counts, reason = ERROR, {}, f"Runner exception: {exc}"
 
         finally:
-            dut.stop()
+            python_s = round(time.time() - py_start, 2)   # history → adaptive timeout
+            self._last_controller_end = time.time()
+            # No settle wait when the next DUT is already up on another slot.
+            dut.stop(settle=self._prelaunch is None)
             self._clean_storage()
             if restart_flag:
                 subprocess.run(f"rm -f '{restart_flag}' 2>/dev/null || true", shell=True)
+            if app_pipe and self.runtime is not None and os.path.exists(app_pipe):
+                os.remove(app_pipe)
+            if mobly_dir:
+                shutil.rmtree(mobly_dir, ignore_errors=True)   # duplicates the Ctrl Log
 
         # Record whether leftover DUT(s) had to be killed before this attempt —
         # surfaced in the report/summary so kill-races are visible. (Only when we
@@ -1496,14 +2251,43 @@ class TestRunner:
             counts = dict(counts or {})
             counts["stragglers_before"] = dut.last_straggler_count
 
+        # DUT memory high-water mark — per TC in counts, max per app for the
+        # footprint tracker.
+        if has_dut_app and dut.peak_rss_kb:
+            counts = dict(counts or {})
+            counts["dut_peak_rss_kb"] = dut.peak_rss_kb
+            mem = self.app_memory.setdefault(dut.binary_name, {"peak_rss_kb": 0, "tcs": []})
+            mem["peak_rss_kb"] = max(mem["peak_rss_kb"], dut.peak_rss_kb)
+            if tc_id not in mem["tcs"]:
+                mem["tcs"].append(tc_id)
+
         # Mark pipe-driven runs so results are clearly CI-simulated (not physical).
         if app_pipe:
             counts = dict(counts or {})
             counts["app_pipe"] = True
 
+        # Controller started from the pre-imported forkserver, and the import
+        # time that saved this TC (measured in _run_python_prompted).
+        if has_dut_app and self._last_spawn.get("forkserver"):
+            counts = dict(counts or {})
+            counts["forkserver"] = True
+            if "import_saved_s" in self._last_spawn:
+                counts["import_saved_s"] = self._last_spawn["import_saved_s"]
+
+        # Ran on a restored fabric snapshot (commissioning skipped) — run_one uses
+        # this to fall back to fresh commissioning on a session error.
+        if snap_key:
+            counts = dict(counts or {})
+            counts["fabric_snapshot"] = snap_key
+
         # Carry the FINAL executed commands into the result (promoted to top-level
         # keys by _result) so they're visible in test_results.json / the report.
         counts = dict(counts or {})
+        counts["python_s"] = python_s
+        if idle_gap is not None:
+            counts["idle_gap_s"] = idle_gap
+        if self._disc_override is not None:
+            counts["prelaunched"] = True
         counts["executed_dut_command"]    = executed_dut
         counts["executed_python_command"] = executed_py
 
@@ -1512,21 +2296,17 @@ class TestRunner:
         # the wrong DUT app for this test's app-pipe commands (e.g. all-clusters
         # VerifyOrDie/core-dumps on RVC's "Reset" — RVC tests need chip-rvc-app).
         if status in (ERROR, FAIL) and has_dut_app:
-            try:
-                dlog = dut_log.read_text(errors="replace") if dut_log.exists() else ""
-            except OSError:
-                dlog = ""
             crash = None
-            if ("Named pipe command not supported" in dlog
-                    or "VerifyOrDie failure" in dlog):
-                m = re.search(r"Unhandled command '([^']+)'", dlog)
-                cmd = m.group(1) if m else "?"
+            hits = log_scan.search_many(dut_log, {"abort": _PIPE_ABORT_RE,
+                                                  "pipe": (_PIPE_CMD_RE, 1),
+                                                  "crash": _DUT_CRASH_RE})
+            if "abort" in hits:
+                cmd = hits.get("pipe", "?")
                 crash = (f"DUT CRASHED on unsupported app-pipe command '{cmd}' "
                          f"(app aborted/core-dumped) — the launched DUT app does not "
                          f"implement this test's pipe commands. Use the app the test "
                          f"expects (RVC tests need chip-rvc-app, not all-clusters).")
-            elif re.search(r"core dumped|Aborted|Segmentation fault|terminate called",
-                           dlog):
+            elif "crash" in hits:
                 crash = "DUT crashed (core dump/abort) mid-test — see the DUT log."
             if crash:
                 status = ERROR
@@ -1537,17 +2317,34 @@ class TestRunner:
 
     def run_one(self, tc: dict, dut: DUTManager) -> dict:
         tc_id    = tc["test_case_id"]
-        log_path = self.log_dir / f"{tc_id}.log"
-        dut_log  = self.log_dir / f"{tc_id}_dut.log"
 
         print(f"\n── {tc_id} ──────────────────────────────────")
 
+        if self.result_cache is not None:
+            hit = self._cached_result(tc, dut)
+            if hit is not None:
+                return hit
+
+        # Live logs go to the runtime tmpfs (flushed to log_dir below) or, when
+        # it's off / over its cap, straight to log_dir.
+        self._live_log_dir = self._live_dir(tc_id)
+        log_path = self._live_log_dir / f"{tc_id}.log"
+        dut_log  = self._live_log_dir / f"{tc_id}_dut.log"
+
+        self._tc_timeout, timeout_info = self._effective_timeout(tc_id)
+        self._tc_hang_s = self._hang_threshold(tc_id)
+        if timeout_info["source"] == "history":
+            print(f"  [TIMEOUT] {self._tc_timeout}s (p99 {timeout_info['p99_s']}s × "
+                  f"{self.adaptive_factor} over {timeout_info['samples']} run(s), "
+                  f"floor {int(self.adaptive_floor)}s, cap {self.timeout}s)")
+
         # ── Fix 1 & 2: Retry logic ────────────────────────────────────────────
         # Commissioning failure → retry up to retry_on_commissioning times
         # Step failure         → retry up to retry_on_step_failure times
 
         commissioning_attempts = 0
         step_retry_done        = False
+        snapshot_fallback      = False
         status = counts = reason = None
         elapsed = 0.0
         final_log = log_path
@@ -1557,8 +2354,30 @@ class TestRunner:
 
         attempt = 1
         while True:
-            status, counts, reason, elapsed = self._run_attempt(
-                tc, dut, attempt, log_path, dut_log)
+            watch = (self.runtime.watch() if self.runtime is not None
+                     else contextlib.nullcontext())
+            with watch as w:
+                status, counts, reason, elapsed = self._run_attempt(
+                    tc, dut, attempt, log_path, dut_log)
+            overflow = w.overflow if w is not None else ""
+            if overflow:
+                # The tmpfs filled past its cap mid-TC — an ENOSPC in the DUT or
+                # controller looks like a DUT failure. Re-run a non-PASS attempt
+                # with its logs on disk (the open logs couldn't be moved).
+                counts = dict(counts or {})
+                counts["runtime_overflow"] = overflow
+                print(f"  [RUNTIME] ⚠️  {overflow} during the TC")
+                if status != PASS and log_path.parent != self.log_dir:
+                    print(f"  [RETRY] Re-running with logs on disk ({self.log_dir})")
+                    log_path = self.log_dir / log_path.name
+                    dut_log  = self.log_dir / dut_log.name
+                    self._live_log_dir = self.log_dir
+                    self.runtime.spilled += 1
+                    attempt += 1
+                    continue
+                if status != PASS:
+                    reason = f"runtime tmpfs over its cap mid-TC ({overflow})" + (
+                        f" | {reason}" if reason else "")
 
             reason_short = f" | {reason[:70]}" if reason else ""
             # Show only the numeric counts on the progress line — the full
@@ -1585,6 +2404,18 @@ class TestRunner:
             )
             is_step_failure = status == FAIL
 
+            # A session error on a RESTORED fabric snapshot: drop the snapshot and
+            # rerun this TC with fresh commissioning (doesn't use a retry slot).
+            snap_key = (counts or {}).get("fabric_snapshot")
+            if is_commissioning_error and snap_key and tc_id not in self._snapshot_bypass:
+                self.fabric_snapshot.invalidate(snap_key)
+                self._snapshot_bypass.add(tc_id)
+                snapshot_fallback = True
+                print(f"  [SNAP] Session error on restored fabric {snap_key} — "
+                      f"retrying with fresh commissioning")
+                attempt += 1
+                continue
+
             if is_commissioning_error and commissioning_attempts < max_comm_retries:
                 commissioning_attempts += 1
                 print(f"  [RETRY] Commissioning failed — retry {commissioning_attempts}/{max_comm_retries}")
@@ -1606,6 +2437,10 @@ class TestRunner:
         retry_note = ""
         if (counts or {}).get("app_pipe"):
             retry_note = "[CI-simulated via app-pipe] "
+        if snapshot_fallback:
+            retry_note += "(fabric snapshot failed → fresh commissioning) "
+        elif (counts or {}).get("fabric_snapshot"):
+            retry_note += "[commissioning skipped via fabric snapshot] "
         if commissioning_attempts > 0:
             retry_note += f"(session/commissioning retried {commissioning_attempts}x) "
         if step_retry_done:
@@ -1619,7 +2454,26 @@ class TestRunner:
             if not final_log.exists():
                 final_log = log_path
 
-        return self._result(tc, status, counts, elapsed, final_log, note=reason)
+        counts = dict(counts or {})
+        counts["timeout"] = timeout_info
+        if self.latency:
+            final_dut = dut_log
+            if attempt > 1:
+                final_dut = dut_log.parent / f"{dut_log.stem}_attempt{attempt}.log"
+            self._measure_latency(tc_id, status, counts, final_log,
+                                  final_dut if final_dut.exists() else None)
+        if self.runtime is not None:
+            moved = self._flush_logs(tc_id)
+            final_log = moved.get(final_log.name, final_log)
+            if self._live_log_dir == self.log_dir:
+                counts["log_spilled"] = True
+        result = self._result(tc, status, counts, elapsed, final_log, note=reason)
+        key = self._cache_key(tc, dut) if self.result_cache is not None else None
+        if key and status == PASS:
+            dut_name = final_log.name.replace(tc_id, f"{tc_id}_dut", 1)
+            self.result_cache.store(key, tc_id, result, [final_log, final_log.parent / dut_name],
+                                    commit=self.sdk_commit)
+        return result
 
     def _result(self, tc, status, counts, elapsed, log_path, note=""):
         # Move the executed commands out of counts to top-level result keys, so
@@ -1628,6 +2482,10 @@ class TestRunner:
         counts = dict(counts or {})
         exec_dut = counts.pop("executed_dut_command", tc["dut_command"])
         exec_py  = counts.pop("executed_python_command", tc["python_command"])
+        timeout  = counts.pop("timeout", None)
+        latency  = counts.pop("latency", None)
+        lat_reg  = counts.pop("latency_regressions", None)
+        cached   = counts.pop("cached", None)
         return {
             "test_case_id":            tc["test_case_id"],
             "cluster":                 tc.get("cluster", ""),
@@ -1640,44 +2498,361 @@ class TestRunner:
             "elapsed_s":               elapsed,
             "log_file":                str(log_path),
             "note":                    note,
+            **({"timeout": timeout} if timeout else {}),           # effective + basis
+            **({"latency": latency} if latency else {}),           # seconds per metric
+            **({"latency_regressions": lat_reg} if lat_reg else {}),
+            **({"cached": cached} if cached else {}),              # source of a CACHED verdict
+        }
+
+    def _plan_order(self, dut: DUTManager):
+        """
+        Priority tiers (priority_order.py) for --priority (reorders
+        self.commands) and/or --budget (selects from them).
+        """
+        ordered, tiers = prioritize(self.commands, self.history, self.sdk_dir,
+                                    dut.apps, self.sdk_commit)
+        if self.priority:
+            self.commands = ordered
+            counts = [tiers.count(t) for t in range(len(TIER_LABELS))]
+            print("[PRIORITY] Order: " + " · ".join(
+                f"{n} {lbl}" for n, lbl in zip(counts, TIER_LABELS)))
+        else:
+            tier_of = {id(tc): t for tc, t in zip(ordered, tiers)}
+            tiers = [tier_of[id(tc)] for tc in self.commands]
+        if self.budget_s:
+            tiers = self._apply_budget(tiers)
+        if self.priority:
+            self._priority_n = sum(1 for t in tiers if t < len(TIER_LABELS) - 1)
+            if self._priority_n:
+                print(f"[PRIORITY] Partial report + upload after the first "
+                      f"{self._priority_n} TC(s)")
+
+    def _apply_budget(self, tiers: list[int]) -> list[int]:
+        """Keep the TCs that fit self.budget_s; plan → logs/budget.json.
+        Returns the tiers of the kept TCs."""
+        te = self.cfg["test_execution"]
+        est = budget_select.estimates(self.commands, self.history,
+                                      te.get("budget_default_tc_s", 120))
+        sel, skip = budget_select.select(self.commands, tiers, est, self.budget_s,
+                                         te.get("budget_reserve", 0.05))
+        tier_of = {id(tc): t for tc, t in zip(self.commands, tiers)}
+        clusters = {tc.get("cluster", "") for tc in self.commands}
+        row = lambda tc: {"tc": tc["test_case_id"], "cluster": tc.get("cluster", ""),
+                          "tier": TIER_LABELS[tier_of[id(tc)]], **est[tc["test_case_id"]]}
+        self.budget_plan = {
+            "budget_s": self.budget_s,
+            "predicted_s": round(sum(est[tc["test_case_id"]]["est_s"] for tc in sel), 1),
+            "clusters": len(clusters),
+            "clusters_covered": len({tc.get("cluster", "") for tc in sel}),
+            "selected": [row(tc) for tc in sel],
+            "skipped": [row(tc) for tc in skip],
         }
+        self._write_budget_plan()
+        print(f"[BUDGET] {self.budget_s / 60:.0f} min: {len(sel)}/{len(self.commands)} "
+              f"TC(s) selected (~{self.budget_plan['predicted_s'] / 60:.0f} min predicted), "
+              f"{self.budget_plan['clusters_covered']}/{len(clusters)} cluster(s) covered, "
+              f"{len(skip)} skipped for budget")
+        self.commands = sel
+        return [tier_of[id(tc)] for tc in sel]
+
+    def _write_budget_plan(self):
+        try:
+            (PROJECT_ROOT / "logs" / "budget.json").write_text(
+                json.dumps(self.budget_plan, indent=2))
+        except OSError as e:
+            print(f"[WARN] budget.json not written: {e}")
+
+    def _log_budget_error(self):
+        """Predicted vs actual per-TC wall time → budget.json + the budget log."""
+        err = budget_select.prediction_error(self.budget_plan, self._wall)
+        self.budget_plan["error"] = err
+        self._write_budget_plan()
+        try:
+            budget_select.append_log(
+                self.cfg["test_execution"].get("budget_log_file",
+                                               budget_select.DEFAULT_LOG_FILE),
+                self.budget_plan, err)
+        except OSError as e:
+            print(f"[WARN] budget log not written: {e}")
+        print(f"\n[BUDGET] Predicted {err['predicted_s'] / 60:.1f} min · actual "
+              f"{err['actual_s'] / 60:.1f} min ({err['total_err_pct']:+}%) over "
+              f"{err['tcs']} TC(s) · per-TC MAE {err['mae_s']}s")
+
+    def _publish_partial(self):
+        """
+        The priority tiers are done: write the report for what has run so far
+        and upload it as a partial results archive in the background (the
+        final upload step replaces it). Upload output → logs/partial_upload.log.
+        """
+        print(f"\n[PRIORITY] Priority tiers done ({self._priority_n} TC(s)) — "
+              f"publishing a partial report")
+        logs = PROJECT_ROOT / "logs"
+        try:
+            jsonl_to_json(self.results_path, logs / "test_results.json")
+            generate_report(self.results_path, self.cfg)
+        except Exception as e:
+            print(f"[PRIORITY] ⚠️  Partial report failed: {e}")
+            return
+        run_id = os.environ.get("GITHUB_RUN_NUMBER", "")
+        if not self._sa_key:
+            print("[PRIORITY] ⚠️  No Drive key (GSHEET_SA_KEY_PATH) — partial upload skipped")
+            return
+
+        def _upload():
+            # The key exists on disk (0600, private temp dir) only while the
+            # upload subprocess runs — never during the TCs' own code.
+            key_dir = tempfile.mkdtemp(prefix="matterci_sa_")
+            key = Path(key_dir) / "service_account.json"
+            try:
+                fd = os.open(key, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                with os.fdopen(fd, "wb") as kf:
+                    kf.write(self._sa_key)
+                with open(logs / "partial_upload.log", "w") as out:
+                    rc = subprocess.run(
+                        [sys.executable, str(SCRIPT_DIR / "upload_test_results.py"),
+                         "--run-id", run_id, "--partial"],
+                        stdout=out, stderr=subprocess.STDOUT,
+                        env=dict(os.environ, GSHEET_SA_KEY_PATH=str(key))).returncode
+            finally:
+                shutil.rmtree(key_dir, ignore_errors=True)
+            link = logs / "results_partial_link.txt"
+            if rc == 0 and link.exists():
+                print(f"  [PRIORITY] 🔗 Partial results: {link.read_text().strip()}")
+            else:
+                print(f"  [PRIORITY] ⚠️  Partial upload failed (rc={rc}) — "
+                      f"see logs/partial_upload.log")
+
+        self._partial_upload = threading.Thread(target=_upload, daemon=True)
+        self._partial_upload.start()
 
-    def run_all(self) -> list[dict]:
+    def _cache_key(self, tc: dict, dut: DUTManager) -> str | None:
+        """
+        Result-cache key of `tc` (memoised per TC), or None when it can't be
+        cached: no TC script, a DUT binary that doesn't resolve, or a
+        Fabric-Sync DUT (a python app script + its own binaries).
+        """
+        tc_id = tc["test_case_id"]
+        if tc_id in self._cache_keys:
+            return self._cache_keys[tc_id]
+        key = None
+        safe = re.sub(r"[^A-Za-z0-9_]", "_", tc_id)
+        dut_cmd, py_cmd = self._apply_ci_test_args(tc["dut_command"], tc["python_command"],
+                                                   quiet=True)
+        py_cmd = self._ensure_pics(py_cmd)
+        scripted = bool(self._fabric_sync_dut(py_cmd, safe)[0])
+        sm = re.search(r"\b(TC_\w+\.py)\b", py_cmd)
+        try:
+            if sm and not scripted:
+                parts = {"dut_command": dut_cmd, "python_command": py_cmd,
+                         "venv": self._venv_hash, "files": {}}
+                if re.search(r"\./\S+", dut_cmd):
+                    binary, _ = dut._find_binary(dut_cmd)
+                    if binary is None:
+                        raise FileNotFoundError(dut_cmd)
+                    parts["files"]["dut"] = self.result_cache.file_sha(binary)
+                # The script + sibling helper modules it imports.
+                script = self.scripts_dir / sm.group(1)
+                parts["files"][sm.group(1)] = self.result_cache.file_sha(script)
+                for mod in set(re.findall(r"^\s*(?:from|import)\s+(\w+)",
+                                          script.read_text(errors="replace"), re.M)):
+                    if (self.scripts_dir / f"{mod}.py").is_file():
+                        parts["files"][f"{mod}.py"] = self.result_cache.file_sha(
+                            self.scripts_dir / f"{mod}.py")
+                # Other SDK / CI files the python command references by absolute
+                # path (resolved app binaries, PICS file, …). Runtime state under
+                # /tmp etc. (KVS, admin storage) is not an input.
+                roots = (f"{self.sdk_dir}/", f"{PROJECT_ROOT}/")
+                for tok in re.findall(r"(?<![\w.])(/[^\s:'\"]+)", py_cmd):
+                    if tok.startswith(roots) and os.path.isfile(tok):
+                        parts["files"][tok] = self.result_cache.file_sha(tok)
+                key = cache_key(parts)
+        except OSError:
+            key = None
+        self._cache_keys[tc_id] = key
+        return key
+
+    def _cached_result(self, tc: dict, dut: DUTManager) -> dict | None:
+        """The CACHED result of `tc` when its key hits, else None."""
+        key = self._cache_key(tc, dut)
+        entry = self.result_cache.lookup(key) if key else None
+        if entry is None:
+            return None
+        tc_id = tc["test_case_id"]
+        if self._prelaunch and self._prelaunch.get("tc_id") == tc_id:
+            self._discard_prelaunch()
+        restored = self.result_cache.restore_logs(key, self.log_dir)
+        log_path = restored.get(entry.get("log_file"), self.log_dir / f"{tc_id}.log")
+        src = f"run #{entry['run']}" if entry.get("run") else entry.get("ts", "?")
+        if entry.get("commit"):
+            src += f" @ {entry['commit'][:9]}"
+        counts = dict(entry.get("counts") or {})
+        counts["cached"] = {"key": key[:16], "run": entry.get("run", ""),
+                            "commit": entry.get("commit", ""), "ts": entry.get("ts", ""),
+                            "elapsed_s": entry.get("elapsed_s", 0)}
+        note = (f"[cached {entry['status']} from {src} — binaries, script, venv and "
+                f"commands unchanged]" + (f" | {entry['note']}" if entry.get("note") else ""))
+        print(f"  [CACHED] {tc_id} — {entry['status']} from {src} (key {key[:12]})")
+        return self._result(tc, CACHED, counts, 0.0, log_path, note=note)
+
+    def _measure_latency(self, tc_id: str, status: str, counts: dict,
+                         ctrl_log: Path, dut_log: Path | None):
+        """Extract this TC's latency metrics into counts and compare them to
+        the TC's history (completed runs only — a crashed run's timings say
+        nothing about the SDK)."""
+        lat = latency_metrics.extract(ctrl_log, dut_log)
+        if not lat:
+            return
+        counts["latency"] = lat
+        if status not in COMPLETED:
+            return
+        base = latency_metrics.baseline(
+            [r for r in self.history.records(tc_id) if r.get("status") in COMPLETED],
+            self.latency_commits, exclude_commit=self.sdk_commit)
+        reg = latency_metrics.regression(lat, base, self.latency_pct, self.latency_min_s)
+        if reg:
+            counts["latency_regressions"] = reg
+            self._latency_flagged.append((tc_id, reg))
+            for k, v in reg.items():
+                print(f"  [LATENCY] ⚠️  {k} {v['value']}s vs {v['baseline']}s "
+                      f"baseline (+{v['pct']}%)")
+
+    def _effective_timeout(self, tc_id: str) -> tuple[int, dict]:
+        """Per-TC timeout from history: min(global, max(p99 × factor, floor))."""
+        durations = self.history.durations(tc_id) if self.adaptive_timeout else []
+        if len(durations) < self.adaptive_min_samples:
+            return self.timeout, {"effective_s": self.timeout, "source": "default",
+                                  "samples": len(durations)}
+        p99 = percentile(durations, 99)
+        eff = int(min(self.timeout, max(p99 * self.adaptive_factor, self.adaptive_floor)))
+        return eff, {"effective_s": eff, "source": "history",
+                     "samples": len(durations), "p99_s": round(p99, 1),
+                     "factor": self.adaptive_factor, "floor_s": self.adaptive_floor,
+                     "cap_s": self.timeout}
+
+    def _record(self, result: dict):
+        """Stream one finished result to the JSONL file and tally its status."""
+        self._writer.write(result)
+        if result["status"] not in (CANCEL, CACHED):   # nothing was measured
+            counts = result.get("counts") or {}
+            rec = {"status": result["status"], "elapsed_s": result["elapsed_s"],
+                   "python_s": counts.get("python_s", result["elapsed_s"])}
+            if self.sdk_commit:
+                rec["commit"] = self.sdk_commit   # --priority diffs against it
+            if "wall_s" in result:
+                rec["wall_s"] = result["wall_s"]
+                self._wall[result["test_case_id"]] = result["wall_s"]
+            if result.get("latency"):
+                rec["latency"] = result["latency"]
+            self.history.append(result["test_case_id"], rec)
+        self.status_counts[result["status"]] = self.status_counts.get(result["status"], 0) + 1
+        counts = result.get("counts") or {}
+        if "idle_gap_s" in counts:
+            self._gaps.append((counts["idle_gap_s"], bool(counts.get("prelaunched"))))
+        if counts.get("forkserver"):
+            self._forked_count += 1
+            self._import_saved += counts.get("import_saved_s", 0)
+
+    def run_all(self) -> dict[str, int]:
+        """Run every TC, streaming results to self.results_path. Returns the
+        per-status tallies (the results themselves are read back via
+        iter_results)."""
         dut = DUTManager(self.cfg)
+        self._writer = ResultsWriter(self.results_path)
+        if not self.budget_s:
+            # A stale plan would list "skipped for budget" TCs in this report.
+            (PROJECT_ROOT / "logs" / "budget.json").unlink(missing_ok=True)
+        if self.priority or self.budget_s:
+            self._plan_order(dut)
         print(f"\n[TEST] Running {len(self.commands)} test case(s)...")
         print(f"[TEST] Python venv : {self.venv_python}")
         print(f"[TEST] Scripts dir : {self.scripts_dir}")
+        print(f"[TEST] Results     : {self.results_path} (streamed per TC)")
+        if self.runtime is not None:
+            print(f"[TEST] Runtime     : {self.runtime.root} (tmpfs, cap "
+                  f"{self.runtime.max_bytes >> 20} MB; logs flushed to {self.log_dir})")
         print(f"[TEST] Send SIGTERM or click Cancel in GitHub to stop cleanly.")
 
-        for i, tc in enumerate(self.commands, 1):
-            # Check cancel flag before starting each new test
-            if _CANCEL_REQUESTED:
-                print(f"\n[CANCEL] Cancelled before TC {tc['test_case_id']} — stopping.")
-                # Mark remaining TCs as cancelled
-                for remaining in self.commands[i-1:]:
-                    self.results.append({
-                        "test_case_id":   remaining["test_case_id"],
-                        "cluster":        remaining.get("cluster", ""),
-                        "dut_command":    remaining["dut_command"],
-                        "python_command": remaining["python_command"],
-                        "status":         "CANCEL",
-                        "counts":         {},
-                        "elapsed_s":      0,
-                        "log_file":       "",
-                        "note":           "Cancelled by user (SIGTERM/SIGINT)",
-                    })
-                break
-
-            print(f"\n[{i}/{len(self.commands)}]", end="")
-            result = self.run_one(tc, dut)
-            self.results.append(result)
+        try:
+            for i, tc in enumerate(self.commands, 1):
+                # Check cancel flag before starting each new test
+                if _CANCEL_REQUESTED:
+                    print(f"\n[CANCEL] Cancelled before TC {tc['test_case_id']} — stopping.")
+                    # Mark remaining TCs as cancelled
+                    for remaining in self.commands[i-1:]:
+                        self._record({
+                            "test_case_id":   remaining["test_case_id"],
+                            "cluster":        remaining.get("cluster", ""),
+                            "dut_command":    remaining["dut_command"],
+                            "python_command": remaining["python_command"],
+                            "status":         "CANCEL",
+                            "counts":         {},
+                            "elapsed_s":      0,
+                            "log_file":       "",
+                            "note":           "Cancelled by user (SIGTERM/SIGINT)",
+                        })
+                    break
+
+                print(f"\n[{i}/{len(self.commands)}]", end="")
+                self._next_tc = self.commands[i] if i < len(self.commands) else None
+                t0 = time.time()
+                result = self.run_one(tc, dut)
+                # Wall time incl. retries and DUT settle — the budget estimator's unit.
+                result["wall_s"] = round(time.time() - t0, 1)
+                self._record(result)
+                if i == self._priority_n and i < len(self.commands):
+                    self._publish_partial()
+        finally:
+            self._writer.close()
+            self._discard_prelaunch()
+            if self.runtime is not None:
+                self.runtime.flush(self.log_dir)   # anything an interrupted TC left
+            if self.result_cache is not None and not _CANCEL_REQUESTED:
+                self.result_cache.save()
+
+        if self._gaps:
+            piped = [g for g, p in self._gaps if p]
+            plain = [g for g, p in self._gaps if not p]
+            def _avg(v):
+                return f"{round(sum(v) / len(v), 1)}s avg over {len(v)}" if v else "—"
+            print(f"\n[IDLE] Gap between controllers: pre-launched {_avg(piped)} · "
+                  f"normal launch {_avg(plain)} · total idle "
+                  f"{round(sum(g for g, _ in self._gaps), 1)}s")
+
+        if self.runtime is not None:
+            print(f"\n[RUNTIME] {self.runtime.summary()}")
+
+        if self.result_cache is not None:
+            print(f"\n[CACHE] {self.result_cache.summary()}")
+
+        if self.budget_plan is not None:
+            self._log_budget_error()
+
+        if self._partial_upload is not None:
+            # Let the partial archive finish before the final upload step
+            # replaces it.
+            self._partial_upload.join(timeout=300)
+
+        if self._latency_flagged:
+            print(f"\n[LATENCY] {len(self._latency_flagged)} TC(s) slower than their "
+                  f"last {self.latency_commits} commit(s):")
+            for tc_id, reg in self._latency_flagged:
+                print(f"          {tc_id}: " + ", ".join(
+                    f"{k} +{v['pct']}%" for k, v in reg.items()))
+
+        if self._forkserver is not None:
+            print(f"\n[FORKSRV] {self._forked_count} test(s) forked from the pre-imported "
+                  f"controller — ~{round(self._import_saved, 1)}s of import time saved "
+                  f"(measured per TC); its preload ({len(self._forkserver.modules)} "
+                  f"module(s), {self._forkserver.import_s}s) was paid once for the run.")
+            self._forkserver.stop()
+            self._forkserver = None
 
         if _CANCEL_REQUESTED:
-            cancelled = sum(1 for r in self.results if r["status"] == "CANCEL")
-            ran       = len(self.results) - cancelled
+            cancelled = self.status_counts.get(CANCEL, 0)
+            ran       = self._writer.count - cancelled
             print(f"\n[CANCEL] Ran {ran} test(s) before cancel. {cancelled} skipped.")
 
-        return self.results
+        return self.status_counts
 
 
 # =============================================================================
@@ -1710,11 +2885,19 @@ def read_build_info() -> dict:
     return {}
 
 
-def generate_report(results: list[dict], cfg: dict = None,
+def generate_report(results, cfg: dict = None,
                     report_path=None, build_info=None) -> Path:
     # report_path / build_info can be passed explicitly to regenerate a report
     # from an EXISTING run's test_results.json (see regenerate_report.py) without
     # a live run. Falls back to the config / logs/build-info.json for a live run.
+    # `results` is a list of result dicts OR the path of a test_results.jsonl /
+    # .json — a path is read twice with iter_results (tallies, then rows written
+    # straight into the report file), so a large run is never held in memory.
+    def _results():
+        if isinstance(results, (str, Path)):
+            return iter_results(results)
+        return iter(results)
+
     if report_path is None:
         report_path = PROJECT_ROOT / cfg["test_execution"]["report_path"]
     report_path = Path(report_path)
@@ -1727,22 +2910,28 @@ def generate_report(results: list[dict], cfg: dict = None,
     build_meta  = (f" · SDK commit <b>{bi_commit}</b> (branch <b>{bi_branch}</b>"
                    + (f", built {bi_date}" if bi_date else "") + ")")
 
-    total     = len(results)
-    passed    = sum(1 for r in results if r["status"] == PASS)
-    pass_warn = sum(1 for r in results if r["status"] == PASS_WARN)
-    failed    = sum(1 for r in results if r["status"] == FAIL)
-    rerun     = sum(1 for r in results if r["status"] == RERUN)
-    errors    = sum(1 for r in results if r["status"] == ERROR)
-    cancelled = sum(1 for r in results if r["status"] == CANCEL)
+    # First pass: per-status tallies + unique clusters for the filter dropdown.
+    tally: dict[str, int] = {}
+    clusters = set()
+    for r in _results():
+        tally[r["status"]] = tally.get(r["status"], 0) + 1
+        clusters.add(extract_cluster(r["test_case_id"], r.get("cluster", "")))
+    clusters  = sorted(clusters)
+    total     = sum(tally.values())
+    passed    = tally.get(PASS, 0)
+    pass_warn = tally.get(PASS_WARN, 0)
+    failed    = tally.get(FAIL, 0)
+    rerun     = tally.get(RERUN, 0)
+    errors    = tally.get(ERROR, 0)
+    cancelled = tally.get(CANCEL, 0)
+    cached    = tally.get(CACHED, 0)
     run_time  = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    # Collect unique clusters for filter dropdown
-    clusters = sorted(set(extract_cluster(r["test_case_id"], r.get("cluster", "")) for r in results))
-
     # ---- Status → pill CSS class ----
     PILL_CLASS = {
         PASS: "pill-pass", PASS_WARN: "pill-passw", FAIL: "pill-fail",
         RERUN: "pill-rerun", ERROR: "pill-error", CANCEL: "pill-cancel",
+        CACHED: "pill-cached",
     }
 
     def badge(status):
@@ -1763,7 +2952,7 @@ def generate_report(results: list[dict], cfg: dict = None,
         note   = r.get("note", "")
         if status == PASS:
             return note
-        if status == PASS_WARN:
+        if status in (PASS_WARN, CACHED):
             return note
         if status == CANCEL:
             return "Cancelled by user before this test started"
@@ -1800,16 +2989,16 @@ def generate_report(results: list[dict], cfg: dict = None,
                 f'<span class="sg">{XMARK}{st_fail}</span>{skip_html}'
                 f'<span class="sg sig">Σ{total_v}</span></span>')
 
-    # ---- Build table rows ----
-    rows_html = ""
-    for r in results:
+    # ---- Table row (one per result; streamed into the file below) ----
+    def row_html(r):
         tc_id   = r["test_case_id"]
         cluster = extract_cluster(tc_id, r.get("cluster", ""))
         status  = r["status"]
         counts  = r.get("counts", {})
         elapsed = r["elapsed_s"]
         log_file = Path(r.get("log_file", ""))
-        dut_log  = log_file.parent / f"{tc_id}_dut.log" if log_file.name else None
+        dut_name = f"{tc_id}_dut.log" + (".gz" if log_file.suffix == ".gz" else "")
+        dut_log  = log_file.parent / dut_name if log_file.name else None
 
         if log_file.name:
             tcid_html = (f'<a class="tcid-link mono" href="test_runs/{log_file.name}" '
@@ -1827,18 +3016,32 @@ def generate_report(results: list[dict], cfg: dict = None,
 
         reason = status_reason(r)
         reason_cell = f'<span class="reason">{reason}</span>' if reason else ""
-
-        rows_html += f"""
+        lat_reg = r.get("latency_regressions") or {}
+        if lat_reg:
+            tip = "; ".join(f"{k}: {v['value']}s vs {v['baseline']}s baseline"
+                            for k, v in lat_reg.items())
+            reason_cell += (f'<span class="lat-reg" title="{tip}">⏱ slower: '
+                            + ", ".join(f"{k.removesuffix('_s')} +{v['pct']}%"
+                                        for k, v in lat_reg.items())
+                            + "</span>")
+
+        time_cell = f"{elapsed}s"
+        if counts.get("import_saved_s"):
+            time_cell += (f'<div class="cluster-sub" title="Controller import time the '
+                          f'pre-imported forkserver saved this test (vs a fresh '
+                          f'interpreter)">⚡ −{counts["import_saved_s"]}s import</div>')
+
+        return f"""
         <tr class="tc-row row-{status.lower()}" data-cluster="{cluster}" data-status="{status}" data-time="{elapsed}" data-tcid="{tc_id}">
           <td>{tcid_html}<div class="cluster-sub">{cluster}</div></td>
           <td>{badge(status)}</td>
           <td>{steps_cell(counts, status)}</td>
-          <td class="mono time">{elapsed}s</td>
+          <td class="mono time">{time_cell}</td>
           <td class="log-cell">{log_links}</td>
           <td class="reason-cell">{reason_cell}</td>
         </tr>"""
 
-    # ---- Stat tiles (single row of 7) ----
+    # ---- Stat tiles (single row of 7; 8 with cached verdicts) ----
     _TILES = [
         ("t-total", "Total", total, "ALL",
          "Total test cases in this run. Click to clear the status filter."),
@@ -1858,6 +3061,12 @@ def generate_report(results: list[dict], cfg: dict = None,
         ("t-cancel", "Cancelled", cancelled, "CANCEL",
          "Run was cancelled (SIGTERM / GitHub Actions cancel). These TCs did not execute."),
     ]
+    # Result cache on: one more tile for the reused verdicts.
+    if cached:
+        _TILES.insert(3, ("t-cached", "Cached", cached, "CACHED",
+                          "Not re-run — binaries, script, controller venv and commands "
+                          "hash the same as a previous PASS, whose verdict and logs are "
+                          "reused. See the Reason column for the source run."))
     stat_tiles = "".join(
         f'<div class="tile {cls}" data-filter="{filt}" onclick="setStatus(\'{filt}\')">'
         f'<div class="num mono">{val}</div><div class="lbl">{lbl}</div>'
@@ -1875,12 +3084,50 @@ def generate_report(results: list[dict], cfg: dict = None,
     # ---- Footer status ----
     if failed == 0 and errors == 0 and rerun == 0 and cancelled == 0:
         footer_status = "All tests passed"; foot_dot = "#22c55e"
+        if cached:
+            footer_status += f" ({cached} cached)"
     elif failed == 0 and errors == 0:
-        footer_status = f"{passed + pass_warn}/{total} passed"; foot_dot = "#f59e0b"
+        footer_status = f"{passed + pass_warn + cached}/{total} passed"; foot_dot = "#f59e0b"
     else:
         footer_status = f"{failed} failed · {errors} error(s)"; foot_dot = "#ef4444"
     built_txt = bi_date if bi_date else "—"
 
+    # ---- Footprint banner (footprint_tracker.py → logs/footprint_report.json) ----
+    footprint_html = ""
+    try:
+        fp = json.loads((PROJECT_ROOT / "logs" / "footprint_report.json").read_text())
+    except (OSError, ValueError):
+        fp = None
+    if fp and fp.get("flagged"):
+        items = "".join(
+            f'<li><b>{f["app"]}</b> {f["metric"]}: '
+            f'{footprint_tracker.human(f["metric"], f["value"])} vs '
+            f'{footprint_tracker.human(f["metric"], f["baseline"])} '
+            f'(+{f["pct"]}%)</li>' for f in fp["flagged"])
+        footprint_html = (f'<section class="footprint"><b>Footprint growth</b> vs the '
+                          f'median of the previous {len(fp.get("baseline_commits", []))} '
+                          f'commit(s):<ul>{items}</ul></section>')
+
+    # ---- Budget banner (--budget → logs/budget.json) ----
+    try:
+        bp = json.loads((PROJECT_ROOT / "logs" / "budget.json").read_text())
+    except (OSError, ValueError):
+        bp = None
+    if bp:
+        err = bp.get("error") or {}
+        acc = (f' Predicted {err["predicted_s"] / 60:.1f} min, actual '
+               f'{err["actual_s"] / 60:.1f} min ({err["total_err_pct"]:+}%).'
+               if err.get("tcs") else "")
+        items = "".join(f'<li><b>{t["tc"]}</b> {t["cluster"]} · ~{t["est_s"]:.0f}s '
+                        f'({t["source"]}, {t["tier"]})</li>' for t in bp.get("skipped", []))
+        footprint_html += (
+            f'<section class="footprint"><b>Time budget {bp["budget_s"] / 60:.0f} min</b>: '
+            f'{len(bp.get("selected", []))} TC(s) run, {bp.get("clusters_covered", 0)}/'
+            f'{bp.get("clusters", 0)} cluster(s) covered.{acc}'
+            + (f'<details><summary>{len(bp["skipped"])} TC(s) skipped for budget</summary>'
+               f'<ul>{items}</ul></details>' if items else "")
+            + '</section>')
+
     _TEMPLATE = r"""<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -1913,7 +3160,7 @@ def generate_report(results: list[dict], cfg: dict = None,
     .header-right .val { font-family: 'JetBrains Mono', ui-monospace, monospace; font-size: 13px; color: #c7cfdd; margin-top: 3px; }
 
     /* ---- Stat tiles (always one row of 7) ---- */
-    .tiles { display: grid; grid-template-columns: repeat(7, 1fr); gap: 12px; padding: 20px 32px; }
+    .tiles { display: grid; grid-template-columns: repeat(__NTILES__, 1fr); gap: 12px; padding: 20px 32px; }
     .tile {
       position: relative; border-radius: 12px; padding: 15px 18px; cursor: pointer; border: 1px solid rgba(255,255,255,.05);
       transition: transform .12s ease, box-shadow .12s ease; user-select: none;
@@ -1940,6 +3187,7 @@ def generate_report(results: list[dict], cfg: dict = None,
     .t-rerun  { background: #2B1E0F; } .t-rerun .num  { color: #FBBF24; }
     .t-err    { background: #1B222E; } .t-err .num    { color: #94A3B8; }
     .t-cancel { background: #241531; } .t-cancel .num { color: #C084FC; }
+    .t-cached { background: #0F2530; } .t-cached .num { color: #67E8F9; }
 
     /* ---- Filters ---- */
     .filters {
@@ -2009,6 +3257,7 @@ def generate_report(results: list[dict], cfg: dict = None,
     .pill-rerun  { background: #FFF7ED; color: #C2410C; border-color: #FED7AA; } .pill-rerun .dot  { background: #F97316; }
     .pill-error  { background: #F8FAFC; color: #334155; border-color: #E2E8F0; } .pill-error .dot  { background: #64748B; }
     .pill-cancel { background: #FAF5FF; color: #6B21A8; border-color: #E9D5FF; } .pill-cancel .dot { background: #A855F7; }
+    .pill-cached { background: #ECFEFF; color: #155E75; border-color: #A5F3FC; } .pill-cached .dot { background: #06B6D4; }
 
     .steps { display: inline-flex; align-items: center; gap: 11px; font-size: 12.5px; color: #374151; }
     .sg { display: inline-flex; align-items: center; gap: 3px; }
@@ -2024,6 +3273,12 @@ def generate_report(results: list[dict], cfg: dict = None,
     tr.row-fail .reason { color: #991B1B; }
     tr.row-rerun .reason { color: #C2410C; }
     tr.row-error .reason { color: #475569; }
+    .lat-reg { display: block; margin-top: 3px; font-size: 11.5px; color: #B45309; }
+    .footprint {
+      margin: 0 32px 12px; padding: 10px 16px; border-radius: 8px; font-size: 12.5px;
+      background: #FFFBEB; border: .5px solid #FCD34D; color: #92400E;
+    }
+    .footprint ul { margin: 6px 0 0 18px; padding: 0; }
 
     .hidden { display: none; }
     .no-results { text-align: center; padding: 44px; color: #9ca3af; font-size: 14px; }
@@ -2038,7 +3293,7 @@ def generate_report(results: list[dict], cfg: dict = None,
     .footer .foot-dot { width: 8px; height: 8px; border-radius: 50%; background: __FOOT_DOT__; display: inline-block; }
 
     @media (max-width: 900px) {
-      .tiles { grid-template-columns: repeat(7, minmax(90px, 1fr)); overflow-x: auto; }
+      .tiles { grid-template-columns: repeat(__NTILES__, minmax(90px, 1fr)); overflow-x: auto; }
     }
   </style>
 </head>
@@ -2066,6 +3321,7 @@ def generate_report(results: list[dict], cfg: dict = None,
   <section class="tiles">
     __TILES__
   </section>
+  __FOOTPRINT__
 
   <section class="filters">
     <span class="flabel">Cluster:</span>
@@ -2091,6 +3347,7 @@ def generate_report(results: list[dict], cfg: dict = None,
       <option value="RERUN">RERUN</option>
       <option value="ERROR">ERROR</option>
       <option value="CANCEL">CANCELLED</option>
+      <option value="CACHED">CACHED</option>
     </select>
 
     <div class="search">
@@ -2184,7 +3441,7 @@ def generate_report(results: list[dict], cfg: dict = None,
       var rows = Array.from(tbody.querySelectorAll('tr.tc-row'));
       var dir = (sortState.col === col && sortState.dir === 'asc') ? 'desc' : 'asc';
       sortState = { col: col, dir: dir };
-      var sev = { FAIL:0, ERROR:1, RERUN:2, 'PASS*':3, CANCEL:4, PASS:5 };
+      var sev = { FAIL:0, ERROR:1, RERUN:2, 'PASS*':3, CANCEL:4, PASS:5, CACHED:6 };
       rows.sort(function(a, b) {
         var av, bv;
         if (type === 'num') { av = parseFloat(a.dataset.time) || 0; bv = parseFloat(b.dataset.time) || 0; }
@@ -2215,11 +3472,18 @@ def generate_report(results: list[dict], cfg: dict = None,
             .replace("__RUN_TIME__", str(run_time))
             .replace("__FOOTER_STATUS__", footer_status)
             .replace("__TILES__", stat_tiles)
+            .replace("__NTILES__", str(len(_TILES)))
+            .replace("__FOOTPRINT__", footprint_html)
             .replace("__CLUSTER_CB__", cluster_checkboxes)
-            .replace("__TOTAL__", str(total))
-            .replace("__ROWS__", rows_html))
-
-    report_path.write_text(html)
+            .replace("__TOTAL__", str(total)))
+
+    # Second pass: rows go straight to the file between the template halves.
+    head, tail = html.split("__ROWS__", 1)
+    with open(report_path, "w") as f:
+        f.write(head)
+        for r in _results():
+            f.write(row_html(r))
+        f.write(tail)
     print(f"\n[REPORT] Written to: {report_path}")
     return report_path
 
@@ -2227,15 +3491,95 @@ def generate_report(results: list[dict], cfg: dict = None,
 # =============================================================================
 # Main
 # =============================================================================
+# A DUT that reaches one of these log lines has a running Matter server — the
+# preflight smoke launch treats it as "ready" and stops it.
+_SMOKE_READY_RE = re.compile(r"Server Listening|Server initialization complete|"
+                             r"Advertise commission parameter")
+# Binaries that are not standalone commissionable devices (no AppMain option
+# set, interactive shells) — ldd-checked only, never smoke-launched.
+_SMOKE_SKIP = ("chip-tool", "fabric-admin", "fabric-sync", "chip-camera-controller")
+
+
+def _preflight_key(path: Path) -> str:
+    """Cache key: binary identity (inode + mtime + size) + the dynamic linker
+    cache mtime, so an apt install/removal of runtime libs invalidates it too."""
+    st = path.stat()
+    try:
+        ld = os.stat("/etc/ld.so.cache").st_mtime_ns
+    except OSError:
+        ld = 0
+    return f"{st.st_ino}:{st.st_mtime_ns}:{st.st_size}:{ld}"
+
+
+def _ldd_missing(path: Path) -> list[str]:
+    r = subprocess.run(["ldd", str(path)], capture_output=True, text=True)
+    return sorted({ln.strip().split()[0] for ln in (r.stdout + r.stderr).splitlines()
+                   if "not found" in ln})
+
+
+def _smoke_launch(path: Path, slot: int, deadline_s: float) -> str:
+    """
+    Launch the binary on its own KVS/ports/discriminator and wait (up to
+    deadline_s) for it to reach a ready log line. Returns "" when it is ready or
+    still alive at the deadline; otherwise why it died (instant crash). Apps
+    that reject the standard AppMain options are reported as skipped, not failed.
+    Each launch gets a private temp dir (KVS + log, also its TMPDIR) that is
+    removed afterwards, so concurrent smoke launches never share state files.
+    """
+    tmp  = Path(tempfile.mkdtemp(prefix=f"matterci_smoke_{slot}_"))
+    log  = tmp / "smoke.log"
+    args = [str(path), "--KVS", str(tmp / "chip_kvs"),
+            "--secured-device-port", str(5640 + 2 * slot),
+            "--unsecured-commissioner-port", str(5641 + 2 * slot),
+            "--discriminator", str(3000 + slot)]
+    with open(log, "w") as lf:
+        proc = subprocess.Popen(args, stdout=lf, stderr=subprocess.STDOUT,
+                                stdin=subprocess.DEVNULL, cwd=str(path.parent),
+                                env=dict(os.environ, TMPDIR=str(tmp)),
+                                preexec_fn=os.setsid)
+    end, why = time.time() + deadline_s, ""
+    try:
+        while time.time() < end:
+            time.sleep(0.25)
+            out = log.read_text(errors="replace")
+            if _SMOKE_READY_RE.search(out):
+                break
+            if proc.poll() is not None:
+                if re.search(r"[Uu]nknown option|[Uu]sage:", out):
+                    break   # not an AppMain app — can't smoke it with these args
+                lines = [ln.strip() for ln in out.splitlines() if ln.strip()]
+                err = next((ln for ln in reversed(lines)
+                            if re.search(r"error|fail|abort|fault|terminate", ln, re.I)),
+                           lines[-1] if lines else "")
+                why = (f"exited rc={proc.returncode} before ready"
+                       + (f": {_clean_detail(err)[:160]}" if err else ""))
+                break
+    finally:
+        if proc.poll() is None:
+            try:
+                os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
+            except (ProcessLookupError, OSError):
+                pass
+            proc.wait()
+        shutil.rmtree(tmp, ignore_errors=True)
+    return why
+
+
 def preflight_ldd_check(cfg: dict, commands: list[dict]) -> list[dict]:
     """
     Before running any TC, `ldd` every DISTINCT DUT binary that the run will
     launch and report missing RUNTIME shared libraries ONCE, up-front — instead
     of a confusing per-TC "rc=127 / error while loading shared libraries". Common
     for the camera app (needs ffmpeg/gstreamer runtime libs on the RPi).
-    Returns [{binary, missing:[...]}] and writes logs/preflight.json for the job
-    summary. Never aborts — apps with all libs still run.
+
+    Binaries are checked in a thread pool, and each is also smoke-launched
+    (test_execution.preflight_smoke_check) to catch instant-crash binaries in
+    seconds. Clean results are cached across runs keyed by inode+mtime+size
+    (+ the ld.so cache), so an unchanged bundle costs nothing to re-check.
+    Returns [{binary, missing:[...], smoke:"..."}] and writes logs/preflight.json
+    for the job summary. Never aborts — apps that pass still run.
     """
+    te = cfg["test_execution"]
     sdk_dir = Path(os.environ.get("MATTER_SDK_DIR", cfg["rpi"]["sdk_dir"]))
     # Map every enabled app + chip-tool binary name → its path on the RPi.
     name_to_path = {}
@@ -2252,30 +3596,71 @@ def preflight_ldd_check(cfg: dict, commands: list[dict]) -> list[dict]:
         m = re.search(r"\./([^\s]+)", tc.get("dut_command", ""))
         if m:
             needed.add(m.group(1))
-
-    problems, checked = [], 0
-    for bin_name in sorted(needed):
-        path = name_to_path.get(bin_name)
-        if not path or not path.exists():
-            continue   # a truly missing binary is reported per-TC by _find_binary
-        checked += 1
-        r = subprocess.run(f"ldd '{path}' 2>&1 | grep 'not found' || true",
-                           shell=True, capture_output=True, text=True)
-        missing = sorted({ln.strip().split()[0] for ln in r.stdout.splitlines() if ln.strip()})
-        if missing:
-            problems.append({"binary": bin_name, "missing": missing})
+    # a truly missing binary is reported per-TC by _find_binary
+    targets = [(b, name_to_path[b]) for b in sorted(needed)
+               if b in name_to_path and name_to_path[b].exists()]
+
+    smoke    = bool(te.get("preflight_smoke_check", True))
+    deadline = float(te.get("preflight_smoke_timeout", 15))
+    workers  = int(te.get("preflight_workers", 4)) or 1
+    cache_path = Path(te.get("preflight_cache",
+                             "~/.cache/matter-ci/preflight_cache.json")).expanduser()
+    try:
+        cache = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        cache = {}
+
+    def _check(slot, bin_name, path):
+        key = _preflight_key(path)
+        hit = cache.get(str(path))
+        if hit and hit.get("key") == key and (hit.get("smoked") or not smoke):
+            return bin_name, path, key, [], "", True
+        missing = _ldd_missing(path)
+        why = ""
+        if smoke and not missing and not bin_name.startswith(_SMOKE_SKIP):
+            why = _smoke_launch(path, slot, deadline)
+        return bin_name, path, key, missing, why, False
+
+    t0 = time.time()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        outcomes = list(pool.map(lambda a: _check(*a),
+                                 [(i, b, p) for i, (b, p) in enumerate(targets)]))
+
+    problems, cached = [], 0
+    for bin_name, path, key, missing, why, hit in outcomes:
+        cached += hit
+        if missing or why:
+            problems.append({"binary": bin_name, "missing": missing, "smoke": why})
+            cache.pop(str(path), None)   # re-check failures every run
+        else:
+            cache[str(path)] = {"key": key, "smoked": smoke}
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(cache, indent=2))
+    except OSError:
+        pass
 
     print("\n" + "=" * 70)
-    print(f"[PREFLIGHT] Checked shared libraries for {checked} DUT binary(ies).")
-    if problems:
-        print(f"[PREFLIGHT] ⚠️  {len(problems)} binary(ies) MISSING runtime libraries "
+    print(f"[PREFLIGHT] Checked {len(targets)} DUT binary(ies) in "
+          f"{round(time.time() - t0, 1)}s ({cached} unchanged → cached, "
+          f"{workers} worker(s){', + launch smoke check' if smoke else ''}).")
+    lib_bad   = [p for p in problems if p["missing"]]
+    crash_bad = [p for p in problems if p["smoke"]]
+    if lib_bad:
+        print(f"[PREFLIGHT] ⚠️  {len(lib_bad)} binary(ies) MISSING runtime libraries "
               f"— their TCs will fail to launch until installed on the RPi:")
-        for p in problems:
+        for p in lib_bad:
             print(f"   ❌ {p['binary']}: {', '.join(p['missing'])}")
         print("[PREFLIGHT] Fix: install the app's runtime libs on the RPi "
               "(camera → ffmpeg/gstreamer; see Matter_CI/apt-packages.txt).")
-    else:
-        print("[PREFLIGHT] ✅ All DUT binaries resolve their shared libraries.")
+    if crash_bad:
+        print(f"[PREFLIGHT] ⚠️  {len(crash_bad)} binary(ies) CRASHED on a bare launch "
+              f"— their TCs will likely ERROR:")
+        for p in crash_bad:
+            print(f"   ❌ {p['binary']}: {p['smoke']}")
+    if not problems:
+        print("[PREFLIGHT] ✅ All DUT binaries resolve their shared libraries"
+              + (" and start up." if smoke else "."))
     print("=" * 70)
 
     try:
@@ -2286,13 +3671,76 @@ def preflight_ldd_check(cfg: dict, commands: list[dict]) -> list[dict]:
     return problems
 
 
+def write_footprint(runner: "TestRunner", cfg: dict):
+    """
+    logs/app_memory.json (per-app DUT peak RSS of this run) + the footprint
+    tracker's diff of it — merged with the bundle's binary_sizes.json — against
+    the previous nightlies on this RPi → logs/footprint_report.json (rendered
+    as a banner in the HTML report).
+    """
+    logs = PROJECT_ROOT / "logs"
+    mem = {"commit": runner.sdk_commit,
+           "apps": {app: {"peak_rss_kb": m["peak_rss_kb"], "tcs": len(m["tcs"])}
+                    for app, m in sorted(runner.app_memory.items())}}
+    try:
+        (logs / "app_memory.json").write_text(json.dumps(mem, indent=2))
+        sizes = (footprint_tracker.load_json(logs / "binary_sizes.json")
+                 if (logs / "binary_sizes.json").exists() else None)
+        commit, apps = footprint_tracker.merge_apps(mem, sizes)
+        if not apps:
+            return
+        report = footprint_tracker.track(footprint_tracker.settings(cfg), "rpi",
+                                         commit, apps)
+        (logs / "footprint_report.json").write_text(json.dumps(report, indent=2))
+    except OSError as e:
+        print(f"[WARN] Footprint not recorded: {e}")
+        return
+    print(f"\n[FOOTPRINT] {len(apps)} app(s), {len(report['flagged'])} over threshold "
+          f"(baseline: {len(report['baseline_commits'])} commit(s))")
+    for f in report["flagged"]:
+        print(f"          {f['app']} {f['metric']}: "
+              f"+{footprint_tracker.human(f['metric'], f['delta'])} (+{f['pct']}%)")
+
+
+def take_sa_key(enabled: bool) -> bytes | None:
+    """
+    The Drive key the workflow wrote for the --priority partial upload: read
+    into memory and the file deleted before any TC runs (TC scripts are not
+    trusted with it), and GSHEET_SA_KEY_PATH dropped from the environment the
+    TCs inherit. _publish_partial hands it to the upload subprocess only.
+    """
+    path = os.environ.pop("GSHEET_SA_KEY_PATH", "")
+    if not path:
+        return None
+    try:
+        data = Path(path).read_bytes() if enabled else None
+    except OSError as e:
+        print(f"[WARN] Drive key {path} unreadable ({e}) — no partial upload")
+        data = None
+    Path(path).unlink(missing_ok=True)
+    return data or None
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--config",   default=str(PROJECT_ROOT / "config" / "build_config.yaml"))
     parser.add_argument("--commands", default=str(PROJECT_ROOT / "logs" / "test_commands.json"))
+    # Ignore the result cache for this run (every TC re-runs; PASSes re-stored).
+    parser.add_argument("--full-run", action="store_true")
+    # Fail-fast order: last run's failures, then changed scripts/apps, then
+    # the rest; partial report upload after those (priority_order.py).
+    parser.add_argument("--priority", action="store_true")
+    # Time budget, e.g. 60m / 1h30m: run the subset that fits (budget_select.py).
+    parser.add_argument("--budget", default="")
     args = parser.parse_args()
+    try:
+        budget_s = budget_select.parse_duration(args.budget) if args.budget else 0.0
+    except ValueError as e:
+        parser.error(str(e))
 
     cfg = load_config(Path(args.config))
+    sa_key = take_sa_key(args.priority or bool(
+        cfg["test_execution"].get("priority_order", False)))
 
     cmd_path = Path(args.commands)
     if not cmd_path.exists():
@@ -2310,22 +3758,24 @@ def main():
     # up-front (in the run log + job summary), not as a per-TC rc=127.
     preflight_ldd_check(cfg, commands)
 
-    runner  = TestRunner(cfg, commands)
-    results = runner.run_all()
-    generate_report(results, cfg)
+    runner  = TestRunner(cfg, commands, full_run=args.full_run, priority=args.priority,
+                         budget_s=budget_s, sa_key=sa_key)
+    tallies = runner.run_all()
+    write_footprint(runner, cfg)
+    generate_report(runner.results_path, cfg)
 
-    # Save JSON results too
+    # Legacy JSON array (workflow summary / artifacts) — converted from the
+    # JSONL stream without loading it all into memory.
     results_path = PROJECT_ROOT / "logs" / "test_results.json"
     try:
-        results_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(results_path, "w") as f:
-            json.dump(results, f, indent=2)
+        jsonl_to_json(runner.results_path, results_path)
+        print(f"[INFO] Results JSONL: {runner.results_path}")
         print(f"[INFO] Results JSON : {results_path}")
     except Exception as e:
         print(f"[WARN] Could not save results JSON: {e}")
         print(f"[WARN] Results will not be available for report or summary")
 
-    failed = sum(1 for r in results if r["status"] in (FAIL, ERROR))
+    failed = tallies.get(FAIL, 0) + tallies.get(ERROR, 0)
     # PASS_WARN is not a failure — just a warning that PICS was not configured
     # Exit 0 on cancel — partial results are expected
     if _CANCEL_REQUESTED:
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+runtime_store.py
+================
+tmpfs-backed runtime state and live logs for run_tests.py
+(test_execution.runtime_tmpfs).
+
+On an RPi everything under /tmp and the workspace lives on the SD card, where
+the DUT's fsync-heavy KVS writes are slow and make test timing jittery. With the
+option on, the runner keeps per-TC runtime state — DUT KVS (--KVS), controller
+admin_storage (--storage-path), app-pipe FIFOs, restart flags, pipelined slot
+roots — under <root>/state, and writes the in-progress Ctrl/DUT logs to
+<root>/logs. When a TC finishes its logs are moved (optionally gzip'd) to
+logs/test_runs/, so the SD card sees one sequential write per log instead of
+thousands of small appends.
+
+Memory is capped: before each TC the runner calls admit(), which refuses the
+tmpfs (→ that TC's logs go straight to logs/test_runs/, i.e. spill to disk) once
+our usage passes max_mb or the tmpfs itself has less than min_free_mb left. A
+TC can still outgrow the cap mid-run (a chatty DUT log, big KVS), and its open
+logs can't be moved then — so each attempt runs under watch(), which polls the
+same limits. An attempt that crossed them and did not pass is re-run with its
+logs on disk; the overflow is recorded in the TC's counts (runtime_overflow)
+and the run summary either way, so an ENOSPC inside the DUT/controller is never
+silently reported as a DUT failure. The state files are a few KB and always
+stay on the tmpfs so paths (and fabric snapshot keys) are stable. The SDK's
+hard-coded /tmp/chip_*.ini config files stay where the SDK puts them.
+
+Usage (inspect a runtime root):
+    python3 scripts/runtime_store.py [--root /dev/shm/matter-ci]
+"""
+
+import os
+import re
+import gzip
+import shutil
+import argparse
+import threading
+from pathlib import Path
+
+DEFAULT_ROOT = "/dev/shm/matter-ci"
+_MEMORY_FS = ("tmpfs", "ramfs")
+
+
+def fs_type(path) -> str:
+    """Filesystem type of the mount holding `path` (longest /proc/mounts match)."""
+    path = os.path.realpath(path)
+    best, kind = "", ""
+    try:
+        with open("/proc/mounts") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) < 3:
+                    continue
+                mnt = parts[1].replace("\\040", " ")
+                if (path == mnt or path.startswith(mnt.rstrip("/") + "/")) \
+                        and len(mnt) > len(best):
+                    best, kind = mnt, parts[2]
+    except OSError:
+        pass
+    return kind
+
+
+class RuntimeStore:
+    """
+    <root>/state — per-TC runtime state (fixed paths, wiped between TCs by the
+    runner's storage cleanup). <root>/logs — live logs, flushed per TC.
+    The whole root is cleared at start-up (leftovers of a killed run).
+    """
+
+    def __init__(self, root, max_mb: int = 256, min_free_mb: int = 128,
+                 compress: bool = False):
+        self.root = Path(root).expanduser()
+        self.state = self.root / "state"
+        self.logs = self.root / "logs"
+        self.max_bytes = int(max_mb) * 1024 * 1024
+        self.min_free_bytes = int(min_free_mb) * 1024 * 1024
+        self.compress = compress
+        self.admitted = 0
+        self.spilled = 0
+        self.overflows = 0         # attempts that crossed the cap mid-TC
+        self.flushed_bytes = 0     # log bytes moved off the tmpfs
+        self.stored_bytes = 0      # bytes written to disk (after gzip)
+        shutil.rmtree(self.root, ignore_errors=True)
+        self.state.mkdir(parents=True, exist_ok=True)
+        self.logs.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def in_memory(self) -> bool:
+        return fs_type(self.root) in _MEMORY_FS
+
+    # ── memory cap ──────────────────────────────────────────────────────────
+    def usage_bytes(self) -> int:
+        total = 0
+        for dirpath, _, files in os.walk(self.root):
+            for name in files:
+                try:
+                    total += os.lstat(os.path.join(dirpath, name)).st_size
+                except OSError:
+                    pass
+        return total
+
+    def free_bytes(self) -> int:
+        try:
+            st = os.statvfs(self.root)
+        except OSError:
+            return 0
+        return st.f_bavail * st.f_frsize
+
+    def over_cap(self) -> str:
+        """Why the runtime is over its limits right now ("" when it is not)."""
+        used, free = self.usage_bytes(), self.free_bytes()
+        if used >= self.max_bytes:
+            return f"runtime usage {used >> 20} MB ≥ cap {self.max_bytes >> 20} MB"
+        if free < self.min_free_bytes:
+            return f"tmpfs free {free >> 20} MB < reserve {self.min_free_bytes >> 20} MB"
+        return ""
+
+    def admit(self) -> tuple[bool, str]:
+        """May the next TC write its live logs to the tmpfs? (False → spill)."""
+        why = self.over_cap()
+        if not why:
+            self.admitted += 1
+            return True, ""
+        self.spilled += 1
+        return False, why
+
+    def watch(self, interval: float = 1.0) -> "Watch":
+        """Context manager polling over_cap() while a TC attempt runs."""
+        return Watch(self, interval)
+
+    # ── flush ───────────────────────────────────────────────────────────────
+    def flush(self, dest: Path, pattern: "re.Pattern | None" = None) -> dict[str, Path]:
+        """
+        Move finished logs (names matching `pattern`, or all) to `dest`, gzip'd
+        when compress is on. Returns {original name: final path}.
+        """
+        dest = Path(dest)
+        dest.mkdir(parents=True, exist_ok=True)
+        moved = {}
+        for p in sorted(self.logs.iterdir()):
+            if not p.is_file() or (pattern is not None and not pattern.match(p.name)):
+                continue
+            size = p.stat().st_size
+            if self.compress:
+                out = dest / (p.name + ".gz")
+                with open(p, "rb") as src, gzip.open(out, "wb", compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+                p.unlink()
+            else:
+                out = dest / p.name
+                shutil.move(str(p), str(out))
+            self.flushed_bytes += size
+            self.stored_bytes += out.stat().st_size
+            moved[p.name] = out
+        return moved
+
+    def summary(self) -> str:
+        mb = lambda b: round(b / 1048576, 1)
+        gz = f" → {mb(self.stored_bytes)} MB gzip" if self.compress else ""
+        over = f", {self.overflows} over the cap mid-TC" if self.overflows else ""
+        return (f"{self.admitted} TC(s) on tmpfs, {self.spilled} spilled to disk{over} · "
+                f"{mb(self.flushed_bytes)} MB of logs flushed{gz}")
+
+
+class Watch:
+    """
+    Polls the store's limits from a daemon thread while a TC attempt runs.
+    `overflow` is the first over_cap() reason seen ("" = stayed within them);
+    it is also re-checked once on exit so a burst right at the end counts.
+    """
+
+    def __init__(self, store: RuntimeStore, interval: float):
+        self.store = store
+        self.interval = interval
+        self.overflow = ""
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+
+    def _poll(self):
+        while not self.overflow and not self._stop.wait(self.interval):
+            self.overflow = self.store.over_cap()
+
+    def __enter__(self) -> "Watch":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join(timeout=5)
+        if not self.overflow:
+            self.overflow = self.store.over_cap()
+        if self.overflow:
+            self.store.overflows += 1
+        return False
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--root", default=DEFAULT_ROOT)
+    args = ap.parse_args()
+    root = Path(args.root).expanduser()
+    print(f"{root}: fs={fs_type(root) or '?'}")
+    if root.exists():
+        for sub in ("state", "logs"):
+            d = root / sub
+            files = sorted(d.iterdir()) if d.is_dir() else []
+            print(f"  {sub}/ ({len(files)} entries)")
+            for p in files:
+                print(f"    {p.name}  {p.lstat().st_size} B")
+
+
+if __name__ == "__main__":
+    main()
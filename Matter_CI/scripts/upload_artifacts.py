@@ -222,6 +222,22 @@ def build_bundle(cfg: dict, output_dir: Path) -> tuple[Path, str]:
         shutil.copy2(src_info_json, bundle_dir / "build-info.json")
         print(f"[BUNDLE]   ✅ build-info.json included")
 
+    # Per-app binary footprint of this build — the RPi tracks it next to the
+    # apps' peak RSS from the test run (footprint_tracker.py).
+    src_sizes = output_dir / "binary_sizes.json"
+    if src_sizes.exists():
+        shutil.copy2(src_sizes, bundle_dir / "binary_sizes.json")
+        print(f"[BUNDLE]   ✅ binary_sizes.json included")
+
+    # Resolved app table of this build — the RPi consumers read it instead of
+    # re-running SDK discovery (discover_targets.load_manifest).
+    src_manifest = output_dir / "apps_manifest.json"
+    if src_manifest.exists():
+        shutil.copy2(src_manifest, bundle_dir / "apps_manifest.json")
+        print(f"[BUNDLE]   ✅ apps_manifest.json included")
+    else:
+        print(f"[BUNDLE]   ⚠️  apps_manifest.json not found — the RPi will run discovery")
+
     # ── 5. README.txt — user guide ────────────────────────────────────────
     readme = bundle_dir / "README.txt"
     apps_list = "\n".join(f"    apps/{a}" for a in copied_apps)
@@ -54,15 +54,25 @@ def _commit_short() -> str:
     return "unknown"
 
 
-def build_results_bundle(run_id: str) -> Path:
-    """Tar the report + JSON summary + per-test logs into logs/<name>.tar.gz."""
+def _partial_prefix(run_id: str) -> str:
+    return f"{RESULTS_PREFIX}run{(run_id or '0').strip()}-partial-"
+
+
+def build_results_bundle(run_id: str, partial: bool = False) -> Path:
+    """Tar the report + JSON summary + per-test logs into logs/<name>.tar.gz.
+    partial=True (run_tests.py --priority, mid-run) names it
+    matter-ci-results-run<N>-partial-… so the final upload can replace it."""
     logs = PROJECT_ROOT / "logs"
     members = [
         logs / "report.html",
         logs / "test_results.json",
+        logs / "test_results.jsonl",
         logs / "test_runs",       # per-test Ctrl/DUT logs (directory)
         logs / "preflight.json",
         logs / "build-info.json",
+        logs / "app_memory.json",
+        logs / "footprint_report.json",
+        logs / "budget.json",
     ]
     present = [m for m in members if m.exists()]
     if not present:
@@ -71,7 +81,8 @@ def build_results_bundle(run_id: str) -> Path:
 
     date_str = datetime.now().strftime("%Y%m%d-%H%M%S")
     rid = (run_id or "0").strip()
-    name = f"{RESULTS_PREFIX}run{rid}-{_commit_short()}-{date_str}.tar.gz"
+    name = (f"{_partial_prefix(rid)}{_commit_short()}-{date_str}.tar.gz" if partial
+            else f"{RESULTS_PREFIX}run{rid}-{_commit_short()}-{date_str}.tar.gz")
     out = logs / name
     print(f"[RESULTS] Bundling {len(present)} item(s) → {name}")
     with tarfile.open(out, "w:gz") as tar:
@@ -81,7 +92,8 @@ def build_results_bundle(run_id: str) -> Path:
     return out
 
 
-def upload_results_to_drive(cfg: dict, tar_path: Path, run_id: str) -> str:
+def upload_results_to_drive(cfg: dict, tar_path: Path, run_id: str,
+                            partial: bool = False) -> str:
     gd = cfg.get("google_drive", {})
     # Prefer a dedicated results folder; fall back to the build folder.
     folder_id = gd.get("results_folder_id") or gd.get("folder_id", "")
@@ -102,12 +114,14 @@ def upload_results_to_drive(cfg: dict, tar_path: Path, run_id: str) -> str:
     print("[RESULTS] Connecting to Google Drive...")
     service = gdrive_service(sa_key)
 
-    # Same-name re-run: replace in place.
+    # Same-name re-run: replace in place. This run's partial archive (from the
+    # --priority tier) is superseded by either upload.
     existing = list_files_in_folder(service, folder_id)
+    stale = lambda n: n == tar_path.name or n.startswith(_partial_prefix(run_id))
     for f in existing:
-        if f["name"] == tar_path.name:
+        if stale(f["name"]):
             delete_file(service, f["id"], f["name"])
-    existing = [f for f in existing if f["name"] != tar_path.name]
+    existing = [f for f in existing if not stale(f["name"])]
 
     # Prune BEFORE uploading so we free a slot first — pruning after can't
     # self-heal a full Drive (the upload throws 403 storageQuotaExceeded before
@@ -130,7 +144,8 @@ def upload_results_to_drive(cfg: dict, tar_path: Path, run_id: str) -> str:
     link = make_public_link(service, file_id)
     print(f"[RESULTS] 🔗 Results link (permanent): {link}")
 
-    (PROJECT_ROOT / "logs" / "results_drive_link.txt").write_text(link)
+    out = "results_partial_link.txt" if partial else "results_drive_link.txt"
+    (PROJECT_ROOT / "logs" / out).write_text(link)
     return link
 
 
@@ -139,13 +154,19 @@ def main():
     parser.add_argument("--config",
                         default=str(PROJECT_ROOT / "config" / "build_config.yaml"))
     parser.add_argument("--run-id", default="")
+    # Mid-run archive of the priority tier (run_tests.py --priority).
+    parser.add_argument("--partial", action="store_true")
     args = parser.parse_args()
 
     cfg = load_config(Path(args.config))
-    tar_path = build_results_bundle(args.run_id)
+    tar_path = build_results_bundle(args.run_id, partial=args.partial)
     if not tar_path:
         return   # nothing to upload — not an error (email still sends a summary)
-    link = upload_results_to_drive(cfg, tar_path, args.run_id)
+    try:
+        link = upload_results_to_drive(cfg, tar_path, args.run_id, partial=args.partial)
+    finally:
+        if args.partial:
+            tar_path.unlink(missing_ok=True)   # the final bundle is built from logs/ again
     if link:
         print(f"\n[RESULTS] ✅ Done. Download: {link}")
 
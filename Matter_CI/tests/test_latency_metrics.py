@@ -0,0 +1,31 @@
+"""Protocol latency metrics from Ctrl/DUT logs (latency_metrics.extract)."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import latency_metrics  # noqa: E402
+
+# DUT log lines as the Linux example apps write them: each one wrapped in ANSI
+# colour codes, so the epoch timestamp is not at the start of the raw line.
+COLOURED_DUT_LOG = """\
+\x1b[0;32m[1760000000.000000][4242:4242] CHIP:DL: ChipLinuxAppInit\x1b[0m
+\x1b[0;32m[1760000000.500000][4242:4242] CHIP:DIS: Advertise commission parameter vendorID=65521\x1b[0m
+\x1b[0;34m[1760000002.000000][4242:4242] CHIP:SC: Received PBKDF param request\x1b[0m
+\x1b[0;34m[1760000002.750000][4242:4242] CHIP:IN: SecureSession[0x1]: Activated - Type:1 LSID:1\x1b[0m
+\x1b[0;34m[1760000004.000000][4242:4242] CHIP:SC: Received Sigma1 msg\x1b[0m
+\x1b[0;34m[1760000004.250000][4242:4242] CHIP:IN: SecureSession[0x2]: Activated - Type:2 LSID:2\x1b[0m
+\x1b[0;32m[1760000005.000000][4242:4242] CHIP:SVR: Received CommissioningComplete\x1b[0m
+"""
+
+
+def test_coloured_dut_log_yields_metrics(tmp_path):
+    dut_log = tmp_path / "TC_OO_2_1_dut.log"
+    dut_log.write_text(COLOURED_DUT_LOG)
+    assert latency_metrics.extract(None, dut_log) == {
+        "dut_boot_to_advertise_s": 0.5,
+        "pase_s": 0.75,
+        "case_s": 0.25,
+        "commissioning_s": 3.0,
+    }
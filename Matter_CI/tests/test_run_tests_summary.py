@@ -0,0 +1,93 @@
+"""Verdicts read from mobly's test_summary.yaml (run_tests.parse_summary_result)."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import run_tests  # noqa: E402
+
+# What mobly writes when the framework aborts commissioning with TestAbortAll:
+# a FAIL record for test_run_commissioning, then the Summary document.
+COMMISSIONING_ABORT = """\
+---
+Begin Time: 1760000000000
+Details: Commissioning failed
+End Time: 1760000012000
+Result: FAIL
+Termination Signal Type: TestAbortAll
+Test Class: TC_OO_2_1
+Test Name: test_run_commissioning
+Type: Record
+UID: null
+---
+Begin Time: 1760000012000
+Details: 'Test class aborted: Commissioning failed'
+End Time: 1760000012000
+Result: SKIP
+Test Class: TC_OO_2_1
+Test Name: test_TC_OO_2_1
+Type: Record
+UID: null
+---
+Error: 0
+Executed: 1
+Failed: 1
+Passed: 0
+Requested: 2
+Skipped: 1
+Type: Summary
+"""
+
+ASSERTION_FAIL = """\
+---
+Details: 'OnOff attribute mismatch: expected 1, got 0'
+Result: FAIL
+Termination Signal Type: TestFailure
+Test Class: TC_OO_2_1
+Test Name: test_TC_OO_2_1
+Type: Record
+---
+Error: 0
+Executed: 1
+Failed: 1
+Passed: 0
+Requested: 1
+Skipped: 0
+Type: Summary
+"""
+
+
+def _summary(tmp_path, text):
+    run = tmp_path / "TC_OO_2_1" / "10-19-2026_01-00-00-000"
+    run.mkdir(parents=True)
+    (run / "test_summary.yaml").write_text(text)
+    return run_tests.load_mobly_summary(tmp_path)
+
+
+def test_commissioning_abort_is_error(tmp_path):
+    summary = _summary(tmp_path, COMMISSIONING_ABORT)
+    assert summary is not None
+    status, _, reason = run_tests.parse_summary_result(summary, "")
+    assert status == run_tests.ERROR
+    assert reason == run_tests.COMMISSIONING_FAIL_REASON
+
+
+def test_pairing_markers_in_log_are_error(tmp_path):
+    # An ERROR record from another test, but the log shows the pairing failure.
+    summary = _summary(tmp_path, ASSERTION_FAIL.replace(
+        "Result: FAIL\nTermination Signal Type: TestFailure",
+        "Result: ERROR\nTermination Signal Type: ChipStackError"))
+    log = "[MatterTest] Failed to commission: CHIP_ERROR_TIMEOUT\n"
+    status, _, reason = run_tests.parse_summary_result(summary, log)
+    assert status == run_tests.ERROR
+    assert reason == run_tests.COMMISSIONING_FAIL_REASON
+
+
+def test_assertion_failure_stays_fail(tmp_path):
+    # TC-CGEN style: commissioning fails on purpose, then a step assertion fails.
+    summary = _summary(tmp_path, ASSERTION_FAIL)
+    log = "Failed to commission … UNSUPPORTED_ACCESS (expected)\n"
+    status, _, reason = run_tests.parse_summary_result(summary, log)
+    assert status == run_tests.FAIL
+    assert "OnOff attribute mismatch" in reason